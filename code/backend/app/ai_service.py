@@ -7,7 +7,8 @@ load_dotenv()
 
 print("GROQ ai_service loaded")
 
-GROQ_URL = "https://api.groq.com/openai/v1/chat/completions"
+# GROQ_URL can be pointed at bench/mock_llm.py for load tests
+GROQ_URL = os.getenv("GROQ_URL", "https://api.groq.com/openai/v1/chat/completions")
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 MODEL = "llama-3.1-8b-instant"
 
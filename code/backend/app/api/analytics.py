@@ -0,0 +1,163 @@
+# app/api/analytics.py
+"""
+Read-only marketplace analytics, served from the daily rollup tables kept by
+app/jobs/analytics.py (never from orders/bids/bid_requests). Data lags the
+live tables by up to ANALYTICS_ROLLUP_INTERVAL_S + ANALYTICS_LAG_S seconds.
+
+Platform-wide figures (/summary, /categories) are for admins (ADMIN_EMAILS)
+only; any seller can read their own (/sellers/me). Responses are never
+marked cacheable by shared caches.
+"""
+from datetime import date, datetime, timedelta
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from pydantic import BaseModel
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from ..core.cache import cached_json_response
+from ..database import get_read_db
+from ..jobs.analytics import CATEGORY_COUNTERS, NAMESPACE
+from ..models.models import DailyCategoryStats, DailySellerStats, RollupWatermark, User
+from ..utils.categories import category_cache
+from .auth import get_admin_user, get_current_user_from_token
+
+router = APIRouter(prefix="/analytics", tags=["Analytics"])
+
+DEFAULT_DAYS = 30
+MAX_DAYS = 366
+
+
+class CategoryDay(BaseModel):
+    day: date
+    category_id: int
+    category: Optional[str] = None
+    requests: int
+    bids: int
+    orders: int
+    gmv: float
+    bids_per_request: Optional[float] = None
+    avg_first_bid_hours: Optional[float] = None
+
+
+class CategoryTotals(BaseModel):
+    category_id: int
+    category: Optional[str] = None
+    requests: int
+    bids: int
+    orders: int
+    gmv: float
+    bids_per_request: Optional[float] = None
+    avg_first_bid_hours: Optional[float] = None
+
+
+class SellerDay(BaseModel):
+    day: date
+    bids: int
+    orders: int
+    gmv: float
+
+
+class AnalyticsSummary(BaseModel):
+    date_from: date
+    date_to: date
+    requests: int
+    bids: int
+    orders: int
+    gmv: float
+    bids_per_request: Optional[float] = None
+    avg_first_bid_hours: Optional[float] = None
+    categories: List[CategoryTotals]
+    rolled_up_at: Optional[datetime] = None  # last rollup run
+
+
+def _range(date_from: Optional[date], date_to: Optional[date]):
+    date_to = date_to or datetime.utcnow().date()
+    date_from = date_from or date_to - timedelta(days=DEFAULT_DAYS - 1)
+    if date_from > date_to:
+        raise HTTPException(status_code=400, detail="date_from is after date_to")
+    if (date_to - date_from).days >= MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_DAYS} days per query")
+    return date_from, date_to
+
+
+def _derived(row: dict) -> dict:
+    row["bids_per_request"] = round(row["bids"] / row["requests"], 2) if row["requests"] else None
+    first_bids, seconds = row.pop("first_bids"), row.pop("first_bid_seconds_sum")
+    row["avg_first_bid_hours"] = round(seconds / first_bids / 3600, 2) if first_bids else None
+    row["gmv"] = round(row["gmv"], 2)
+    return row
+
+
+def _category_totals(db: Session, date_from: date, date_to: date) -> List[dict]:
+    """Raw counter sums per category over the range."""
+    columns = [func.sum(getattr(DailyCategoryStats, c)).label(c) for c in CATEGORY_COUNTERS]
+    stmt = select(DailyCategoryStats.category_id, *columns).where(
+        DailyCategoryStats.day >= date_from, DailyCategoryStats.day <= date_to).group_by(
+        DailyCategoryStats.category_id)
+    names = category_cache.names(db)
+    return [{**row._asdict(), "category": names.get(row.category_id)} for row in db.execute(stmt)]
+
+
+@router.get("/summary", response_model=AnalyticsSummary)
+async def get_summary(
+    request: Request,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_admin_user)
+):
+    """Marketplace totals for the range, overall and per category (largest GMV first)."""
+    date_from, date_to = _range(date_from, date_to)
+
+    def load():
+        rows = _category_totals(db, date_from, date_to)
+        totals = {c: sum(row[c] for row in rows) for c in CATEGORY_COUNTERS}
+        categories = sorted((_derived(row) for row in rows), key=lambda c: -c["gmv"])
+        rolled_up_at = db.execute(select(func.max(RollupWatermark.updated_at))).scalar()
+        return {"date_from": date_from, "date_to": date_to, **_derived(totals),
+                "categories": categories, "rolled_up_at": rolled_up_at}
+
+    return await cached_json_response(request, NAMESPACE, f"summary:{date_from}:{date_to}", load, private=True)
+
+
+@router.get("/categories", response_model=List[CategoryDay])
+async def get_category_days(
+    request: Request,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    category_id: Optional[int] = None,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_admin_user)
+):
+    """Per category per day: requests, bids, orders, GMV, bids per request, time to first bid."""
+    date_from, date_to = _range(date_from, date_to)
+
+    def load():
+        stmt = select(DailyCategoryStats.__table__).where(
+            DailyCategoryStats.day >= date_from, DailyCategoryStats.day <= date_to)
+        if category_id is not None:
+            stmt = stmt.where(DailyCategoryStats.category_id == category_id)
+        names = category_cache.names(db)
+        return [_derived({**row._asdict(), "category": names.get(row.category_id)})
+                for row in db.execute(stmt.order_by(DailyCategoryStats.day, DailyCategoryStats.category_id))]
+
+    return await cached_json_response(request, NAMESPACE, f"categories:{date_from}:{date_to}:{category_id}", load,
+                                      private=True)
+
+
+@router.get("/sellers/me", response_model=List[SellerDay])
+def get_my_seller_days(
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user_from_token)
+):
+    """The current seller's bids, orders and GMV per day."""
+    date_from, date_to = _range(date_from, date_to)
+    rows = db.execute(select(DailySellerStats.day, DailySellerStats.bids, DailySellerStats.orders,
+                             DailySellerStats.gmv).where(
+        DailySellerStats.seller_id == current_user.id,
+        DailySellerStats.day >= date_from, DailySellerStats.day <= date_to).order_by(DailySellerStats.day))
+    return [row._asdict() for row in rows]
@@ -1,28 +1,21 @@
 # app/api/auth.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from datetime import timedelta
 from ..database import get_db
 from ..models.models import User
 from ..schemas.schemas import UserCreate, UserLogin, Token
-from ..core.security import get_password_hash, verify_password, create_access_token, ACCESS_TOKEN_EXPIRE_MINUTES
+from ..core.security import get_password_hash, verify_password, create_access_token, decode_access_token, ACCESS_TOKEN_EXPIRE_MINUTES, ADMIN_EMAILS
+from ..jobs.seller_leads import rebuild_for_seller
 
 router = APIRouter()
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
 def get_current_user_from_token(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-    # This is a basic implementation. Ideally, decode the JWT and fetch the user.
-    # We will refine this if the frontend needs secure backend routes.
-    import jwt
-    from ..core.security import SECRET_KEY, ALGORITHM
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-    except jwt.PyJWTError:
+    email = decode_access_token(token)
+    if email is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
     
     user = db.query(User).filter(User.email == email).first()
@@ -31,6 +24,12 @@ def get_current_user_from_token(token: str = Depends(oauth2_scheme), db: Session
     return user
 
 
+def get_admin_user(current_user: User = Depends(get_current_user_from_token)):
+    if current_user.email.lower() not in ADMIN_EMAILS:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admins only")
+    return current_user
+
+
 @router.post("/auth/register", response_model=Token)
 def register_user(user: UserCreate, db: Session = Depends(get_db)):
     db_user = db.query(User).filter(User.email == user.email).first()
@@ -90,11 +89,13 @@ def login_user(user: UserLogin, db: Session = Depends(get_db)):
 
 
 @router.post("/auth/toggle-role")
-async def toggle_role(current_user: User = Depends(get_current_user_from_token), db: Session = Depends(get_db)):
+async def toggle_role(background_tasks: BackgroundTasks, current_user: User = Depends(get_current_user_from_token), db: Session = Depends(get_db)):
     new_role = "seller" if current_user.active_role == "client" else "client"
     current_user.active_role = new_role
     
     db.commit()
+    # As a seller they need the requests posted while they were a client; as a client, no leads at all
+    background_tasks.add_task(rebuild_for_seller, current_user.id)
     
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     new_token = create_access_token(
@@ -156,4 +157,8 @@ async def delete_account(current_user: User = Depends(get_current_user_from_toke
     db.execute(text("DELETE FROM users WHERE id = :uid"), {"uid": user_id})
     db.commit()
 
+    # Their listings, profile and reviews are gone from every public page
+    from ..core.cache import response_cache
+    response_cache.invalidate_all()
+
     return {"message": "Account deleted successfully"}
@@ -1,10 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Request
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import List
+from collections import Counter
+from typing import List, Optional
+from datetime import date, datetime
 from ..database import get_db
-from ..models.models import Bid, BidRequest, User, BidRequestStatus, BidStatus
-from ..schemas.schemas import BidCreate, BidResponse, BidRequestCreate, BidRequestResponse
+from ..models.models import Bid, BidRequest, User, BidRequestStatus, BidStatus, SellerLead
+from ..schemas.schemas import (BidCreate, BidResponse, BidRequestCreate, BidRequestResponse,
+                               BidBatchCreate, BidBatchItemResult, BidBatchResponse,
+                               BidAcceptBatch, BidAcceptResult, BidAcceptBatchResponse)
 from .auth import get_current_user_from_token
+from ..utils.serialization import rows_response, select_rows
+from ..utils.notifications import create_notifications, create_notifications_bulk, reload_notifications
+from ..utils import bid_feed
+from ..utils.matching import add_leads, match_sellers, prune_leads
+from ..utils.categories import category_cache
+from ..utils.rfp_fields import apply_rfp_fields, normalize_location, parse_description, rfp_fields
+from ..utils import seller_scores
+from ..utils.expand import expand_rows, parse_expand
 
 router = APIRouter(prefix="/bids", tags=["bids"])
 
@@ -23,78 +38,33 @@ async def create_bid_request(
         category_id=request.category_id,
         status=BidRequestStatus.OPEN
     )
+    # Typed fields from the body; clients that only send the text version
+    # ("Budget: LKR ...") get them parsed from the description
+    fields = rfp_fields(request.quantity, request.budget, request.event_date, request.location)
+    parsed = parse_description(request.description)
+    apply_rfp_fields(new_request, {k: v if v is not None else parsed[k] for k, v in fields.items()})
     db.add(new_request)
+    db.flush()
+
+    # --- Lead fan-out + notifications for matching sellers (one commit) ---
+    matched_seller_ids = match_sellers(db, new_request, category_cache.name(db, request.category_id) or "")
+    add_leads(db, new_request.id, matched_seller_ids)
+
+    # Notifications (lead cap applied) are emitted to online sellers after the commit
+    buyer_name = f"{current_user.first_name or ''} {current_user.last_name or ''}".strip() or "A buyer"
+    notifications = create_notifications(
+        db, matched_seller_ids,
+        title="New Matching Request",
+        message=f"{buyer_name} has posted a new request that matches your profile: '{request.description[:50]}...'",
+        type="new_request",
+        reference_id=new_request.id,
+        commit=False,
+    )
+    notification_ids = [n.id for n in notifications]
     db.commit()
     db.refresh(new_request)
-    
-    # --- Notification Logic for Matching Sellers ---
-    from ..models.models import Category, Profile, Listing, UserRole, Notification
-    import re
-    
-    def get_keywords(text):
-        if not text: return set()
-        words = re.findall(r'\b\w+\b', text.lower())
-        stop_words = {"a", "an", "the", "and", "or", "but", "in", "on", "at", "to", "for", "with", "by", "of", "is", "are", "was", "were", "i", "we", "you", "they", "it", "this", "that", "want", "need", "looking", "buy", "sell", "get", "make", "some", "any"}
-        return {w for w in words if w not in stop_words and len(w) > 2}
-        
-    # Get request keywords
-    category = db.query(Category).filter(Category.id == request.category_id).first() if request.category_id else None
-    cat_name = category.name if category else ""
-    request_text = f"{cat_name} {request.description or ''}"
-    req_keywords = get_keywords(request_text)
-    
-    # Get all users who are sellers
-    sellers = db.query(User).filter(User.active_role == UserRole.SELLER, User.id != current_user.id).all()
-    
-    matched_seller_ids = set()
-    
-    for seller in sellers:
-        # Check if seller has a listing in this category
-        if request.category_id:
-            has_listing = db.query(Listing).filter(
-                Listing.seller_id == seller.id,
-                Listing.category_id == request.category_id
-            ).first()
-            if has_listing:
-                matched_seller_ids.add(seller.id)
-                continue
-                
-        # Check if seller profile keywords overlap
-        profile = db.query(Profile).filter(Profile.user_id == seller.id).first()
-        profile_text = f"{profile.name or ''} {profile.description or ''}" if profile else ""
-        prof_keywords = get_keywords(profile_text)
-        
-        if req_keywords.intersection(prof_keywords):
-            matched_seller_ids.add(seller.id)
-            
-    # Create notifications and emit for matched sellers
-    buyer_name = f"{current_user.first_name or ''} {current_user.last_name or ''}".strip() or "A buyer"
-    
-    for seller_id in matched_seller_ids:
-        new_notif = Notification(
-            user_id=seller_id,
-            title="New Matching Request",
-            message=f"{buyer_name} has posted a new request that matches your profile: '{request.description[:50]}...'",
-            type="new_request",
-            reference_id=new_request.id
-        )
-        db.add(new_notif)
-        db.commit()
-        db.refresh(new_notif)
-        
-        try:
-            sio = fastapi_req.app.state.sio
-            await sio.emit("new_notification", {
-                "id": new_notif.id,
-                "title": new_notif.title,
-                "text": new_notif.message,
-                "time": "Just now",
-                "unread": not new_notif.is_read,
-                "type": new_notif.type,
-                "reference_id": new_notif.reference_id
-            }, room=f"user_{seller_id}")
-        except Exception as e:
-            print(f"Failed to send notification to seller {seller_id}: {e}")
+    reload_notifications(db, notification_ids)
+    await fastapi_req.app.state.notifier.dispatch(notifications)
     
     return new_request
 
@@ -107,70 +77,42 @@ def get_my_bid_requests(
 
 @router.get("/requests/matches", response_model=List[BidRequestResponse])
 def get_matching_requests(
+    limit: int = Query(100, ge=1, le=200),
+    before_id: Optional[int] = Query(None, description="return leads older than this request id (next page)"),
+    min_budget: Optional[float] = Query(None, ge=0, description="LKR"),
+    max_budget: Optional[float] = Query(None, ge=0, description="LKR"),
+    date_from: Optional[date] = Query(None, description="event date on or after"),
+    date_to: Optional[date] = Query(None, description="event date on or before"),
+    location: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user_from_token)
 ):
     if current_user.active_role != "seller":
         raise HTTPException(status_code=403, detail="Only sellers can view matching requests")
-    
-    # We want requests where:
-    # 1. The request's category_id is in the seller's listing categories
-    # OR 2. The request's keywords overlap with the seller's profile keywords
-    
-    from ..models.models import Category, Profile, Listing
-    import re
-    
-    def get_keywords(text):
-        if not text: return set()
-        words = re.findall(r'\b\w+\b', text.lower())
-        stop_words = {"a", "an", "the", "and", "or", "but", "in", "on", "at", "to", "for", "with", "by", "of", "is", "are", "was", "were", "i", "we", "you", "they", "it", "this", "that", "want", "need", "looking", "buy", "sell", "get", "make", "some", "any"}
-        return {w for w in words if w not in stop_words and len(w) > 2}
-    
-    # Get the seller's profile text keywords
-    profile = db.query(Profile).filter(Profile.user_id == current_user.id).first()
-    profile_text = f"{profile.name or ''} {profile.description or ''}" if profile else ""
-    prof_keywords = get_keywords(profile_text)
-        
-    # Get the seller's listing categories
-    listing_categories = db.query(Listing.category_id).filter(Listing.seller_id == current_user.id).all()
-    category_ids = {c[0] for c in listing_categories}
-    
-    # Find all open requests
-    open_requests = db.query(BidRequest).filter(
+
+    # The seller's lead inbox (utils/matching.py), newest first. Bids, acceptance and
+    # closure prune it; the status/expiry filter covers anything not yet pruned.
+    criteria = [
+        SellerLead.seller_id == current_user.id,
+        BidRequest.id == SellerLead.bid_request_id,
         BidRequest.status == BidRequestStatus.OPEN,
-        BidRequest.user_id != current_user.id
-    ).all()
-    
-    # Get requests this seller has already bid on (and the bid is NOT rejected)
-    from ..models.models import Bid
-    existing_bids = db.query(Bid.bid_request_id).filter(
-        Bid.seller_id == current_user.id,
-        Bid.status != BidStatus.REJECTED
-    ).all()
-    bid_request_ids = {b[0] for b in existing_bids}
-    
-    matching_requests = []
-    
-    for req in open_requests:
-        if req.id in bid_request_ids:
-            continue
-            
-        # Match by listing category
-        if req.category_id in category_ids:
-            matching_requests.append(req)
-            continue
-            
-        # Match by bio/name keywords
-        category = db.query(Category).filter(Category.id == req.category_id).first() if req.category_id else None
-        cat_name = category.name if category else ""
-        request_text = f"{cat_name} {req.description or ''}"
-        req_keywords = get_keywords(request_text)
-        
-        if req_keywords.intersection(prof_keywords):
-            matching_requests.append(req)
-            continue
-                
-    return matching_requests
+        or_(BidRequest.expires_at.is_(None), BidRequest.expires_at > datetime.utcnow()),
+    ]
+    if before_id is not None:
+        criteria.append(SellerLead.bid_request_id < before_id)
+    # Typed RFP filters; requests without the field don't match a filter on it
+    if min_budget is not None:
+        criteria.append(BidRequest.budget >= min_budget)
+    if max_budget is not None:
+        criteria.append(BidRequest.budget <= max_budget)
+    if date_from is not None:
+        criteria.append(BidRequest.event_date >= date_from)
+    if date_to is not None:
+        criteria.append(BidRequest.event_date <= date_to)
+    if location:
+        criteria.append(BidRequest.location == normalize_location(location))
+    return rows_response(select_rows(db, BidRequest, BidRequestResponse, *criteria,
+                                     order_by=SellerLead.bid_request_id.desc(), limit=limit))
 
 @router.get("/requests/{request_id}", response_model=BidRequestResponse)
 def get_bid_request_by_id(
@@ -185,6 +127,32 @@ def get_bid_request_by_id(
 
 # --- Bids ---
 
+def _bid_targets(db: Session, seller_id: int, request_ids) -> tuple:
+    """The requests being bid on (by id), and the ids of those the seller already has a live bid on."""
+    bid_requests = {
+        r.id: r for r in db.query(BidRequest).filter(BidRequest.id.in_(request_ids)).all()
+    }
+    already_bid = {row[0] for row in db.query(Bid.bid_request_id).filter(
+        Bid.seller_id == seller_id,
+        Bid.bid_request_id.in_(request_ids),
+        Bid.status != BidStatus.REJECTED,
+    ).all()}
+    return bid_requests, already_bid
+
+
+def _bid_error(bid_request: Optional[BidRequest], seller_id: int, already_bid: set, now: datetime) -> Optional[str]:
+    """Why the seller can't bid on this request, or None."""
+    if not bid_request:
+        return "Bid request not found"
+    if bid_request.status != BidRequestStatus.OPEN or (bid_request.expires_at and bid_request.expires_at <= now):
+        return "Bid request is no longer open"
+    if bid_request.user_id == seller_id:
+        return "You cannot bid on your own request"
+    if bid_request.id in already_bid:
+        return "You have already bid on this request"
+    return None
+
+
 @router.post("/", response_model=BidResponse)
 async def submit_bid(
     bid: BidCreate,
@@ -195,9 +163,11 @@ async def submit_bid(
     if current_user.active_role != "seller":
         raise HTTPException(status_code=403, detail="Only sellers can submit bids")
     
-    bid_request = db.query(BidRequest).filter(BidRequest.id == bid.bid_request_id).first()
-    if not bid_request:
-        raise HTTPException(status_code=404, detail="Bid request not found")
+    bid_requests, already_bid = _bid_targets(db, current_user.id, [bid.bid_request_id])
+    bid_request = bid_requests.get(bid.bid_request_id)
+    error = _bid_error(bid_request, current_user.id, already_bid, datetime.utcnow())
+    if error:
+        raise HTTPException(status_code=404 if bid_request is None else 400, detail=error)
 
     new_bid = Bid(
         bid_request_id=bid.bid_request_id,
@@ -209,46 +179,117 @@ async def submit_bid(
         status=BidStatus.PENDING
     )
     db.add(new_bid)
-    db.commit()
-    db.refresh(new_bid)
-    
-    # Send notification to the buyer
-    from ..models.models import Notification, Profile
+    seq = bid_feed.next_seq(db, bid_request.id)
+    prune_leads(db, [bid_request.id], seller_id=current_user.id)
+    seller_scores.record_bids(db, [new_bid], {bid_request.id: bid_request.created_at})
+
+    # Notification for the buyer, in the same commit as the bid
+    from ..models.models import Profile
     
     buyer_id = bid_request.user_id
     seller_profile = db.query(Profile).filter(Profile.user_id == current_user.id).first()
     seller_name = seller_profile.name if seller_profile and seller_profile.name else f"User {current_user.id}"
     
-    new_notif = Notification(
-        user_id=buyer_id,
+    notifications = create_notifications(
+        db, [buyer_id],
         title="New Proposal Received",
         message=f"{seller_name} has submitted a proposal for your request.",
         type="new_bid",
-        reference_id=bid_request.id
+        reference_id=bid_request.id,
+        commit=False,
     )
-    db.add(new_notif)
+    notification_ids = [n.id for n in notifications]
     db.commit()
-    db.refresh(new_notif)
-    
-    try:
-        sio = fastapi_req.app.state.sio
-        await sio.emit("new_notification", {
-            "id": new_notif.id,
-            "title": new_notif.title,
-            "text": new_notif.message,
-            "time": "Just now",
-            "unread": not new_notif.is_read,
-            "type": new_notif.type,
-            "reference_id": new_notif.reference_id
-        }, room=f"user_{buyer_id}")
-    except Exception as e:
-        print(f"Failed to send notification: {e}")
+    db.refresh(new_bid)
+    reload_notifications(db, notification_ids)
+    await fastapi_req.app.state.notifier.dispatch(notifications)
+    await bid_feed.publish(fastapi_req.app.state.sio, bid_request.id, seq, bid_feed.BID_CREATED, new_bid)
         
     return new_bid
 
+@router.post("/batch", response_model=BidBatchResponse)
+async def submit_bids_batch(
+    batch: BidBatchCreate,
+    fastapi_req: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_from_token)
+):
+    """
+    Submit up to 100 bids at once. All target requests are validated with one
+    query, and the valid bids, their feed sequence bumps and the buyer
+    notifications are written in a single transaction. Invalid items are
+    reported per index and don't block the rest.
+    """
+    if current_user.active_role != "seller":
+        raise HTTPException(status_code=403, detail="Only sellers can submit bids")
+
+    now = datetime.utcnow()
+    bid_requests, already_bid = _bid_targets(db, current_user.id, {item.bid_request_id for item in batch.bids})
+
+    results = []
+    accepted = []  # (index, Bid)
+    for index, item in enumerate(batch.bids):
+        error = _bid_error(bid_requests.get(item.bid_request_id), current_user.id, already_bid, now)
+        if error:
+            results.append(BidBatchItemResult(index=index, bid_request_id=item.bid_request_id, ok=False, error=error))
+            continue
+        already_bid.add(item.bid_request_id)  # one bid per request per batch
+        accepted.append((index, Bid(
+            bid_request_id=item.bid_request_id,
+            seller_id=current_user.id,
+            price=item.price,
+            quantity=item.quantity,
+            delivery_time=item.delivery_time,
+            message=item.message,
+            status=BidStatus.PENDING
+        )))
+
+    notifications = []
+    seqs = {}
+    if accepted:
+        from ..models.models import Profile
+
+        seller_profile = db.query(Profile).filter(Profile.user_id == current_user.id).first()
+        seller_name = seller_profile.name if seller_profile and seller_profile.name else f"User {current_user.id}"
+
+        db.add_all([bid for _, bid in accepted])
+        seqs = bid_feed.next_seqs(db, [bid.bid_request_id for _, bid in accepted])
+        prune_leads(db, [bid.bid_request_id for _, bid in accepted], seller_id=current_user.id)
+        seller_scores.record_bids(db, [bid for _, bid in accepted],
+                                  {rid: r.created_at for rid, r in bid_requests.items()})
+        notifications = create_notifications_bulk(
+            db,
+            [(bid_requests[bid.bid_request_id].user_id, bid.bid_request_id) for _, bid in accepted],
+            title="New Proposal Received",
+            message=f"{seller_name} has submitted a proposal for your request.",
+            type="new_bid",
+            commit=False,
+        )
+        bid_ids = [bid.id for _, bid in accepted]
+        notification_ids = [n.id for n in notifications]
+        db.commit()
+        # Reload everything we return/emit in two queries instead of one refresh per object
+        db.query(Bid).filter(Bid.id.in_(bid_ids)).all()
+        reload_notifications(db, notification_ids)
+
+    for index, bid in accepted:
+        results.append(BidBatchItemResult(
+            index=index, bid_request_id=bid.bid_request_id, ok=True, bid=BidResponse.model_validate(bid)))
+    results.sort(key=lambda r: r.index)
+
+    await fastapi_req.app.state.notifier.dispatch(notifications)
+    for _, bid in accepted:
+        await bid_feed.publish(fastapi_req.app.state.sio, bid.bid_request_id, seqs[bid.bid_request_id],
+                               bid_feed.BID_CREATED, bid)
+
+    return BidBatchResponse(created=len(accepted), failed=len(results) - len(accepted), results=results)
+
 @router.get("/request/{request_id}", response_model=List[BidResponse])
 def get_bids_for_request(
     request_id: int,
+    sort: str = Query("best", pattern="^(best|price|newest)$",
+                      description="best: blend of price and seller score (utils/seller_scores.py)"),
+    expand: Optional[str] = Query(None, description="seller: embed seller_summary"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user_from_token)
 ):
@@ -259,8 +300,29 @@ def get_bids_for_request(
     # Only the owner can see bids
     if bid_request.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Forbidden")
-        
-    return db.query(Bid).filter(Bid.bid_request_id == request_id).all()
+    roles = parse_expand(expand, ["seller"])
+
+    bids = db.query(Bid).filter(Bid.bid_request_id == request_id).all()
+    scores = seller_scores.scores_for(db, [bid.seller_id for bid in bids])
+    if sort == "best":
+        bids = seller_scores.rank_bids(bids, scores)
+    elif sort == "price":
+        bids.sort(key=lambda bid: (bid.price, bid.id))
+    else:
+        bids.sort(key=lambda bid: bid.id, reverse=True)
+
+    # Each bid carries its seller's score, so buyers can compare without opening every profile
+    results = []
+    for bid in bids:
+        row = scores.get(bid.seller_id)
+        results.append(BidResponse.model_validate(bid).model_copy(update={
+            "seller_score": row.score if row is not None else seller_scores.NEW_SELLER_SCORE,
+            "seller_rating": row.rating_sum / row.rating_count if row is not None and row.rating_count else None,
+            "seller_review_count": row.rating_count if row is not None else 0,
+        }))
+    if roles:
+        return rows_response(expand_rows(db, [r.model_dump() for r in results], roles))
+    return results
 
 @router.get("/my-bids", response_model=List[BidResponse])
 def get_my_bids(
@@ -270,7 +332,131 @@ def get_my_bids(
     if current_user.active_role != "seller":
         raise HTTPException(status_code=403, detail="Only sellers can view their bids")
         
-    return db.query(Bid).filter(Bid.seller_id == current_user.id).all()
+    return rows_response(select_rows(db, Bid, BidResponse, Bid.seller_id == current_user.id))
+
+# --- Accepting bids ---
+
+def _accept_attempt(db: Session, bid_ids: List[int], current_user: User):
+    """One try of _accept_bids: lock, write and flush; the caller commits or rolls back."""
+    from ..models.models import Order, OrderStatus
+
+    request_ids = {row[0] for row in db.query(Bid.bid_request_id).filter(Bid.id.in_(bid_ids)).all()}
+    bid_requests = {r.id: r for r in db.query(BidRequest).filter(
+        BidRequest.id.in_(request_ids)).order_by(BidRequest.id).with_for_update().all()}
+    bids = {b.id: b for b in db.query(Bid).filter(
+        Bid.id.in_(bid_ids)).order_by(Bid.id).with_for_update().all()}
+    orders = {o.bid_id: o for o in db.query(Order).filter(Order.bid_id.in_(bid_ids)).all()}
+
+    outcomes = {}
+    to_accept = []
+    for bid_id in bid_ids:
+        bid = bids.get(bid_id)
+        bid_request = bid_requests.get(bid.bid_request_id) if bid else None
+        if not bid or not bid_request:
+            outcomes[bid_id] = {"status_code": 404, "error": "Bid not found"}
+        elif bid_request.user_id != current_user.id:
+            outcomes[bid_id] = {"status_code": 403, "error": "Only the request owner can accept bids"}
+        elif bid_id in orders:
+            # Already accepted (double click / another tab): same answer, no second order
+            outcomes[bid_id] = {"bid": bid, "order": orders[bid_id], "created": False}
+        else:
+            to_accept.append(bid)
+
+    notifications = []
+    seqs = {}
+    if to_accept:
+        category_names = category_cache.names(db)
+        buyer_name = f"{current_user.first_name or ''} {current_user.last_name or ''}".strip() or "A buyer"
+
+        # Note: We no longer auto-reject other bids because the buyer can accept multiple bids
+        by_category = {}
+        for bid in to_accept:
+            bid_request = bid_requests[bid.bid_request_id]
+            bid.status = BidStatus.ACCEPTED
+            bid_request.status = BidRequestStatus.ACCEPTED
+            cat_name = category_names.get(bid_request.category_id) or "Custom Request"
+            order = Order(
+                buyer_id=current_user.id,
+                seller_id=bid.seller_id,
+                bid_id=bid.id,
+                service_name=f"Custom Order: {cat_name}",
+                amount=bid.price,
+                status=OrderStatus.PENDING
+            )
+            db.add(order)
+            outcomes[bid.id] = {"bid": bid, "order": order, "created": True}
+            by_category.setdefault(cat_name, []).append(bid)
+
+        # Notify the sellers (one insert batch per distinct message)
+        for cat_name, cat_bids in by_category.items():
+            notifications += create_notifications_bulk(
+                db, [(b.seller_id, b.id) for b in cat_bids],
+                title="Bid Accepted!",
+                message=f"{buyer_name} has accepted your proposal for '{cat_name}'. A new order has been created.",
+                type="bid_accepted",
+                commit=False,
+            )
+        seqs = bid_feed.next_seqs(db, {b.bid_request_id for b in to_accept})
+        prune_leads(db, {b.bid_request_id for b in to_accept})  # accepted requests leave every inbox
+        accepted_per_seller = Counter(b.seller_id for b in to_accept)
+        for seller_id in sorted(accepted_per_seller):
+            count = accepted_per_seller[seller_id]
+            seller_scores.record(db, seller_id, bids_accepted=count, orders_total=count)
+
+    db.flush()
+    return outcomes, notifications, seqs
+
+
+def _accept_bids(db: Session, bid_ids: List[int], current_user: User) -> dict:
+    """
+    Accept `bid_ids` on behalf of `current_user` in a single transaction.
+
+    The parent requests and then the bids are locked with SELECT ... FOR UPDATE
+    in id order, so concurrent accepts (two tabs, a double click, overlapping
+    multi-accepts) queue up instead of deadlocking. Each bid yields exactly one
+    Order: Order.bid_id is unique, and a bid that already has its order is
+    reported back as-is. If the unique index still trips (databases without
+    row locks, e.g. SQLite) at any flush or at commit, the whole attempt is
+    rolled back and retried, and the retry sees the winner's order.
+
+    Blocking (row lock waits): async routes run it with asyncio.to_thread.
+
+    Returns {"outcomes": {bid_id: outcome}, "notifications", "seqs"}; an
+    outcome is either {"bid", "order", "created"} or {"status_code", "error"}.
+    The caller dispatches the notifications and publishes feed deltas
+    (_publish_accepted) once the transaction is committed.
+    """
+    from ..models.models import Order
+
+    bid_ids = sorted(set(bid_ids))
+    for attempt in range(2):
+        try:
+            outcomes, notifications, seqs = _accept_attempt(db, bid_ids, current_user)
+            order_ids = [o["order"].id for o in outcomes.values() if "order" in o]
+            notification_ids = [n.id for n in notifications]
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            if attempt == 0:
+                continue
+            raise
+
+        # Reload what we return/emit in a few queries instead of one refresh per object
+        db.query(Bid).filter(Bid.id.in_(bid_ids)).all()
+        db.query(Order).filter(Order.id.in_(order_ids)).all()
+        reload_notifications(db, notification_ids)
+        return {"outcomes": outcomes, "notifications": notifications, "seqs": seqs}
+
+
+async def _publish_accepted(fastapi_req: Request, result: dict):
+    # Emit real-time notifications, and the status changes to the buyers' live bid feeds
+    await fastapi_req.app.state.notifier.dispatch(result["notifications"])
+    for outcome in result["outcomes"].values():
+        if outcome.get("created"):
+            bid = outcome["bid"]
+            await bid_feed.publish(fastapi_req.app.state.sio, bid.bid_request_id,
+                                   result["seqs"][bid.bid_request_id], bid_feed.BID_UPDATED, bid)
+
 
 @router.patch("/{bid_id}/accept", response_model=BidResponse)
 async def accept_bid(
@@ -279,67 +465,30 @@ async def accept_bid(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user_from_token)
 ):
-    bid = db.query(Bid).filter(Bid.id == bid_id).first()
-    if not bid:
-        raise HTTPException(status_code=404, detail="Bid not found")
-    
-    bid_request = db.query(BidRequest).filter(BidRequest.id == bid.bid_request_id).first()
-    if bid_request.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Only the request owner can accept bids")
+    result = await asyncio.to_thread(_accept_bids, db, [bid_id], current_user)
+    outcome = result["outcomes"][bid_id]
+    if "error" in outcome:
+        raise HTTPException(status_code=outcome["status_code"], detail=outcome["error"])
+    await _publish_accepted(fastapi_req, result)
+    return outcome["bid"]
 
-    # Update states
-    bid.status = BidStatus.ACCEPTED
-    bid_request.status = BidRequestStatus.ACCEPTED
-    
-    # Note: We no longer auto-reject other bids because the buyer can accept multiple bids
-    
-    db.commit()
-    
-    # Create an Order
-    from ..models.models import Order, OrderStatus, Category, Notification
-    
-    category = db.query(Category).filter(Category.id == bid_request.category_id).first()
-    cat_name = category.name if category else "Custom Request"
-    service_name = f"Custom Order: {cat_name}"
-    
-    new_order = Order(
-        buyer_id=current_user.id,
-        seller_id=bid.seller_id,
-        service_name=service_name,
-        amount=bid.price,
-        status=OrderStatus.PENDING
-    )
-    db.add(new_order)
-    
-    # Notify the seller
-    buyer_name = f"{current_user.first_name or ''} {current_user.last_name or ''}".strip() or "A buyer"
-    new_notif = Notification(
-        user_id=bid.seller_id,
-        title="Bid Accepted!",
-        message=f"{buyer_name} has accepted your proposal for '{cat_name}'. A new order has been created.",
-        type="bid_accepted",
-        reference_id=bid.id
-    )
-    db.add(new_notif)
-    
-    db.commit()
-    db.refresh(bid)
-    db.refresh(new_order)
-    db.refresh(new_notif)
-    
-    # Emit real-time notification
-    try:
-        sio = fastapi_req.app.state.sio
-        await sio.emit("new_notification", {
-            "id": new_notif.id,
-            "title": new_notif.title,
-            "text": new_notif.message,
-            "time": "Just now",
-            "unread": not new_notif.is_read,
-            "type": new_notif.type,
-            "reference_id": new_notif.reference_id
-        }, room=f"user_{bid.seller_id}")
-    except Exception as e:
-        print(f"Failed to send notification: {e}")
-    
-    return bid
+@router.post("/accept", response_model=BidAcceptBatchResponse)
+async def accept_bids(
+    batch: BidAcceptBatch,
+    fastapi_req: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_from_token)
+):
+    """Accept several bids at once; one transaction, one Order per bid, per-bid results."""
+    result = await asyncio.to_thread(_accept_bids, db, batch.bid_ids, current_user)
+    await _publish_accepted(fastapi_req, result)
+
+    results = []
+    for bid_id in dict.fromkeys(batch.bid_ids):
+        outcome = result["outcomes"][bid_id]
+        if "error" in outcome:
+            results.append(BidAcceptResult(bid_id=bid_id, ok=False, error=outcome["error"]))
+        else:
+            results.append(BidAcceptResult(bid_id=bid_id, ok=True, order_id=outcome["order"].id,
+                                           created=outcome["created"]))
+    return BidAcceptBatchResponse(accepted=sum(1 for r in results if r.ok), results=results)
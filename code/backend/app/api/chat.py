@@ -3,9 +3,13 @@ from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from typing import List, Optional
 from ..database import get_db
-from ..models.models import BidRequest, BidRequestStatus, Category, User, Listing
+from ..models.models import BidRequest, BidRequestStatus, User
 from ..api.auth import get_current_user_from_token
 from ..ai_service import chat_with_ai
+from ..utils.notifications import create_notifications, reload_notifications
+from ..utils.matching import add_leads, match_sellers
+from ..utils.categories import category_cache
+from ..utils.rfp_fields import apply_rfp_fields, rfp_fields
 
 router = APIRouter(prefix="/chat", tags=["AI Chatbot"])
 
@@ -26,26 +30,6 @@ class ChatResponse(BaseModel):
     order: Optional[dict] = None
 
 
-# ── Helper: find or create a Category by name ─────────────────────────────────
-
-def get_or_create_category(db: Session, category_name: str) -> Category:
-    """
-    Looks up a category by name (case-insensitive).
-    If it doesn't exist yet, creates it automatically.
-    """
-    category = db.query(Category).filter(
-        Category.name.ilike(category_name.strip())
-    ).first()
-
-    if not category:
-        category = Category(name=category_name.strip().title())
-        db.add(category)
-        db.commit()
-        db.refresh(category)
-
-    return category
-
-
 # ── Main Chatbot Endpoint ─────────────────────────────────────────────────────
 
 @router.post("/rfp", response_model=ChatResponse)
@@ -90,8 +74,8 @@ async def rfp_chat(
     # ── All info collected — save BidRequest to DB ────────────────────────────
     order = result["order"]
 
-    # Find/create the category
-    category = get_or_create_category(db, order.get("category", "General"))
+    # Find/create the category (cached; a new one is upserted in this transaction)
+    category = category_cache.get_or_create(db, order.get("category") or "General")
 
     # Build a detailed description string from all the collected fields
     full_description = (
@@ -102,78 +86,42 @@ async def rfp_chat(
         f"Location: {order.get('location', 'N/A')}"
     )
 
-    # Create the BidRequest (this is your existing model — no schema changes needed)
+    # Create the BidRequest; the collected fields are also stored as typed columns
     new_bid_request = BidRequest(
         user_id=current_user.id,
         category_id=category.id,
         description=full_description,
         status=BidRequestStatus.OPEN
     )
+    apply_rfp_fields(new_bid_request, rfp_fields(
+        order.get("quantity"), order.get("budget"), order.get("event_date"), order.get("location")))
     db.add(new_bid_request)
     db.commit()
     db.refresh(new_bid_request)
 
-    # ── Notify relevant sellers via WebSocket ─────────────────────────────────
-    from ..models.models import Notification, Profile
+    # ── Fan out to matching sellers' lead inboxes + notify them ───────────────
     try:
-        sio = fastapi_req.app.state.sio
-        
-        seller_ids = set()
-        
-        # 1. Sellers who have a listing in this category
-        listing_sellers = db.query(Listing.seller_id).filter(
-            Listing.category_id == category.id
-        ).all()
-        for (s_id,) in listing_sellers:
-            seller_ids.add(s_id)
-            
-        # 2. Sellers whose profile bio or name shares keywords with the request
-        import re
-        def get_keywords(text):
-            if not text: return set()
-            words = re.findall(r'\b\w+\b', text.lower())
-            stop_words = {"a", "an", "the", "and", "or", "but", "in", "on", "at", "to", "for", "with", "by", "of", "is", "are", "was", "were", "i", "we", "you", "they", "it", "this", "that", "want", "need", "looking", "buy", "sell", "get", "make", "some", "any"}
-            return {w for w in words if w not in stop_words and len(w) > 2}
-            
-        request_text = f"{category.name} {order.get('description', '')}"
-        req_keywords = get_keywords(request_text)
-        
-        all_profiles = db.query(Profile).all()
-        for p in all_profiles:
-            prof_text = f"{p.name or ''} {p.description or ''}"
-            prof_keywords = get_keywords(prof_text)
-            if req_keywords.intersection(prof_keywords):
-                seller_ids.add(p.user_id)
-            
-        # Remove the buyer themselves
-        if current_user.id in seller_ids:
-            seller_ids.remove(current_user.id)
-        
-        for seller_id in seller_ids:
-            # Create a Notification in DB for persistence
-            new_notif = Notification(
-                user_id=seller_id,
-                title=f"New Lead: {category.name}",
-                message=f"A buyer is looking for {category.name}. Check it out!",
-                type="new_rfp",
-                reference_id=new_bid_request.id
-            )
-            db.add(new_notif)
-            db.commit()
-            db.refresh(new_notif)
-            
-            # Send real-time event
-            await sio.emit("new_notification", {
-                "id": new_notif.id,
-                "title": new_notif.title,
-                "text": new_notif.message,
-                "time": "Just now",
-                "unread": not new_notif.is_read,
-                "type": new_notif.type,
-                "reference_id": new_notif.reference_id
-            }, room=f"user_{seller_id}")
-            
+        seller_ids = match_sellers(db, new_bid_request, category.name)
+        add_leads(db, new_bid_request.id, seller_ids)
+
+        # Create Notifications in DB for persistence (lead cap applied), same commit as the leads
+        notifications = create_notifications(
+            db, seller_ids,
+            title=f"New Lead: {category.name}",
+            message=f"A buyer is looking for {category.name}. Check it out!",
+            type="new_rfp",
+            reference_id=new_bid_request.id,
+            commit=False,
+        )
+        notification_ids = [n.id for n in notifications]
+        db.commit()
+        reload_notifications(db, notification_ids)
+
+        # Send real-time events to sellers who are online
+        await fastapi_req.app.state.notifier.dispatch(notifications)
+
     except Exception as e:
+        db.rollback()
         print(f"Failed to send notification: {e}")
 
     return ChatResponse(
@@ -0,0 +1,95 @@
+# app/api/exports.py
+"""
+Full-history exports of the current user's orders, bids and reviews, streamed
+as NDJSON or CSV (see utils/export.py). Unlike GET /orders/user/{id} and
+GET /bids/my-bids, nothing is built up in memory, so large accounts can pull
+everything in one request. date_from/date_to (inclusive) filter on the row's
+creation time.
+"""
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+
+from ..database import get_read_sessionmaker
+from ..models.models import ArchivedBid, Bid, Order, Review, User
+from ..schemas.schemas import BidResponse, OrderResponse, ReviewResponse
+from ..utils.export import export_response
+from ..utils.serialization import schema_columns
+from .auth import get_current_user_from_token
+
+router = APIRouter(prefix="/exports", tags=["Exports"])
+
+FORMAT = Query("ndjson", pattern="^(ndjson|csv)$")
+
+
+def _date_range(column, date_from: Optional[date], date_to: Optional[date]) -> list:
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(status_code=400, detail="date_from is after date_to")
+    criteria = []
+    if date_from is not None:
+        criteria.append(column >= datetime.combine(date_from, time.min))
+    if date_to is not None:
+        criteria.append(column < datetime.combine(date_to + timedelta(days=1), time.min))
+    return criteria
+
+
+def _filename(kind: str, user_id: int) -> str:
+    return f"syncro-{kind}-{user_id}-{datetime.utcnow():%Y%m%d}"
+
+
+@router.get("/orders")
+def export_orders(
+    format: str = FORMAT,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    session_factory=Depends(get_read_sessionmaker),
+    current_user: User = Depends(get_current_user_from_token)
+):
+    """Every order the current user bought or sold, oldest first."""
+    columns = schema_columns(Order, OrderResponse)
+    stmt = select(*columns).where(
+        (Order.buyer_id == current_user.id) | (Order.seller_id == current_user.id),
+        *_date_range(Order.created_at, date_from, date_to),
+    ).order_by(Order.id)
+    return export_response(session_factory, [stmt], [c.key for c in columns], format, "orders",
+                           _filename("orders", current_user.id))
+
+
+@router.get("/bids")
+def export_bids(
+    format: str = FORMAT,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    session_factory=Depends(get_read_sessionmaker),
+    current_user: User = Depends(get_current_user_from_token)
+):
+    """Every bid the current user placed, archived ones included, oldest first."""
+    statements = []
+    for model in (ArchivedBid, Bid):  # archived bids are the older ones
+        columns = schema_columns(model, BidResponse)
+        statements.append(select(*columns).where(
+            model.seller_id == current_user.id,
+            *_date_range(model.created_at, date_from, date_to),
+        ).order_by(model.id))
+    keys = [c.key for c in schema_columns(Bid, BidResponse)]
+    return export_response(session_factory, statements, keys, format, "bids", _filename("bids", current_user.id))
+
+
+@router.get("/reviews")
+def export_reviews(
+    format: str = FORMAT,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    session_factory=Depends(get_read_sessionmaker),
+    current_user: User = Depends(get_current_user_from_token)
+):
+    """Every review the current user received or wrote, oldest first."""
+    columns = schema_columns(Review, ReviewResponse)
+    stmt = select(*columns).where(
+        (Review.reviewee_id == current_user.id) | (Review.reviewer_id == current_user.id),
+        *_date_range(Review.timestamp, date_from, date_to),
+    ).order_by(Review.id)
+    return export_response(session_factory, [stmt], [c.key for c in columns], format, "reviews",
+                           _filename("reviews", current_user.id))
@@ -1,17 +1,25 @@
 # app/api/listings.py
-from fastapi import APIRouter, UploadFile, File, Form, Depends
-from typing import List
+from fastapi import APIRouter, BackgroundTasks, UploadFile, File, Form, Depends, Query, Request
+from sqlalchemy import or_
+from typing import List, Optional
 from ..utils.media import upload_image
-from ..models.models import Listing, User
+from ..models.models import Listing, User, UserRole
 from ..schemas.schemas import ListingResponse
-from ..database import get_db
+from ..database import get_db, get_read_db
 from sqlalchemy.orm import Session
 from ..api.auth import get_current_user_from_token
+from ..core.cache import cached_json_response, response_cache
+from ..utils.serialization import select_rows
+from ..jobs.seller_leads import rebuild_for_seller
+from .profiles import invalidate_profile_page
+from ..utils.seller_scores import seller_score_column
+from ..utils.expand import expand_rows, parse_expand
 
 router = APIRouter()
 
 @router.post("/listings/create")
 async def create_listing_with_image(
+    background_tasks: BackgroundTasks,
     title: str = Form(...),
     price: float = Form(...),
     description: str = Form(...),
@@ -40,10 +48,45 @@ async def create_listing_with_image(
     db.add(new_listing)
     db.commit()
     db.refresh(new_listing)
+    response_cache.invalidate("listings")
+    invalidate_profile_page(current_user.id)
+    if current_user.active_role == UserRole.SELLER:
+        background_tasks.add_task(rebuild_for_seller, current_user.id)  # may match a new category now
     
     return {"message": "Listing created", "listing": new_listing}
 
+LISTING_SORTS = {
+    "newest": Listing.id.desc(),
+    "price_asc": Listing.price.asc(),
+    "price_desc": Listing.price.desc(),
+    "best": seller_score_column(Listing.seller_id).desc(),  # best sellers first (utils/seller_scores.py)
+}
+
 @router.get("/listings", response_model=List[ListingResponse])
-async def get_listings(db: Session = Depends(get_db)):
-    listings = db.query(Listing).all()
-    return listings
\ No newline at end of file
+async def get_listings(
+    request: Request,
+    q: Optional[str] = Query(None, max_length=100, description="search title and description"),
+    category_id: Optional[int] = None,
+    sort: Optional[str] = Query(None, pattern="^(newest|price_asc|price_desc|best)$"),
+    expand: Optional[str] = Query(None, description="seller: embed seller_summary"),
+    db: Session = Depends(get_read_db)
+):
+    roles = parse_expand(expand, ["seller"])
+    q = " ".join(q.split()) if q else None
+    criteria = []
+    if q:
+        criteria.append(or_(Listing.title.icontains(q, autoescape=True),
+                            Listing.description.icontains(q, autoescape=True)))
+    if category_id is not None:
+        criteria.append(Listing.category_id == category_id)
+
+    def load():
+        rows = select_rows(db, Listing, ListingResponse, *criteria,
+                           order_by=LISTING_SORTS[sort] if sort else None)
+        return expand_rows(db, rows, roles)
+
+    # "best" order and seller ratings follow score changes within the cache TTL;
+    # listing and profile writes invalidate every key
+    key = "all" if not (q or category_id or sort or roles) else \
+        f"{sort}:{category_id}:{(q or '').lower()}:{','.join(roles)}"
+    return await cached_json_response(request, "listings", key, load)
\ No newline at end of file
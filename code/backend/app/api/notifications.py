@@ -1,15 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+import os
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from pydantic import BaseModel
 from datetime import datetime
+import orjson
 
-from ..database import get_db
+from ..database import SessionLocal, get_db, get_read_db
 from ..models.models import Notification, User
 from .auth import get_current_user_from_token
+from ..utils.notifications import REPLAY_LIMIT, missed_notifications, notification_payload, streams
+from ..utils.serialization import rows_response, select_rows
 
 router = APIRouter(prefix="/notifications", tags=["notifications"])
 
+# SSE stream: comment line sent when idle (keeps proxies from closing the connection), and how often
+# to look in the database for notifications created on other workers (0 = only this worker's dispatches)
+STREAM_HEARTBEAT = float(os.getenv("NOTIFY_SSE_HEARTBEAT_S", "15"))
+STREAM_POLL = float(os.getenv("NOTIFY_SSE_POLL_S", "30"))
+
 class NotificationResponse(BaseModel):
     id: int
     title: str
@@ -24,12 +36,14 @@ class NotificationResponse(BaseModel):
 
 @router.get("/", response_model=List[NotificationResponse])
 def get_notifications(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user_from_token)
 ):
-    return db.query(Notification).filter(
-        Notification.user_id == current_user.id
-    ).order_by(Notification.created_at.desc()).all()
+    return rows_response(select_rows(
+        db, Notification, NotificationResponse,
+        Notification.user_id == current_user.id,
+        order_by=Notification.created_at.desc(),
+    ))
 
 @router.put("/{notification_id}/read", response_model=NotificationResponse)
 def mark_notification_read(
@@ -47,3 +61,117 @@ def mark_notification_read(
     db.commit()
     db.refresh(notif)
     return notif
+
+
+# ── SSE stream ────────────────────────────────────────────────────────────────
+# For clients that can't keep a WebSocket open (proxies that drop the upgrade).
+# Same payloads as the `new_notification` socket event, fed by the same
+# NotificationDispatcher; each event's id is the notification id, so the
+# browser's automatic reconnect resumes via Last-Event-ID.
+
+def stream_user(request: Request, token: Optional[str] = None, db: Session = Depends(get_db)) -> User:
+    """JWT from the Authorization header, or ?token= (EventSource can't set headers)."""
+    header = request.headers.get("authorization", "")
+    if header.lower().startswith("bearer "):
+        token = header[7:]
+    if not token:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    return get_current_user_from_token(token, db)
+
+
+def _sse(event: str, data, event_id: Optional[int] = None) -> bytes:
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{head}event: {event}\n".encode() + b"data: " + orjson.dumps(data) + b"\n\n"
+
+
+def _latest_id(user_id: int) -> int:
+    db = SessionLocal()
+    try:
+        return db.query(func.max(Notification.id)).filter(Notification.user_id == user_id).scalar() or 0
+    finally:
+        db.close()
+
+
+def _missed(user_id: int, after_id: int) -> List[dict]:
+    db = SessionLocal()
+    try:
+        return [notification_payload(n) for n in missed_notifications(db, user_id, after_id, REPLAY_LIMIT + 1)]
+    finally:
+        db.close()
+
+
+async def _catch_up(user_id: int, last_id: int):
+    """Events for everything after `last_id` in the database, and the new last id."""
+    payloads = await asyncio.to_thread(_missed, user_id, last_id)
+    if len(payloads) > REPLAY_LIMIT:
+        # Away too long: the client should refetch GET /notifications/ instead
+        latest = await asyncio.to_thread(_latest_id, user_id)
+        return _sse("reset", {}, latest), latest
+    return b"".join(_sse("notification", p, p["id"]) for p in payloads), max([last_id] + [p["id"] for p in payloads])
+
+
+async def _event_stream(user_id: int, last_id: Optional[int]):
+    # Register before reading the database so nothing dispatched in between is lost
+    stream = streams.open(user_id)
+    loop = asyncio.get_running_loop()
+    try:
+        yield b"retry: 5000\n\n"
+        if last_id is None:
+            last_id = await asyncio.to_thread(_latest_id, user_id)
+        else:
+            chunk, last_id = await _catch_up(user_id, last_id)
+            if chunk:
+                yield chunk
+        next_poll = loop.time() + STREAM_POLL
+        while True:
+            if stream.overflowed or (STREAM_POLL > 0 and loop.time() >= next_poll):
+                stream.overflowed = False
+                while not stream.queue.empty():
+                    stream.queue.get_nowait()
+                chunk, last_id = await _catch_up(user_id, last_id)
+                if chunk:
+                    yield chunk
+                next_poll = loop.time() + STREAM_POLL
+            timeout = STREAM_HEARTBEAT
+            if STREAM_POLL > 0:
+                timeout = max(min(timeout, next_poll - loop.time()), 0)
+            try:
+                payloads = [await asyncio.wait_for(stream.queue.get(), timeout)]
+            except asyncio.TimeoutError:
+                yield b": ping\n\n"
+                continue
+            while not stream.queue.empty():
+                payloads.append(stream.queue.get_nowait())
+            # Skip anything already sent by a catch-up
+            payloads = [p for p in payloads if p["id"] > last_id]
+            if payloads:
+                last_id = max(p["id"] for p in payloads)
+                yield b"".join(_sse("notification", p, p["id"]) for p in payloads)
+    finally:
+        streams.close(stream)
+
+
+@router.get("/stream")
+def stream_notifications(
+    request: Request,
+    last_event_id: Optional[int] = None,
+    current_user: User = Depends(stream_user)
+):
+    """
+    Server-Sent Events: `notification` events (id = notification id), a
+    `reset` event when more than NOTIFY_REPLAY_LIMIT were missed (refetch the
+    list), and a comment line every NOTIFY_SSE_HEARTBEAT_S seconds. Resumes
+    after the Last-Event-ID header (sent by the browser on reconnect) or
+    ?last_event_id=; without either, starts with new notifications only.
+    """
+    header = request.headers.get("last-event-id")
+    if header is not None:
+        try:
+            last_event_id = int(header)
+        except ValueError:
+            pass
+    return StreamingResponse(
+        _event_stream(current_user.id, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
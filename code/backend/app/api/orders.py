@@ -1,22 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from typing import List
-from ..database import get_db
+from typing import List, Optional
+from ..database import get_db, get_read_db
 from ..models.models import Order, OrderStatus, User
 from ..schemas.schemas import OrderCreate, OrderResponse
 from ..api.auth import get_current_user_from_token
+from ..utils.serialization import rows_response, select_rows
+from ..utils import seller_scores
+from ..utils.expand import expand_rows, parse_expand
 
 router = APIRouter(prefix="/orders", tags=["Orders"])
 
 @router.get("/user/{user_id}", response_model=List[OrderResponse])
-def get_user_orders(user_id: int, db: Session = Depends(get_db)):
-    orders = db.query(Order).filter((Order.buyer_id == user_id) | (Order.seller_id == user_id)).all()
-    return orders
+def get_user_orders(
+    user_id: int,
+    expand: Optional[str] = Query(None, description="seller and/or buyer: embed their summaries"),
+    db: Session = Depends(get_read_db)
+):
+    roles = parse_expand(expand, ["seller", "buyer"])
+    orders = select_rows(db, Order, OrderResponse, (Order.buyer_id == user_id) | (Order.seller_id == user_id))
+    return rows_response(expand_rows(db, orders, roles))
 
 @router.post("/", response_model=OrderResponse)
 def create_order(order_data: OrderCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user_from_token)):
     new_order = Order(**order_data.dict(), buyer_id=current_user.id)
     db.add(new_order)
+    seller_scores.record(db, new_order.seller_id, orders_total=1,
+                         **seller_scores.order_status_deltas(None, new_order.status))
     db.commit()
     db.refresh(new_order)
     return new_order
@@ -27,6 +37,7 @@ def update_order_status(order_id: int, status: OrderStatus, db: Session = Depend
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
     
+    seller_scores.record(db, order.seller_id, **seller_scores.order_status_deltas(order.status, status))
     order.status = status
     db.commit()
     db.refresh(order)
@@ -1,36 +1,138 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+import os
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, UploadFile, File, Request
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
-from typing import List
-from ..database import get_db
-from ..models.models import Profile, User
-from ..schemas.schemas import ProfileResponse, ProfileCreate, ProfileUpdate
+from typing import List, Optional
+from ..database import get_db, get_read_db
+from ..models.models import Listing, Profile, Review, SellerScore, User, UserRole
+from ..schemas.schemas import (ListingResponse, ProfilePageResponse, ProfileResponse, ProfileCreate, ProfileUpdate,
+                               ReviewResponse)
 from ..api.auth import get_current_user_from_token
 from ..utils.media import upload_image
+from ..core.cache import cached_json_response, response_cache
+from ..jobs.seller_leads import rebuild_for_seller
+from ..utils.geo import locate
+from ..utils.serialization import rows_response, select_rows
+from ..utils.expand import expand_rows
+from ..utils.seller_scores import COUNTERS, rates
 
 router = APIRouter(prefix="/profiles", tags=["Profiles"])
 
+MAX_BATCH_IDS = 100
+PAGE_CACHE_TTL = float(os.getenv("PROFILE_PAGE_CACHE_TTL", "15"))
+
+
+def invalidate_profile_page(user_id: int):
+    """Drop every cached page (all listing pages) of GET /profiles/{user_id}/page."""
+    response_cache.invalidate(f"profile_page:{user_id}")
+
+
+@router.get("", response_model=List[ProfileResponse])
+@router.get("/", response_model=List[ProfileResponse], include_in_schema=False)
+def get_profiles(
+    ids: str = Query(..., description="comma-separated user ids, e.g. 1,2,3 (at most 100)"),
+    db: Session = Depends(get_read_db)
+):
+    """Many profiles in one `user_id IN (...)` query; users without a profile are left out."""
+    try:
+        user_ids = list(dict.fromkeys(int(part) for part in ids.split(",") if part.strip()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be comma-separated integers")
+    if len(user_ids) > MAX_BATCH_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_IDS} ids per request")
+    if not user_ids:
+        return []
+    return rows_response(select_rows(db, Profile, ProfileResponse, Profile.user_id.in_(user_ids),
+                                     order_by=Profile.user_id))
+
 @router.get("/{user_id}", response_model=ProfileResponse)
-def get_profile(user_id: int, db: Session = Depends(get_db)):
-    profile = db.query(Profile).filter(Profile.user_id == user_id).first()
-    if not profile:
-        raise HTTPException(status_code=404, detail="Profile not found")
-    return profile
+async def get_profile(user_id: int, request: Request, db: Session = Depends(get_read_db)):
+    def load():
+        profile = db.query(Profile).filter(Profile.user_id == user_id).first()
+        if not profile:
+            raise HTTPException(status_code=404, detail="Profile not found")
+        return ProfileResponse.model_validate(profile)
+
+    return await cached_json_response(request, "profiles", user_id, load)
+
+@router.get("/{user_id}/page", response_model=ProfilePageResponse)
+async def get_profile_page(
+    user_id: int,
+    request: Request,
+    limit: int = Query(12, ge=1, le=50, description="listings per page"),
+    before_id: Optional[int] = Query(None, description="listings older than this id (next page)"),
+    reviews: int = Query(5, ge=0, le=20, description="latest reviews to include"),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Everything a seller page shows, in one response: the profile, a page of
+    listings (newest first), the rating summary and the latest reviews.
+    A fixed number of indexed queries, cached for PROFILE_PAGE_CACHE_TTL
+    seconds and dropped on profile, listing and review writes.
+    """
+    def load():
+        profiles = select_rows(db, Profile, ProfileResponse, Profile.user_id == user_id)
+        if not profiles:
+            raise HTTPException(status_code=404, detail="Profile not found")
+
+        criteria = [Listing.seller_id == user_id]
+        if before_id is not None:
+            criteria.append(Listing.id < before_id)
+        listings = select_rows(db, Listing, ListingResponse, *criteria, order_by=Listing.id.desc(), limit=limit + 1)
+
+        distribution = {stars: 0 for stars in range(1, 6)}
+        for rating, count in db.execute(select(Review.rating, func.count(Review.id)).where(
+                Review.reviewee_id == user_id).group_by(Review.rating)):
+            stars = min(max(int(rating + 0.5), 1), 5)
+            distribution[stars] += count
+        total = sum(distribution.values())
+        rating_sum = sum(stars * count for stars, count in distribution.items())
+
+        score = db.execute(select(SellerScore).where(SellerScore.seller_id == user_id)).scalar_one_or_none()
+        components = rates({k: getattr(score, k) for k in COUNTERS}) if score else None
+
+        latest = select_rows(db, Review, ReviewResponse, Review.reviewee_id == user_id,
+                             order_by=Review.id.desc(), limit=reviews) if reviews else []
+        return {
+            "profile": profiles[0],
+            "listings": listings[:limit],
+            "next_before_id": listings[limit - 1]["id"] if len(listings) > limit else None,
+            "rating": {
+                "mean": round(rating_sum / total, 2) if total else None,
+                "count": total,
+                "distribution": {str(stars): count for stars, count in distribution.items()},
+                "score": score.score if score else None,
+                "completion_rate": round(components["completion_rate"], 3)
+                if components and components["completion_rate"] is not None else None,
+                "avg_response_hours": round(components["avg_response_hours"], 1)
+                if components and components["avg_response_hours"] is not None else None,
+            },
+            "reviews": expand_rows(db, latest, ["reviewer"]),
+        }
+
+    key = f"{limit}:{before_id}:{reviews}"
+    return await cached_json_response(request, f"profile_page:{user_id}", key, load, ttl=PAGE_CACHE_TTL)
 
 @router.post("/", response_model=ProfileResponse)
-def create_profile(profile_data: ProfileCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user_from_token)):
+def create_profile(profile_data: ProfileCreate, background_tasks: BackgroundTasks, db: Session = Depends(get_db), current_user: User = Depends(get_current_user_from_token)):
     user_id = current_user.id
     existing_profile = db.query(Profile).filter(Profile.user_id == user_id).first()
     if existing_profile:
          raise HTTPException(status_code=400, detail="Profile already exists")
     
-    new_profile = Profile(**profile_data.dict(), user_id=user_id)
+    new_profile = Profile(**profile_data.dict(), **locate(profile_data.address), user_id=user_id)
     db.add(new_profile)
     db.commit()
     db.refresh(new_profile)
+    response_cache.invalidate("profiles", user_id)
+    response_cache.invalidate("listings")  # ?expand=seller embeds names and logos
+    invalidate_profile_page(user_id)
+    if current_user.active_role == UserRole.SELLER:
+        background_tasks.add_task(rebuild_for_seller, user_id)  # name/bio keywords, location changed
     return new_profile
 
 @router.put("/me", response_model=ProfileResponse)
-def update_profile(profile_data: ProfileUpdate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user_from_token)):
+def update_profile(profile_data: ProfileUpdate, background_tasks: BackgroundTasks, db: Session = Depends(get_db), current_user: User = Depends(get_current_user_from_token)):
     user_id = current_user.id
     profile = db.query(Profile).filter(Profile.user_id == user_id).first()
     
@@ -42,11 +144,20 @@ def update_profile(profile_data: ProfileUpdate, db: Session = Depends(get_db), c
         db.add(profile)
         db.flush()
     
-    for key, value in profile_data.dict(exclude_unset=True).items():
+    changes = profile_data.dict(exclude_unset=True)
+    for key, value in changes.items():
         setattr(profile, key, value)
+    if "address" in changes:
+        for key, value in locate(profile.address).items():
+            setattr(profile, key, value)
         
     db.commit()
     db.refresh(profile)
+    response_cache.invalidate("profiles", user_id)
+    response_cache.invalidate("listings")  # ?expand=seller embeds names and logos
+    invalidate_profile_page(user_id)
+    if current_user.active_role == UserRole.SELLER and {"name", "description", "address", "service_radius_km"} & changes.keys():
+        background_tasks.add_task(rebuild_for_seller, user_id)  # name/bio keywords or service area changed
     return profile
 
 @router.post("/upload")
@@ -1,17 +1,34 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
-from typing import List
-from ..database import get_db
+from typing import List, Optional
+from ..database import get_db, get_read_db
 from ..models.models import Review, Order, OrderStatus, User
 from ..schemas.schemas import ReviewCreate, ReviewResponse
 from ..api.auth import get_current_user_from_token
+from ..core.cache import cached_json_response, response_cache
+from ..utils.serialization import select_rows
+from ..utils import seller_scores
+from ..utils.expand import expand_rows, parse_expand
+from .profiles import invalidate_profile_page
 
 router = APIRouter(prefix="/reviews", tags=["Reviews"])
 
 @router.get("/user/{user_id}", response_model=List[ReviewResponse])
-def get_user_reviews(user_id: int, db: Session = Depends(get_db)):
-    reviews = db.query(Review).filter(Review.reviewee_id == user_id).all()
-    return reviews
+async def get_user_reviews(
+    user_id: int,
+    request: Request,
+    expand: Optional[str] = Query(None, description="reviewer: embed reviewer_summary"),
+    db: Session = Depends(get_read_db)
+):
+    # Every review here has the same reviewee, so the useful expansion is the reviewer
+    roles = parse_expand(expand, ["reviewer"])
+
+    def load():
+        return expand_rows(db, select_rows(db, Review, ReviewResponse, Review.reviewee_id == user_id), roles)
+
+    # Embedded reviewer names follow profile edits within the cache TTL
+    key = user_id if not roles else f"{user_id}:{','.join(roles)}"
+    return await cached_json_response(request, "reviews", key, load)
 
 
 @router.post("/order/{order_id}", response_model=ReviewResponse)
@@ -48,7 +65,12 @@ def create_review(order_id: int, review_data: ReviewCreate, db: Session = Depend
     
     db.add(new_review)
     order.has_review = True # Update order status
+    if reviewee_id == order.seller_id:
+        seller_scores.record(db, reviewee_id, rating_sum=new_review.rating, rating_count=1)
     db.commit()
     db.refresh(new_review)
+    response_cache.invalidate("reviews", reviewee_id)
+    response_cache.invalidate("reviews", f"{reviewee_id}:reviewer")  # the ?expand=reviewer variant
+    invalidate_profile_page(reviewee_id)
     
     return new_review
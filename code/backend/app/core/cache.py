@@ -0,0 +1,274 @@
+# app/core/cache.py
+"""
+Response cache for public, read-heavy GET endpoints.
+
+- Each worker keeps a bounded in-process LRU of rendered JSON bodies.
+- If REDIS_URL is set (and the `redis` package is installed) bodies and
+  invalidation versions are also shared between workers/instances.
+- Responses carry a strong ETag; a matching If-None-Match gets a bodyless 304.
+- Write paths call `response_cache.invalidate(namespace, key)`, which bumps a
+  version number instead of hunting down entries.
+- Concurrent misses on the same key are coalesced (single-flight), so a burst
+  of requests for a cold key runs the loader - and the DB query - only once.
+
+Without REDIS_URL, invalidation only reaches the worker that handled the
+write; other workers drop their copy after RESPONSE_CACHE_TTL seconds.
+"""
+import asyncio
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from fastapi import Request, Response
+from fastapi.concurrency import run_in_threadpool
+
+from .metrics import REGISTRY
+from ..utils.serialization import dumps
+
+CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "512"))
+CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "60"))
+# Browsers/CDNs must revalidate by default (cheap thanks to the ETag) so a user
+# never sees their own write hidden behind a max-age.
+HTTP_MAX_AGE = int(os.getenv("HTTP_CACHE_MAX_AGE", "0"))
+# Bodies loaded from the read replica may be a little behind the primary; keep
+# them only briefly so a lagging read doesn't outlive the lag by a full TTL.
+REPLICA_CACHE_TTL = float(os.getenv("REPLICA_CACHE_TTL", "5"))
+REDIS_URL = os.getenv("REDIS_URL")
+
+cache_requests_total = REGISTRY.counter(
+    "syncro_response_cache_requests_total", "Response cache lookups", ("namespace", "result"))
+
+
+class LRUCache:
+    """Thread-safe LRU with per-entry expiry."""
+
+    def __init__(self, max_entries: int = CACHE_SIZE):
+        self.max_entries = max_entries
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl: float):
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class CachedBody:
+    __slots__ = ("body", "etag")
+
+    def __init__(self, body: bytes, etag: str):
+        self.body = body
+        self.etag = etag
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Strong comparison, but tolerate a W/ prefix added by proxies
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag in candidates
+
+
+class _RedisBackend:
+    """Shared body storage and version counters (optional)."""
+
+    PREFIX = "syncro:cache:"
+
+    def __init__(self, url: str):
+        import redis  # optional dependency, only needed when REDIS_URL is set
+        self.client = redis.Redis.from_url(url, socket_timeout=0.25)
+
+    def versions(self, version_keys: list) -> list:
+        values = self.client.mget([self.PREFIX + "v:" + k for k in version_keys])
+        return [int(v) if v else 0 for v in values]
+
+    def bump(self, version_key: str):
+        self.client.incr(self.PREFIX + "v:" + version_key)
+
+    def get(self, key: str) -> Optional[CachedBody]:
+        raw = self.client.get(self.PREFIX + key)
+        if not raw:
+            return None
+        etag, _, body = raw.partition(b"\n")
+        return CachedBody(body, etag.decode())
+
+    def set(self, key: str, value: CachedBody, ttl: float):
+        self.client.set(self.PREFIX + key, value.etag.encode() + b"\n" + value.body, ex=max(1, int(ttl)))
+
+
+class ResponseCache:
+    def __init__(self, max_entries: int = CACHE_SIZE, redis_url: Optional[str] = REDIS_URL):
+        self.local = LRUCache(max_entries)
+        self._versions = {}
+        self._versions_lock = threading.Lock()
+        self._inflight = {}
+        self.shared = None
+        if redis_url:
+            try:
+                self.shared = _RedisBackend(redis_url)
+            except ImportError:
+                print("REDIS_URL is set but the 'redis' package is not installed; using the in-process cache only")
+
+    # ── Versions / invalidation ───────────────────────────────────────────────
+
+    @staticmethod
+    def _version_keys(namespace: str, key) -> list:
+        version_keys = [namespace, f"{namespace}:{key}"]
+        family, sep, _ = namespace.partition(":")
+        if sep:
+            version_keys.insert(0, family)  # invalidate("profile_page") drops every "profile_page:{user_id}"
+        return version_keys
+
+    def _version(self, namespace: str, key) -> Optional[str]:
+        version_keys = self._version_keys(namespace, key)
+        if self.shared is not None:
+            try:
+                return ".".join(str(v) for v in self.shared.versions(version_keys))
+            except Exception as e:
+                print(f"Response cache: shared backend unavailable ({e}); bypassing cache")
+                return None
+        with self._versions_lock:
+            return ".".join(str(self._versions.get(k, 0)) for k in version_keys)
+
+    def current_version(self, namespace: str, key=None) -> Optional[str]:
+        """Opaque version of (namespace, key); changes whenever either is invalidated. None if unknown."""
+        return self._version(namespace, key)
+
+    def invalidate(self, namespace: str, key=None):
+        """
+        Drop one key, or every key of a namespace when `key` is None. A
+        namespace "a" also covers the per-entity namespaces "a:{id}".
+        """
+        version_key = namespace if key is None else f"{namespace}:{key}"
+        with self._versions_lock:
+            self._versions[version_key] = self._versions.get(version_key, 0) + 1
+        if self.shared is not None:
+            try:
+                self.shared.bump(version_key)
+            except Exception as e:
+                print(f"Response cache: failed to invalidate {version_key}: {e}")
+
+    def invalidate_all(self):
+        """Drop every namespace that shows user data (after an account is deleted)."""
+        self.local.clear()
+        for namespace in ("listings", "profiles", "reviews", "profile_page", "analytics"):
+            self.invalidate(namespace)
+
+    # ── Lookup ────────────────────────────────────────────────────────────────
+
+    async def get_or_load(self, namespace: str, key, loader: Callable[[], object], ttl: float = CACHE_TTL) -> CachedBody:
+        """Return the cached body for (namespace, key), running the sync `loader` on a miss."""
+        if self.shared is not None:
+            version = await run_in_threadpool(self._version, namespace, key)
+        else:
+            version = self._version(namespace, key)
+        if version is None:
+            cache_requests_total.inc(namespace=namespace, result="bypass")
+            return self._render(await run_in_threadpool(loader))
+
+        cache_key = f"{namespace}:{key}:{version}"
+        cached = self.local.get(cache_key)
+        if cached is not None:
+            cache_requests_total.inc(namespace=namespace, result="hit")
+            return cached
+
+        # Single-flight: the first miss loads, concurrent misses await its result
+        inflight = self._inflight.get(cache_key)
+        if inflight is not None:
+            cache_requests_total.inc(namespace=namespace, result="coalesced")
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[cache_key] = future
+        try:
+            cached = await run_in_threadpool(self._load, namespace, cache_key, loader, ttl)
+            future.set_result(cached)
+            return cached
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody else was waiting
+            raise
+        finally:
+            del self._inflight[cache_key]
+
+    def _load(self, namespace: str, cache_key: str, loader, ttl: float) -> CachedBody:
+        if self.shared is not None:
+            try:
+                cached = self.shared.get(cache_key)
+            except Exception:
+                cached = None
+            if cached is not None:
+                cache_requests_total.inc(namespace=namespace, result="shared_hit")
+                self.local.set(cache_key, cached, ttl)
+                return cached
+
+        cache_requests_total.inc(namespace=namespace, result="miss")
+        cached = self._render(loader())
+        self.local.set(cache_key, cached, ttl)
+        if self.shared is not None:
+            try:
+                self.shared.set(cache_key, cached, ttl)
+            except Exception as e:
+                print(f"Response cache: failed to store {cache_key}: {e}")
+        return cached
+
+    @staticmethod
+    def _render(data) -> CachedBody:
+        body = dumps(data)
+        return CachedBody(body, make_etag(body))
+
+
+response_cache = ResponseCache()
+
+
+def cache_headers(etag: str, private: bool = False) -> dict:
+    scope = "private" if private else "public"
+    return {"ETag": etag, "Cache-Control": f"{scope}, max-age={HTTP_MAX_AGE}, must-revalidate"}
+
+
+async def cached_json_response(request: Request, namespace: str, key, loader: Callable[[], object],
+                               ttl: float = CACHE_TTL, private: bool = False) -> Response:
+    """
+    Serve `loader()`'s JSON through the response cache, answering 304 when the
+    client's If-None-Match already has the current representation.
+
+    Pass private=True for routes that require authentication, so shared caches
+    (CDNs, proxies) never store the body; only the caller's browser may.
+    """
+    if getattr(request.state, "read_replica", False):
+        ttl = min(ttl, REPLICA_CACHE_TTL)
+    cached = await response_cache.get_or_load(namespace, key, loader, ttl)
+    headers = cache_headers(cached.etag, private)
+    if etag_matches(request.headers.get("if-none-match"), cached.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=cached.body, media_type="application/json", headers=headers)
@@ -0,0 +1,206 @@
+# app/core/compression.py
+"""
+Smaller payloads on the wire for mobile clients.
+
+CompressionMiddleware (pure ASGI, like ProfilingMiddleware) compresses HTTP
+responses of at least COMPRESS_MIN_BYTES with the best encoding the client
+accepts: brotli when the optional `brotli` package is installed, else gzip.
+
+- One-shot responses are compressed in one go.
+- Streamed ones (exports) are compressed chunk by chunk with a sync flush,
+  so each chunk still reaches the client as soon as it is produced.
+- Server-Sent Events, responses that already have a Content-Encoding, and
+  Socket.IO (engine.io compresses its own polling responses) pass through.
+- A compressed response's ETag becomes weak (W/"..."), as HTTP requires;
+  core/cache.py accepts that prefix in If-None-Match, so 304s still work.
+- Every compressible response carries `Vary: Accept-Encoding`, also when it
+  goes out uncompressed (too small, or no Accept-Encoding), so shared
+  caches keep the encodings apart.
+
+Raw and sent bytes and the CPU time spent compressing are counted per
+encoding on /metrics, to weigh bandwidth against CPU.
+
+SOCKETIO_SERIALIZER=msgpack switches Socket.IO to the binary msgpack parser
+(needs the optional `msgpack` package). Every client then has to use
+socket.io-msgpack-parser. Notification payloads are also trimmed in that
+mode (utils/notifications.py).
+"""
+import os
+import time
+import zlib
+from typing import Optional
+
+from .metrics import REGISTRY
+
+try:
+    import brotli  # optional: pip install brotli
+except ImportError:
+    brotli = None
+
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))
+GZIP_LEVEL = int(os.getenv("COMPRESS_GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("COMPRESS_BROTLI_QUALITY", "4"))  # 4-5 is the usual sweet spot for dynamic content
+SKIP_PATH_PREFIXES = ("/socket.io",)
+SKIP_CONTENT_TYPES = ("text/event-stream", "image/", "video/", "application/zip", "application/gzip")
+
+SOCKETIO_SERIALIZER = os.getenv("SOCKETIO_SERIALIZER", "json").lower()
+
+compression_bytes_total = REGISTRY.counter(
+    "syncro_http_compression_bytes_total", "Response bytes before (raw) and after (sent) compression",
+    ("encoding", "stage"))
+compression_seconds_total = REGISTRY.counter(
+    "syncro_http_compression_seconds_total", "CPU time spent compressing responses", ("encoding",))
+
+
+def socketio_serializer() -> str:
+    """The python-socketio `serializer` argument: "msgpack" if asked for and installed, else "default"."""
+    if SOCKETIO_SERIALIZER != "msgpack":
+        return "default"
+    try:
+        import msgpack  # noqa: F401  optional: pip install msgpack
+    except ImportError:
+        print("SOCKETIO_SERIALIZER=msgpack but the msgpack package is not installed; using JSON")
+        return "default"
+    return "msgpack"
+
+
+def compact_socket_payloads() -> bool:
+    return socketio_serializer() == "msgpack"
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """"br" or "gzip" from an Accept-Encoding header (q-values honoured, brotli preferred on ties), or None."""
+    offered = {}
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        offered[name.strip()] = q
+    wildcard = offered.get("*", 0.0)
+    candidates = (["br"] if brotli is not None else []) + ["gzip"]
+    best, best_q = None, 0.0
+    for name in candidates:
+        q = offered.get(name, wildcard)
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+class _Encoder:
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            self._gzip = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)  # wbits 31 = gzip container
+
+    def chunk(self, data: bytes, final: bool) -> bytes:
+        started = time.process_time()
+        if self.encoding == "br":
+            out = self._brotli.process(data) + (self._brotli.finish() if final else self._brotli.flush())
+        else:
+            out = self._gzip.compress(data) + self._gzip.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+        compression_seconds_total.inc(time.process_time() - started, encoding=self.encoding)
+        compression_bytes_total.inc(len(data), encoding=self.encoding, stage="raw")
+        compression_bytes_total.inc(len(out), encoding=self.encoding, stage="sent")
+        return out
+
+
+class CompressionMiddleware:
+    def __init__(self, app, minimum_size: int = COMPRESS_MIN_BYTES):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(SKIP_PATH_PREFIXES):
+            return await self.app(scope, receive, send)
+        accept = ""
+        for name, value in scope.get("headers", []):
+            if name == b"accept-encoding":
+                accept = value.decode("latin-1")
+        encoding = choose_encoding(accept) if accept else None  # None: only Vary is added
+
+        start = None
+        encoder = None  # set once we decide to compress; None after deciding not to
+        decided = False
+
+        async def send_wrapper(message):
+            nonlocal start, encoder, decided
+            if message["type"] == "http.response.start":
+                start = message  # held until the first body chunk shows how big the response is
+                return
+            if message["type"] != "http.response.body" or (decided and encoder is None):
+                return await send(message)
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if not decided:
+                decided = True
+                if not self._compressible(start):
+                    if start["status"] == 304:  # must repeat the Vary the 200 would carry
+                        start = {**start, "headers": self._vary_headers(start.get("headers", []))}
+                    await send(start)
+                    return await send(message)
+                if encoding is None or (not more_body and len(body) < self.minimum_size):
+                    # Sent as is, but another Accept-Encoding could get it compressed: caches must know
+                    await send({**start, "headers": self._vary_headers(start.get("headers", []))})
+                    return await send(message)
+                encoder = _Encoder(encoding)
+                headers = self._compressed_headers(start.get("headers", []), encoding)
+                compressed = encoder.chunk(body, final=not more_body)
+                if not more_body:
+                    headers.append((b"content-length", str(len(compressed)).encode()))
+                await send({**start, "headers": headers})
+                return await send({"type": "http.response.body", "body": compressed, "more_body": more_body})
+
+            compressed = encoder.chunk(body, final=not more_body)
+            await send({"type": "http.response.body", "body": compressed, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
+        if start is not None and not decided:
+            await send(start)  # response without a body message
+
+    @staticmethod
+    def _vary_headers(headers: list) -> list:
+        out, vary = [], None
+        for name, value in headers:
+            if name.lower() == b"vary":
+                vary = value
+                continue
+            out.append((name, value))
+        if vary is not None and b"accept-encoding" in vary.lower():
+            out.append((b"vary", vary))
+        else:
+            out.append((b"vary", vary + b", Accept-Encoding" if vary else b"Accept-Encoding"))
+        return out
+
+    @classmethod
+    def _compressed_headers(cls, headers: list, encoding: str) -> list:
+        out = []
+        for name, value in headers:
+            lower = name.lower()
+            if lower == b"content-length":
+                continue
+            if lower == b"etag" and not value.startswith(b"W/"):
+                value = b"W/" + value
+            out.append((name, value))
+        out = cls._vary_headers(out)
+        out.append((b"content-encoding", encoding.encode()))
+        return out
+
+    @staticmethod
+    def _compressible(start: dict) -> bool:
+        if start["status"] < 200 or start["status"] in (204, 304):
+            return False
+        for name, value in start.get("headers", []):
+            name = name.lower()
+            if name == b"content-encoding":
+                return False
+            if name == b"content-type" and value.decode("latin-1").lower().startswith(SKIP_CONTENT_TYPES):
+                return False
+        return True
@@ -0,0 +1,226 @@
+# app/core/idempotency.py
+"""
+Idempotency-Key support for the POST endpoints clients retry on flaky
+networks (IDEMPOTENT_PATHS).
+
+A POST with an `Idempotency-Key` header claims (token subject, key) in the
+idempotency_keys table before the endpoint runs. The primary key makes the
+claim atomic, so only one of several concurrent duplicates gets to run:
+
+- the first request runs normally, and its response is stored if it
+  succeeded (2xx). On any other outcome the key is released, so the client
+  can retry;
+- a retry after that gets the stored response back (`Idempotent-Replayed:
+  true`) without touching the endpoint, so no second bid, fan-out or LLM
+  call;
+- a duplicate that arrives while the first is still running gets 409 with
+  Retry-After;
+- reusing a key with a different body or path gets 422.
+
+Stored responses are kept for IDEMPOTENCY_TTL_H hours. A claim left behind
+by a request that died mid-way can be taken over after IDEMPOTENCY_LOCK_S
+seconds. Requests without the header, or without a bearer token, pass
+straight through.
+"""
+import asyncio
+import hashlib
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import and_, delete, or_, update
+from sqlalchemy.exc import IntegrityError
+from starlette.responses import JSONResponse, Response
+
+from ..database import SessionLocal
+from ..models.models import IdempotencyKey
+from .metrics import REGISTRY
+from .read_routing import request_subject
+
+IDEMPOTENT_PATHS = {"/bids/", "/bids/batch", "/bids/requests", "/orders/", "/chat/rfp"}
+TTL = timedelta(hours=float(os.getenv("IDEMPOTENCY_TTL_H", "24")))
+LOCK_SECONDS = float(os.getenv("IDEMPOTENCY_LOCK_S", "120"))
+PURGE_INTERVAL = 600  # seconds between deletes of expired keys, per worker
+MAX_KEY_LENGTH = 255
+
+idempotency_total = REGISTRY.counter(
+    "syncro_idempotency_total", "Requests sent with an Idempotency-Key, by outcome", ("outcome",))
+
+
+def fingerprint(method: str, path: str, body: bytes) -> str:
+    return hashlib.sha256(method.encode() + b" " + path.encode() + b"\n" + body).hexdigest()
+
+
+def claim(subject: str, key: str, request_fingerprint: str) -> Optional[tuple]:
+    """
+    None if this request now owns the key; otherwise the existing
+    (fingerprint, status_code, content_type, body).
+    """
+    db = SessionLocal()
+    try:
+        for _ in range(2):
+            now = datetime.utcnow()
+            try:
+                db.add(IdempotencyKey(subject=subject, key=key, fingerprint=request_fingerprint,
+                                      locked_at=now, expires_at=now + TTL))
+                db.commit()
+                return None
+            except IntegrityError:
+                db.rollback()
+
+            # Take the key over if its stored response expired, or its first request never finished
+            match = and_(IdempotencyKey.subject == subject, IdempotencyKey.key == key)
+            taken = db.execute(update(IdempotencyKey).where(match, or_(
+                IdempotencyKey.expires_at < now,
+                and_(IdempotencyKey.status_code.is_(None),
+                     IdempotencyKey.locked_at < now - timedelta(seconds=LOCK_SECONDS)),
+            )).values(fingerprint=request_fingerprint, status_code=None, content_type=None, body=None,
+                      locked_at=now, expires_at=now + TTL)).rowcount
+            db.commit()
+            if taken:
+                return None
+
+            row = db.get(IdempotencyKey, (subject, key))
+            if row is not None:
+                return row.fingerprint, row.status_code, row.content_type, row.body
+            # Purged in between: try the insert again
+        raise RuntimeError(f"Could not claim idempotency key {key!r}")
+    finally:
+        db.close()
+
+
+def finish(subject: str, key: str, status_code: int, content_type: Optional[str], body: bytes):
+    db = SessionLocal()
+    try:
+        db.execute(update(IdempotencyKey).where(IdempotencyKey.subject == subject, IdempotencyKey.key == key)
+                   .values(status_code=status_code, content_type=content_type, body=body))
+        db.commit()
+    finally:
+        db.close()
+
+
+def release(subject: str, key: str):
+    db = SessionLocal()
+    try:
+        db.execute(delete(IdempotencyKey).where(IdempotencyKey.subject == subject, IdempotencyKey.key == key,
+                                                IdempotencyKey.status_code.is_(None)))
+        db.commit()
+    finally:
+        db.close()
+
+
+def purge_expired() -> int:
+    db = SessionLocal()
+    try:
+        deleted = db.execute(delete(IdempotencyKey).where(IdempotencyKey.expires_at < datetime.utcnow())).rowcount
+        db.commit()
+        return deleted
+    finally:
+        db.close()
+
+
+class IdempotencyMiddleware:
+    """Pure ASGI, like ReadYourWritesMiddleware; add it inside CORS so replays get CORS headers."""
+
+    def __init__(self, app, paths=IDEMPOTENT_PATHS):
+        self.app = app
+        self.paths = paths
+        self._next_purge = 0.0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in self.paths:
+            return await self.app(scope, receive, send)
+        headers = {k.decode("latin-1").lower(): v.decode("latin-1") for k, v in scope.get("headers", [])}
+        key = headers.get("idempotency-key")
+        subject = request_subject(headers) if key else None
+        if subject is None:
+            return await self.app(scope, receive, send)  # no key, or the endpoint will reject the token
+        if len(key) > MAX_KEY_LENGTH:
+            response = JSONResponse({"detail": f"Idempotency-Key is longer than {MAX_KEY_LENGTH} characters"},
+                                    status_code=400)
+            return await response(scope, receive, send)
+
+        # Read the whole body up front; the endpoint gets it replayed below
+        chunks = []
+        while True:
+            message = await receive()
+            if message["type"] != "http.request":
+                return  # client went away
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body"):
+                break
+        body = b"".join(chunks)
+
+        request_fingerprint = fingerprint(scope["method"], scope["path"], body)
+        existing = await asyncio.to_thread(claim, subject, key, request_fingerprint)
+        if existing is not None:
+            return await self._respond_existing(existing, request_fingerprint, scope, receive, send)
+
+        body_sent = False
+
+        async def replay_receive():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        status_code, content_type, response_chunks = None, None, []
+        settled = False
+
+        async def settle():
+            nonlocal settled
+            settled = True
+            if status_code is not None and 200 <= status_code < 300:
+                await asyncio.to_thread(finish, subject, key, status_code, content_type, b"".join(response_chunks))
+                idempotency_total.inc(outcome="stored")
+            else:
+                await asyncio.to_thread(release, subject, key)
+                idempotency_total.inc(outcome="released")
+
+        async def send_wrapper(message):
+            nonlocal status_code, content_type
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                for name, value in message.get("headers", []):
+                    if name.lower() == b"content-type":
+                        content_type = value.decode("latin-1")
+            elif message["type"] == "http.response.body":
+                response_chunks.append(message.get("body", b""))
+                if not message.get("more_body"):
+                    # Store/release before the client sees the end of the response, so an immediate retry finds it
+                    await settle()
+            await send(message)
+
+        try:
+            await self.app(scope, replay_receive, send_wrapper)
+        finally:
+            if not settled:
+                await asyncio.to_thread(release, subject, key)
+        await self._maybe_purge()
+
+    async def _respond_existing(self, existing: tuple, request_fingerprint: str, scope, receive, send):
+        stored_fingerprint, status_code, content_type, stored_body = existing
+        if stored_fingerprint != request_fingerprint:
+            idempotency_total.inc(outcome="mismatch")
+            response = JSONResponse({"detail": "Idempotency-Key was already used for a different request"},
+                                    status_code=422)
+        elif status_code is None:
+            idempotency_total.inc(outcome="in_progress")
+            response = JSONResponse({"detail": "A request with this Idempotency-Key is still in progress"},
+                                    status_code=409, headers={"Retry-After": "1"})
+        else:
+            idempotency_total.inc(outcome="replayed")
+            response = Response(content=stored_body, status_code=status_code, media_type=content_type,
+                                headers={"Idempotent-Replayed": "true"})
+        await response(scope, receive, send)
+
+    async def _maybe_purge(self):
+        if time.monotonic() < self._next_purge:
+            return
+        self._next_purge = time.monotonic() + PURGE_INTERVAL
+        try:
+            await asyncio.to_thread(purge_expired)
+        except Exception as e:
+            print(f"Idempotency: failed to purge expired keys: {e}")
@@ -0,0 +1,185 @@
+# app/core/profiling.py
+"""
+Per-request SQL profiling.
+
+SQLAlchemy cursor hooks count every statement a request runs and how long it
+spent in the database. ProfilingMiddleware then:
+  - adds a `Server-Timing` header (visible in the browser devtools),
+  - logs statements slower than SLOW_QUERY_MS,
+  - flags statements repeated N_PLUS_ONE_THRESHOLD+ times in one request
+    (same SQL, different parameters) as a likely N+1,
+  - feeds per-route histograms exposed on GET /metrics.
+Statements run on the read replica are also counted separately.
+"""
+import logging
+import os
+import re
+import time
+from collections import Counter as _Counter
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+
+from .metrics import REGISTRY
+
+logger = logging.getLogger("syncro.sql")
+
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "5"))
+
+QUERY_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100, 250, 500)
+
+http_request_seconds = REGISTRY.histogram(
+    "syncro_http_request_duration_seconds", "HTTP request latency", ("method", "route", "status"))
+http_db_queries = REGISTRY.histogram(
+    "syncro_http_db_queries", "SQL statements executed per HTTP request", ("method", "route"), buckets=QUERY_BUCKETS)
+http_db_seconds = REGISTRY.histogram(
+    "syncro_http_db_duration_seconds", "Time spent in the database per HTTP request", ("method", "route"))
+db_query_seconds = REGISTRY.histogram(
+    "syncro_db_query_duration_seconds", "Latency of individual SQL statements")
+slow_queries_total = REGISTRY.counter(
+    "syncro_db_slow_queries_total", "Statements slower than SLOW_QUERY_MS", ("route",))
+n_plus_one_total = REGISTRY.counter(
+    "syncro_db_n_plus_one_total", "Requests that repeated one statement N_PLUS_ONE_THRESHOLD+ times", ("method", "route"))
+
+
+class RequestProfile:
+    __slots__ = ("scope", "query_count", "replica_count", "db_time", "slowest_time", "slowest_statement", "statements")
+
+    def __init__(self, scope: dict):
+        self.scope = scope
+        self.query_count = 0
+        self.replica_count = 0
+        self.db_time = 0.0
+        self.slowest_time = 0.0
+        self.slowest_statement = None
+        self.statements = _Counter()
+
+    def record(self, statement: str, duration: float, replica: bool = False):
+        self.query_count += 1
+        self.replica_count += replica
+        self.db_time += duration
+        self.statements[normalize_statement(statement)] += 1
+        if duration > self.slowest_time:
+            self.slowest_time = duration
+            self.slowest_statement = statement
+
+    @property
+    def route(self) -> str:
+        # The router stores the matched route on the scope before calling the endpoint
+        route = self.scope.get("route")
+        return getattr(route, "path", None) or "unmatched"
+
+    def repeated_statements(self, threshold: int = N_PLUS_ONE_THRESHOLD) -> list:
+        return [(sql, n) for sql, n in self.statements.most_common() if n >= threshold]
+
+
+_replica_engines = set()
+_current_profile: ContextVar[Optional[RequestProfile]] = ContextVar("syncro_request_profile", default=None)
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+# Bind placeholders in the qmark (sqlite), format/pyformat (psycopg2) and named paramstyles
+_PLACEHOLDER = r"(?:\?|%s|%\(\w+\)s|:\w+)"
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*" + _PLACEHOLDER + r"\s*,?)+\)", re.IGNORECASE)
+
+
+def normalize_statement(statement: str) -> str:
+    """Collapse literals and IN-lists so statements that only differ in parameters compare equal."""
+    sql = _LITERALS.sub("?", statement)
+    sql = _IN_LIST.sub("IN (?)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+def current_profile() -> Optional[RequestProfile]:
+    return _current_profile.get()
+
+
+# ── SQLAlchemy hooks ──────────────────────────────────────────────────────────
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("syncro_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("syncro_query_start")
+    if not starts:
+        return
+    duration = time.perf_counter() - starts.pop()
+    db_query_seconds.observe(duration)
+
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.record(statement, duration, conn.engine in _replica_engines)
+
+    if duration * 1000 >= SLOW_QUERY_MS:
+        route = profile.route if profile is not None else "-"
+        slow_queries_total.inc(route=route)
+        logger.warning("slow query %.1fms route=%s sql=%s", duration * 1000, route, _WHITESPACE.sub(" ", statement)[:500])
+
+
+def install_sql_hooks(engine, replica: bool = False):
+    """Attach the profiling hooks to an Engine (idempotent)."""
+    if replica:
+        _replica_engines.add(engine)
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# ── ASGI middleware ───────────────────────────────────────────────────────────
+
+class ProfilingMiddleware:
+    """Pure ASGI middleware, so the Server-Timing header can be added without buffering the body."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        profile = RequestProfile(scope)
+        token = _current_profile.set(profile)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                total_ms = (time.perf_counter() - started) * 1000
+                timing = (
+                    f'db;dur={profile.db_time * 1000:.1f};desc="{profile.query_count} queries", '
+                    f"app;dur={total_ms:.1f}"
+                )
+                if profile.replica_count:
+                    timing += f', replica;desc="{profile.replica_count} queries"'
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", timing.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_profile.reset(token)
+            self._finish(profile, status_code, time.perf_counter() - started)
+
+    @staticmethod
+    def _finish(profile: RequestProfile, status_code: int, elapsed: float):
+        method = profile.scope["method"]
+        route = profile.route
+        http_request_seconds.observe(elapsed, method=method, route=route, status=str(status_code))
+        http_db_queries.observe(profile.query_count, method=method, route=route)
+        http_db_seconds.observe(profile.db_time, method=method, route=route)
+
+        repeated = profile.repeated_statements()
+        if repeated:
+            n_plus_one_total.inc(method=method, route=route)
+            sql, count = repeated[0]
+            logger.warning(
+                "possible N+1 on %s %s: %d queries, statement repeated %dx: %s",
+                method, route, profile.query_count, count, sql[:300],
+            )
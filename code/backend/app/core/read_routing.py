@@ -0,0 +1,119 @@
+# app/core/read_routing.py
+"""
+Read-your-writes guard for the optional read replica (DATABASE_READ_URL).
+
+Read-only routes take their session from `get_read_db` (app/database.py),
+which normally uses the replica. A replica lags the primary a little, so a
+user who just wrote something would not see it when the frontend
+immediately refetches. To avoid that:
+
+- ReadYourWritesMiddleware pins the caller (the subject of their bearer
+  token) to the primary for READ_YOUR_WRITES_S seconds after every
+  successful POST/PUT/PATCH/DELETE;
+- get_read_db serves pinned callers from the primary.
+
+Only requests that carry the token can be recognised, so the frontend sends
+it on public reads too (listings, profiles). An anonymous read right after a
+write may still hit the replica.
+
+Pins are kept per worker, and in Redis as well when REDIS_URL is set, so the
+next request still hits the primary when another worker handles it.
+"""
+import asyncio
+import os
+import threading
+import time
+from typing import Optional
+
+from .cache import REDIS_URL
+from .metrics import REGISTRY
+from .security import decode_access_token
+
+PIN_SECONDS = float(os.getenv("READ_YOUR_WRITES_S", "5"))
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+read_routing_total = REGISTRY.counter(
+    "syncro_read_routing_total", "Read-only requests by the database that served them", ("target",))
+
+
+def request_subject(headers) -> Optional[str]:
+    """The user behind an `Authorization: Bearer` header, if any (ASGI raw headers or a Headers mapping)."""
+    if isinstance(headers, list):
+        headers = {k.decode("latin-1").lower(): v.decode("latin-1") for k, v in headers}
+    scheme, _, token = (headers.get("authorization") or "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    return decode_access_token(token)
+
+
+class WritePins:
+    """subject -> time until which their reads go to the primary."""
+
+    PREFIX = "syncro:pin:"
+
+    def __init__(self, seconds: float = PIN_SECONDS, redis_url: Optional[str] = REDIS_URL):
+        self.seconds = seconds
+        self._until = {}
+        self._lock = threading.Lock()
+        self.shared = None
+        if redis_url:
+            try:
+                import redis  # optional dependency, only needed when REDIS_URL is set
+                self.shared = redis.Redis.from_url(redis_url, socket_timeout=0.25)
+            except ImportError:
+                pass  # cache.py already warned about it
+
+    async def pin(self, subject: str):
+        now = time.monotonic()
+        with self._lock:
+            self._until[subject] = now + self.seconds
+            # Forget expired pins now and then so the dict doesn't grow forever
+            if len(self._until) > 10000:
+                self._until = {s: t for s, t in self._until.items() if t > now}
+        if self.shared is not None:
+            # The redis client blocks; keep it off the event loop
+            await asyncio.to_thread(self._share, subject)
+
+    def _share(self, subject: str):
+        try:
+            self.shared.set(self.PREFIX + subject, 1, px=int(self.seconds * 1000))
+        except Exception as e:
+            print(f"Read routing: failed to share pin for {subject}: {e}")
+
+    def is_pinned(self, subject: Optional[str]) -> bool:
+        """Blocking with REDIS_URL set; called from get_read_sessionmaker, which FastAPI runs in its threadpool."""
+        if subject is None:
+            return False
+        if self._until.get(subject, 0) > time.monotonic():
+            return True
+        if self.shared is not None:
+            try:
+                return bool(self.shared.exists(self.PREFIX + subject))
+            except Exception:
+                return True  # can't tell: the primary is always correct
+        return False
+
+
+write_pins = WritePins()
+
+
+class ReadYourWritesMiddleware:
+    """Pins the caller of every successful write (pure ASGI, like ProfilingMiddleware)."""
+
+    def __init__(self, app, pins: WritePins = write_pins):
+        self.app = app
+        self.pins = pins
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            return await self.app(scope, receive, send)
+
+        async def send_wrapper(message):
+            # Pin before the response goes out, so an immediate refetch is covered
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                subject = request_subject(scope.get("headers", []))
+                if subject is not None:
+                    await self.pins.pin(subject)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,103 @@
+# app/core/socket_metrics.py
+"""
+Socket.IO runtime metrics.
+
+InstrumentedAsyncServer is a drop-in replacement for socketio.AsyncServer that
+times every emit and inbound event handler, and exposes scrape-time gauges for
+connected clients, identified users, rooms and the outgoing packet backlog of
+this worker. Everything lands in the same registry as the HTTP metrics, so it
+is served by GET /metrics.
+"""
+import time
+
+import socketio
+
+from .metrics import REGISTRY
+
+EMIT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+emits_total = REGISTRY.counter(
+    "syncro_sio_emits_total", "Socket.IO emits by event", ("event",))
+emit_recipients_total = REGISTRY.counter(
+    "syncro_sio_emit_recipients_total", "Sockets addressed by emits (fan-out size)", ("event",))
+emit_seconds = REGISTRY.histogram(
+    "syncro_sio_emit_duration_seconds", "Time spent in sio.emit (encode + enqueue to every recipient)",
+    ("event",), buckets=EMIT_BUCKETS)
+emit_errors_total = REGISTRY.counter(
+    "syncro_sio_emit_errors_total", "Emits that raised", ("event",))
+events_total = REGISTRY.counter(
+    "syncro_sio_events_total", "Inbound Socket.IO events (connect/disconnect/custom) handled", ("event",))
+event_seconds = REGISTRY.histogram(
+    "syncro_sio_event_handler_duration_seconds", "Latency of Socket.IO event handlers",
+    ("event",), buckets=EMIT_BUCKETS)
+
+
+class InstrumentedAsyncServer(socketio.AsyncServer):
+    USER_ROOM_PREFIX = "user_"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        REGISTRY.gauge("syncro_sio_connected_clients", "Engine.IO connections held by this worker",
+                       callback=lambda: [({}, len(self.eio.sockets))])
+        REGISTRY.gauge("syncro_sio_identified_users", "Distinct users with at least one socket in their user room",
+                       callback=lambda: [({}, self._count_rooms(user_rooms=True))])
+        REGISTRY.gauge("syncro_sio_rooms", "Named rooms (excluding per-sid rooms) on this worker",
+                       callback=lambda: [({}, self._count_rooms())])
+        REGISTRY.gauge("syncro_sio_outgoing_backlog", "Packets queued for delivery across all sockets",
+                       callback=lambda: [({}, self._backlog())])
+
+    # ── Scrape-time gauges ────────────────────────────────────────────────────
+
+    def _named_rooms(self, namespace: str = "/") -> dict:
+        rooms = self.manager.rooms.get(namespace, {})
+        # Every socket is also in a room named after its own sid, and all of them in room None
+        return {name: members for name, members in rooms.items()
+                if name is not None and name not in members}
+
+    def _count_rooms(self, user_rooms: bool = False) -> int:
+        rooms = self._named_rooms()
+        if user_rooms:
+            return sum(1 for name, members in rooms.items()
+                       if str(name).startswith(self.USER_ROOM_PREFIX) and members)
+        return len(rooms)
+
+    def _backlog(self) -> int:
+        total = 0
+        for eio_socket in list(self.eio.sockets.values()):
+            queue = getattr(eio_socket, "queue", None)
+            if queue is not None:
+                total += queue.qsize()
+        return total
+
+    def _recipients(self, to, namespace) -> int:
+        if to is None:
+            return len(self.eio.sockets)
+        rooms = self.manager.rooms.get(namespace or "/", {})
+        targets = to if isinstance(to, (list, tuple, set)) else [to]
+        return sum(len(rooms.get(room, ())) for room in targets)
+
+    # ── Instrumented entry points ─────────────────────────────────────────────
+
+    async def emit(self, event, data=None, to=None, room=None, skip_sid=None,
+                   namespace=None, callback=None, ignore_queue=False):
+        started = time.perf_counter()
+        try:
+            await super().emit(event, data=data, to=to, room=room, skip_sid=skip_sid,
+                               namespace=namespace, callback=callback, ignore_queue=ignore_queue)
+        except Exception:
+            emit_errors_total.inc(event=event)
+            raise
+        finally:
+            emit_seconds.observe(time.perf_counter() - started, event=event)
+            emits_total.inc(event=event)
+        emit_recipients_total.inc(self._recipients(to or room, namespace), event=event)
+
+    async def _trigger_event(self, event, namespace, *args):
+        # Clients choose event names, so don't let unknown ones become label values
+        label = event if event in self.handlers.get(namespace or "/", {}) else "unhandled"
+        started = time.perf_counter()
+        try:
+            return await super()._trigger_event(event, namespace, *args)
+        finally:
+            events_total.inc(event=label)
+            event_seconds.observe(time.perf_counter() - started, event=label)
@@ -0,0 +1,20 @@
+# app/core/workers.py
+"""
+Gunicorn worker class for the production profile (see gunicorn_conf.py).
+
+Same as uvicorn's UvicornWorker, but the event loop and HTTP parser come
+from the environment instead of being fixed in code:
+
+- UVICORN_LOOP: auto | uvloop | asyncio   (auto = uvloop when installed)
+- UVICORN_HTTP: auto | httptools | h11    (auto = httptools when installed)
+"""
+import os
+
+from uvicorn.workers import UvicornWorker
+
+LOOP = os.getenv("UVICORN_LOOP", "auto")
+HTTP = os.getenv("UVICORN_HTTP", "auto")
+
+
+class SyncroWorker(UvicornWorker):
+    CONFIG_KWARGS = {"loop": LOOP, "http": HTTP, "lifespan": "on"}
@@ -0,0 +1,260 @@
+# app/jobs/analytics.py
+"""
+Incremental rollups behind the /analytics API (api/analytics.py).
+
+daily_category_stats and daily_seller_stats hold per-day counters (requests,
+bids, orders, GMV, time to first bid). Each source table has a watermark in
+rollup_watermarks: a run only reads rows with a higher id, in
+ANALYTICS_BATCH_SIZE batches by primary key, and adds their counts to the
+rollups. Each batch commits together with its new watermark, so every row is
+counted exactly once.
+
+- Rows younger than ANALYTICS_LAG_S are left for the next run, so a
+  transaction that took its id earlier but committed later isn't skipped.
+- A batch starts by updating its watermark row, which locks it (a row lock
+  on PostgreSQL, the write lock on SQLite). Workers running the job at the
+  same time take turns instead of double counting.
+- Requests and bids archived before the first run (jobs/bid_requests.py) are
+  folded in once from the archive tables. Anything archived later was
+  already counted while it was live.
+- GMV is the order amount when the order is booked; later cancellations
+  don't change it.
+
+main.py runs this every ANALYTICS_ROLLUP_INTERVAL_S seconds (0 disables it,
+e.g. when running it from cron instead):
+
+    python -m app.jobs.analytics
+"""
+import asyncio
+import os
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..core.cache import response_cache
+from ..database import SessionLocal
+from ..models.models import (ArchivedBid, ArchivedBidRequest, Bid, BidRequest, DailyCategoryStats,
+                             DailySellerStats, Listing, Order, RollupWatermark)
+
+BATCH_SIZE = int(os.getenv("ANALYTICS_BATCH_SIZE", "5000"))
+LAG_SECONDS = float(os.getenv("ANALYTICS_LAG_S", "120"))
+JOB_INTERVAL = float(os.getenv("ANALYTICS_ROLLUP_INTERVAL_S", "300"))
+NAMESPACE = "analytics"  # response cache namespace, bumped after new data is rolled up
+
+CATEGORY_COUNTERS = ("requests", "bids", "orders", "gmv", "first_bids", "first_bid_seconds_sum")
+SELLER_COUNTERS = ("bids", "orders", "gmv")
+
+
+class Rollup:
+    """Counter increments collected from one batch."""
+
+    def __init__(self):
+        self.categories: Dict[Tuple, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        self.sellers: Dict[Tuple, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+
+    def category(self, day, category_id, **counts):
+        for name, value in counts.items():
+            self.categories[(day, category_id or 0)][name] += value
+
+    def seller(self, day, seller_id, **counts):
+        if seller_id is None:
+            return
+        for name, value in counts.items():
+            self.sellers[(day, seller_id)][name] += value
+
+
+# ── Sources ───────────────────────────────────────────────────────────────────
+# fetch(db, after_id, limit, archived_before) -> rows with .id and .created_at, by id
+# fold(db, rows, rollup)
+
+def _fetch_requests(model):
+    def fetch(db, after_id, limit, archived_before):
+        stmt = select(model.id, model.created_at, model.category_id).where(model.id > after_id)
+        if archived_before is not None:
+            stmt = stmt.where(model.archived_at < archived_before)
+        return db.execute(stmt.order_by(model.id).limit(limit)).all()
+    return fetch
+
+
+def _fold_requests(db, rows, rollup: Rollup):
+    for row in rows:
+        rollup.category(row.created_at.date(), row.category_id, requests=1)
+
+
+def _fetch_bids(bid_model, request_model):
+    def fetch(db, after_id, limit, archived_before):
+        stmt = select(bid_model.id, bid_model.seller_id, bid_model.created_at, bid_model.bid_request_id,
+                      request_model.created_at.label("requested_at"), request_model.category_id).join(
+            request_model, request_model.id == bid_model.bid_request_id).where(bid_model.id > after_id)
+        if archived_before is not None:
+            stmt = stmt.where(bid_model.archived_at < archived_before)
+        return db.execute(stmt.order_by(bid_model.id).limit(limit)).all()
+    return fetch
+
+
+def _fold_bids(bid_model):
+    def fold(db, rows, rollup: Rollup):
+        request_ids = {row.bid_request_id for row in rows}
+        first_bid = dict(db.execute(select(bid_model.bid_request_id, func.min(bid_model.id)).where(
+            bid_model.bid_request_id.in_(request_ids)).group_by(bid_model.bid_request_id)).all())
+        for row in rows:
+            day = row.created_at.date()
+            rollup.category(day, row.category_id, bids=1)
+            rollup.seller(day, row.seller_id, bids=1)
+            if first_bid.get(row.bid_request_id) == row.id and row.requested_at is not None:
+                # Time to first bid belongs to the day the request was posted
+                waited = max((row.created_at - row.requested_at).total_seconds(), 0.0)
+                rollup.category(row.requested_at.date(), row.category_id, first_bids=1,
+                                first_bid_seconds_sum=waited)
+    return fold
+
+
+def _fetch_orders(db, after_id, limit, archived_before):
+    category_id = func.coalesce(BidRequest.category_id, Listing.category_id, 0).label("category_id")
+    return db.execute(
+        select(Order.id, Order.created_at, Order.seller_id, Order.amount, category_id)
+        .outerjoin(Bid, Bid.id == Order.bid_id)
+        .outerjoin(BidRequest, BidRequest.id == Bid.bid_request_id)
+        .outerjoin(Listing, Listing.id == Order.listing_id)
+        .where(Order.id > after_id).order_by(Order.id).limit(limit)
+    ).all()
+
+
+def _fold_orders(db, rows, rollup: Rollup):
+    for row in rows:
+        day = row.created_at.date()
+        rollup.category(day, row.category_id, orders=1, gmv=row.amount or 0)
+        rollup.seller(day, row.seller_id, orders=1, gmv=row.amount or 0)
+
+
+class Source(NamedTuple):
+    name: str
+    fetch: Callable
+    fold: Callable
+    backfill_of: Optional[str] = None  # archive table: only rows archived before that source's first run
+
+
+SOURCES = [
+    Source("bid_requests", _fetch_requests(BidRequest), _fold_requests),
+    Source("bids", _fetch_bids(Bid, BidRequest), _fold_bids(Bid)),
+    Source("orders", _fetch_orders, _fold_orders),
+    Source("bid_requests_archive", _fetch_requests(ArchivedBidRequest), _fold_requests, backfill_of="bid_requests"),
+    Source("bids_archive", _fetch_bids(ArchivedBid, ArchivedBidRequest), _fold_bids(ArchivedBid),
+           backfill_of="bids"),
+]
+
+
+# ── Writing ───────────────────────────────────────────────────────────────────
+
+def _ensure_watermark(db: Session, source: str):
+    if db.get(RollupWatermark, source) is not None:
+        return
+    try:
+        with db.begin_nested():
+            db.add(RollupWatermark(source=source, last_id=0))
+    except IntegrityError:
+        pass  # another worker created it
+    db.commit()
+
+
+def _add_counts(db: Session, model, keys: Tuple[str, ...], counters: Tuple[str, ...], increments: Dict):
+    """counter += increment for each (key tuple -> counts) row, inserting missing rows."""
+    if not increments:
+        return
+    rows = [{**dict(zip(keys, key)), **{c: counts.get(c, 0) for c in counters}} for key, counts in increments.items()]
+    table = model.__table__
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        stmt = dialect_insert(table).values(rows)
+        db.execute(stmt.on_conflict_do_update(index_elements=list(keys),
+                                              set_={c: table.c[c] + stmt.excluded[c] for c in counters}))
+        return
+    for row in rows:
+        match = [table.c[k] == row[k] for k in keys]
+        updated = db.execute(update(table).where(*match).values({c: table.c[c] + row[c] for c in counters}))
+        if updated.rowcount == 0:
+            db.execute(insert(table).values(row))
+
+
+def process_batch(db: Session, source: Source, now: datetime) -> int:
+    """Fold the next batch of `source` into the rollups and move its watermark. Commits; returns rows folded."""
+    archived_before = None
+    if source.backfill_of is not None:
+        live = db.get(RollupWatermark, source.backfill_of)
+        if live is None:
+            return 0
+        archived_before = live.started_at
+
+    # Take the watermark row's lock before reading it
+    last_id = db.execute(update(RollupWatermark).where(RollupWatermark.source == source.name)
+                         .values(updated_at=now).returning(RollupWatermark.last_id)).scalar_one()
+    rows = source.fetch(db, last_id, BATCH_SIZE, archived_before)
+    cutoff = now - timedelta(seconds=LAG_SECONDS)
+    if source.backfill_of is None:
+        # Stop at the first row that is too new; its id and everything after it wait for the next run.
+        # Rows dated in the future (seed data, clock skew) can't be in flight and don't hold things up.
+        fresh = next((i for i, row in enumerate(rows)
+                      if row.created_at is None or cutoff <= row.created_at <= now), None)
+        rows = rows[:fresh] if fresh is not None else rows
+    if not rows:
+        db.commit()
+        return 0
+
+    rollup = Rollup()
+    source.fold(db, rows, rollup)
+    _add_counts(db, DailyCategoryStats, ("day", "category_id"), CATEGORY_COUNTERS, rollup.categories)
+    _add_counts(db, DailySellerStats, ("day", "seller_id"), SELLER_COUNTERS, rollup.sellers)
+    db.execute(update(RollupWatermark).where(RollupWatermark.source == source.name)
+               .values(last_id=rows[-1].id))
+    db.commit()
+    return len(rows)
+
+
+def run_once(db: Session = None) -> Dict[str, int]:
+    """Process every source until it is caught up."""
+    own_session = db is None
+    db = db or SessionLocal()
+    folded = {}
+    try:
+        for source in SOURCES:
+            _ensure_watermark(db, source.name)
+        for source in SOURCES:
+            total = 0
+            while True:
+                count = process_batch(db, source, datetime.utcnow())
+                total += count
+                if count < BATCH_SIZE:
+                    break
+            folded[source.name] = total
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        if own_session:
+            db.close()
+    if any(folded.values()):
+        response_cache.invalidate(NAMESPACE)
+    return folded
+
+
+async def run_periodically(interval: float = JOB_INTERVAL):
+    while True:
+        try:
+            folded = await asyncio.to_thread(run_once)
+            if any(folded.values()):
+                print(f"Analytics rollup: {folded}")
+        except Exception as e:
+            print(f"Analytics rollup failed: {e}")
+        await asyncio.sleep(interval)
+
+
+if __name__ == "__main__":
+    print(run_once())
@@ -0,0 +1,123 @@
+# app/jobs/bid_requests.py
+"""
+Housekeeping for bid requests.
+
+- expire_open_requests(): OPEN requests whose expires_at has passed become
+  CLOSED (expires_at defaults to created_at + BID_REQUEST_TTL_DAYS), and
+  leave the sellers' lead inboxes.
+- archive_old_requests(): CLOSED/ACCEPTED requests created more than
+  BID_REQUEST_ARCHIVE_AFTER_DAYS ago are moved, with their bids, into
+  bid_requests_archive / bids_archive, ARCHIVE_BATCH_SIZE requests per
+  transaction.
+
+main.py runs both every BID_REQUEST_JOB_INTERVAL_S seconds in each worker
+(0 disables it, e.g. when running this from cron instead):
+
+    python -m app.jobs.bid_requests
+
+Both steps are idempotent and batches are claimed with FOR UPDATE SKIP
+LOCKED, so several workers running the job at once don't step on each other.
+"""
+import asyncio
+import os
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, literal, select, update
+from sqlalchemy.orm import Session
+
+from ..database import SessionLocal
+from ..models.models import (ArchivedBid, ArchivedBidRequest, Bid, BidRequest, BidRequestStatus)
+from ..utils.matching import prune_leads
+
+ARCHIVE_AFTER_DAYS = int(os.getenv("BID_REQUEST_ARCHIVE_AFTER_DAYS", "90"))
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "500"))
+JOB_INTERVAL = float(os.getenv("BID_REQUEST_JOB_INTERVAL_S", "600"))
+
+
+def expire_open_requests(db: Session, now: datetime = None) -> int:
+    """Close every OPEN request past its expires_at (one UPDATE, uses ix_bid_requests_status_expires_at)."""
+    now = now or datetime.utcnow()
+    closed_ids = db.execute(
+        update(BidRequest)
+        .where(BidRequest.status == BidRequestStatus.OPEN, BidRequest.expires_at < now)
+        .values(status=BidRequestStatus.CLOSED)
+        .returning(BidRequest.id)
+    ).scalars().all()
+    prune_leads(db, closed_ids)
+    db.commit()
+    return len(closed_ids)
+
+
+def _copy_columns(archive_model, live_model) -> tuple:
+    """(archive columns, matching live columns) for INSERT INTO archive SELECT ... FROM live."""
+    live = live_model.__table__.c
+    names = [c.name for c in archive_model.__table__.c if c.name != "archived_at" and c.name in live]
+    return [archive_model.__table__.c[n] for n in names], [live[n] for n in names]
+
+
+def archive_batch(db: Session, cutoff: datetime, batch_size: int = ARCHIVE_BATCH_SIZE) -> int:
+    """Move one batch of old closed/accepted requests and their bids to the archive tables."""
+    request_ids = db.execute(
+        select(BidRequest.id)
+        .where(BidRequest.status.in_([BidRequestStatus.CLOSED, BidRequestStatus.ACCEPTED]),
+               BidRequest.created_at < cutoff)
+        .order_by(BidRequest.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ).scalars().all()
+    if not request_ids:
+        return 0
+
+    archived_at = literal(datetime.utcnow())
+    archive_cols, live_cols = _copy_columns(ArchivedBidRequest, BidRequest)
+    db.execute(ArchivedBidRequest.__table__.insert().from_select(
+        archive_cols + [ArchivedBidRequest.__table__.c.archived_at],
+        select(*live_cols, archived_at).where(BidRequest.id.in_(request_ids))))
+    archive_cols, live_cols = _copy_columns(ArchivedBid, Bid)
+    db.execute(ArchivedBid.__table__.insert().from_select(
+        archive_cols + [ArchivedBid.__table__.c.archived_at],
+        select(*live_cols, archived_at).where(Bid.bid_request_id.in_(request_ids))))
+
+    prune_leads(db, request_ids)
+    db.execute(delete(Bid).where(Bid.bid_request_id.in_(request_ids)))
+    db.execute(delete(BidRequest).where(BidRequest.id.in_(request_ids)))
+    db.commit()
+    return len(request_ids)
+
+
+def archive_old_requests(db: Session, days: int = ARCHIVE_AFTER_DAYS, batch_size: int = ARCHIVE_BATCH_SIZE) -> int:
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    total = 0
+    while True:
+        moved = archive_batch(db, cutoff, batch_size)
+        total += moved
+        if moved < batch_size:
+            return total
+
+
+def run_once() -> dict:
+    db = SessionLocal()
+    try:
+        expired = expire_open_requests(db)
+        archived = archive_old_requests(db)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    if expired or archived:
+        print(f"Bid request job: closed {expired} expired, archived {archived}")
+    return {"expired": expired, "archived": archived}
+
+
+async def run_periodically(interval: float = JOB_INTERVAL):
+    while True:
+        try:
+            await asyncio.to_thread(run_once)
+        except Exception as e:
+            print(f"Bid request job failed: {e}")
+        await asyncio.sleep(interval)
+
+
+if __name__ == "__main__":
+    print(run_once())
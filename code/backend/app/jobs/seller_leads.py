@@ -0,0 +1,59 @@
+# app/jobs/seller_leads.py
+"""
+Rebuilds of the seller_leads inbox (see app/utils/matching.py).
+
+profiles.py / listings.py queue rebuild_for_seller() as a background task
+after a seller changes what they match on, and auth.py does when a user
+switches role (a user who is not a seller has no leads). To (re)build every seller's inbox,
+e.g. right after introducing the table or bulk-loading data:
+
+    python -m app.jobs.seller_leads --all
+"""
+import argparse
+
+from sqlalchemy import delete, select
+
+from ..database import SessionLocal
+from ..models.models import SellerLead, User, UserRole
+from ..utils.matching import rebuild_seller_leads
+
+REBUILD_CHUNK = 500  # sellers per transaction for --all
+
+
+def rebuild_for_seller(seller_id: int):
+    db = SessionLocal()
+    try:
+        rebuild_seller_leads(db, [seller_id])
+    except Exception as e:
+        db.rollback()
+        print(f"Failed to rebuild leads for seller {seller_id}: {e}")
+    finally:
+        db.close()
+
+
+def rebuild_all() -> int:
+    db = SessionLocal()
+    try:
+        sellers = select(User.id).where(User.active_role == UserRole.SELLER)
+        # Leads left behind for users who are no longer sellers
+        db.execute(delete(SellerLead).where(SellerLead.seller_id.not_in(sellers)))
+        db.commit()
+        seller_ids = sorted(row[0] for row in db.execute(sellers))
+        total = 0
+        for i in range(0, len(seller_ids), REBUILD_CHUNK):
+            total += rebuild_seller_leads(db, seller_ids[i:i + REBUILD_CHUNK])
+        return total
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild seller lead inboxes")
+    parser.add_argument("--all", action="store_true", help="every seller")
+    parser.add_argument("--seller", type=int, action="append", default=[], help="seller user id (repeatable)")
+    args = parser.parse_args()
+    if args.all:
+        print(f"Wrote {rebuild_all()} leads")
+    for seller_id in args.seller:
+        rebuild_for_seller(seller_id)
+        print(f"Rebuilt leads for seller {seller_id}")
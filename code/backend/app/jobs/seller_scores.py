@@ -0,0 +1,115 @@
+# app/jobs/seller_scores.py
+"""
+Nightly full recompute of `seller_scores` (see app/utils/seller_scores.py).
+
+The write paths keep the counters up to date incrementally; this rebuilds
+every row from orders, reviews and bids (archived bids included), so
+anything those updates missed is corrected once a day. main.py runs it at
+SELLER_SCORE_RECOMPUTE_HOUR (UTC, -1 disables it, e.g. when running this
+from cron instead), and after the first deploy run it once by hand:
+
+    python -m app.jobs.seller_scores
+
+On PostgreSQL a transaction-level advisory lock makes sure only one worker
+recomputes at a time; the others skip that night's run.
+"""
+import asyncio
+import os
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from sqlalchemy import case, delete, func, insert, text
+from sqlalchemy.orm import Session
+
+from ..database import SessionLocal
+from ..models.models import (ArchivedBid, ArchivedBidRequest, Bid, BidRequest, BidStatus, Order, OrderStatus,
+                             Review, SellerScore)
+from ..utils.seller_scores import COUNTERS, compute_score
+
+RECOMPUTE_HOUR = int(os.getenv("SELLER_SCORE_RECOMPUTE_HOUR", "21"))  # 21:00 UTC = 02:30 in Sri Lanka
+ADVISORY_LOCK_KEY = 4302  # any constant shared by all workers
+
+
+def _seconds_between(db: Session, later, earlier):
+    if db.get_bind().dialect.name == "sqlite":
+        return (func.julianday(later) - func.julianday(earlier)) * 86400
+    return func.extract("epoch", later - earlier)
+
+
+def recompute_all(db: Session) -> int:
+    """Rebuild every seller's counters and score in one transaction. Returns the number of rows, -1 if skipped."""
+    if db.get_bind().dialect.name == "postgresql":
+        if not db.execute(text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": ADVISORY_LOCK_KEY}).scalar():
+            return -1
+
+    counters = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+
+    # Only reviews of the seller side of an order count
+    for seller_id, rating_sum, rating_count in db.query(
+            Review.reviewee_id, func.sum(Review.rating), func.count(Review.id)).join(
+            Order, Order.id == Review.order_id).filter(Review.reviewee_id == Order.seller_id).group_by(
+            Review.reviewee_id):
+        counters[seller_id].update(rating_sum=rating_sum or 0, rating_count=rating_count)
+
+    for seller_id, total, completed, cancelled in db.query(
+            Order.seller_id, func.count(Order.id),
+            func.sum(case((Order.status == OrderStatus.COMPLETED, 1), else_=0)),
+            func.sum(case((Order.status == OrderStatus.CANCELLED, 1), else_=0))).filter(
+            Order.seller_id.isnot(None)).group_by(Order.seller_id):
+        counters[seller_id].update(orders_total=total, orders_completed=completed or 0,
+                                   orders_cancelled=cancelled or 0)
+
+    for bid_model, request_model in ((Bid, BidRequest), (ArchivedBid, ArchivedBidRequest)):
+        latency = _seconds_between(db, bid_model.created_at, request_model.created_at)
+        for seller_id, total, accepted, seconds in db.query(
+                bid_model.seller_id, func.count(bid_model.id),
+                func.sum(case((bid_model.status == BidStatus.ACCEPTED, 1), else_=0)),
+                func.sum(case((latency > 0, latency), else_=0))).join(
+                request_model, request_model.id == bid_model.bid_request_id).group_by(bid_model.seller_id):
+            row = counters[seller_id]
+            row["bids_total"] += total
+            row["bids_accepted"] += accepted or 0
+            row["response_seconds_sum"] += float(seconds or 0)
+
+    now = datetime.utcnow()
+    rows = [{"seller_id": seller_id, **values, "score": compute_score(values), "updated_at": now}
+            for seller_id, values in counters.items() if seller_id is not None]
+    db.execute(delete(SellerScore))
+    if rows:
+        db.execute(insert(SellerScore), rows)
+    db.commit()
+    return len(rows)
+
+
+def run_once() -> int:
+    db = SessionLocal()
+    try:
+        return recompute_all(db)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def seconds_until(hour: int, now: datetime = None) -> float:
+    now = now or datetime.utcnow()
+    target = now.replace(hour=hour, minute=0, second=0, microsecond=0)
+    if target <= now:
+        target += timedelta(days=1)
+    return (target - now).total_seconds()
+
+
+async def run_nightly(hour: int = RECOMPUTE_HOUR):
+    while True:
+        await asyncio.sleep(seconds_until(hour))
+        try:
+            written = await asyncio.to_thread(run_once)
+            if written >= 0:
+                print(f"Seller score job: recomputed {written} sellers")
+        except Exception as e:
+            print(f"Seller score job failed: {e}")
+
+
+if __name__ == "__main__":
+    print(f"Recomputed {run_once()} seller scores")
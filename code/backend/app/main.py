@@ -1,12 +1,29 @@
+import asyncio
 import os
 import socketio
 import sys
 import traceback
+from urllib.parse import parse_qs
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.api import listings, auth, profiles, orders, reviews, bids, chat, notifications  # Import your API routers
-from app.database import engine # Import the database engine and Base for table creation
+from fastapi.responses import PlainTextResponse
+from app.api import listings, auth, profiles, orders, reviews, bids, chat, notifications, exports, analytics  # Import your API routers
+from app.database import engine, read_engine, has_read_replica, SessionLocal # Import the database engine and Base for table creation
 from app.models import models  # Import the models so SQLAlchemy knows which tables to create
+from app.core.cache import REDIS_URL
+from app.core.compression import CompressionMiddleware, socketio_serializer
+from app.core.idempotency import IdempotencyMiddleware
+from app.core.metrics import REGISTRY
+from app.core.profiling import ProfilingMiddleware, install_sql_hooks
+from app.core.read_routing import ReadYourWritesMiddleware
+from app.core.socket_metrics import InstrumentedAsyncServer
+from app.core.security import decode_access_token
+from app.utils import bid_feed
+from app.jobs import bid_requests as bid_request_jobs
+from app.jobs import seller_scores as seller_score_jobs
+from app.jobs import analytics as analytics_jobs
+from app.utils.notifications import (NotificationDispatcher, REPLAY_LIMIT, missed_notifications,
+                                     notification_payload, presence)
 
 #models.Base.metadata.create_all(bind=engine)
 import sys
@@ -38,14 +55,32 @@ app = FastAPI(title="Syncro Backend")
 # e.g. "https://your-frontend.azurestaticapps.net,https://yourdomain.com"
 ALLOWED_ORIGINS = os.getenv("ALLOWED_ORIGINS", "*").split(",")
 
+# Retried POSTs with an Idempotency-Key get the stored response (app/core/idempotency.py).
+# Added before CORS so it runs inside it and replays still carry the CORS headers.
+app.add_middleware(IdempotencyMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=ALLOWED_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "ETag", "Idempotent-Replayed"],
 )
 
+# Per-request SQL counts/timings -> Server-Timing header, slow query + N+1 logs, /metrics
+install_sql_hooks(engine)
+# gzip/brotli for responses over COMPRESS_MIN_BYTES (app/core/compression.py); inside profiling so
+# the compression time shows up in the request latency
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(ProfilingMiddleware)
+
+# Optional read replica (DATABASE_READ_URL): read-only GETs use it, except for
+# callers who wrote something in the last few seconds (app/core/read_routing.py)
+if has_read_replica:
+    install_sql_hooks(read_engine, replica=True)
+    app.add_middleware(ReadYourWritesMiddleware)
+
 app.include_router(listings.router)
 app.include_router(auth.router)
 app.include_router(profiles.router)
@@ -54,35 +89,163 @@ app.include_router(reviews.router)
 app.include_router(bids.router)
 app.include_router(chat.router)
 app.include_router(notifications.router)
+app.include_router(exports.router)
+app.include_router(analytics.router)
+
+
+def socketio_client_manager():
+    """With REDIS_URL set, emits go through Redis pub/sub so they reach sockets on every worker."""
+    if not REDIS_URL:
+        return None
+    try:
+        return socketio.AsyncRedisManager(REDIS_URL)
+    except RuntimeError as e:  # the optional `redis` package is missing
+        print(f"Socket.IO: not sharing emits between workers: {e}")
+        return None
 
 
-# 1. Create the Socket.IO server
-sio = socketio.AsyncServer(cors_allowed_origins='*', async_mode='asgi')
+# 1. Create the Socket.IO server (instrumented: clients, rooms, emit latency -> /metrics);
+# SOCKETIO_SERIALIZER=msgpack switches it to the binary msgpack parser
+sio = InstrumentedAsyncServer(cors_allowed_origins='*', async_mode='asgi', serializer=socketio_serializer(),
+                              client_manager=socketio_client_manager())
 
 # 2. Create the combined ASGI application
 # Note: We serve 'app' via uvicorn, so we mount the Socket.IO app into FastAPI
 socket_app = socketio.ASGIApp(sio)
 app.mount("/socket.io", socket_app)
 app.state.sio = sio
+app.state.notifier = NotificationDispatcher(sio)
+
+# Background housekeeping: close expired bid requests, archive old ones, recompute seller scores nightly,
+# roll new orders/bids/requests up into the analytics tables
+@app.on_event("startup")
+async def start_jobs():
+    if bid_request_jobs.JOB_INTERVAL > 0:
+        app.state.bid_request_job = asyncio.create_task(bid_request_jobs.run_periodically())
+    if 0 <= seller_score_jobs.RECOMPUTE_HOUR < 24:
+        app.state.seller_score_job = asyncio.create_task(seller_score_jobs.run_nightly())
+    if analytics_jobs.JOB_INTERVAL > 0:
+        app.state.analytics_job = asyncio.create_task(analytics_jobs.run_periodically())
 
 # Standard HTTP Route
 @app.get("/")
 async def root():
     return {"message": "Syncro Backend is running"}
 
+# Prometheus scrape endpoint (per worker, see app/core/metrics.py)
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
 # Real-time Event: Client Connects
+# The client sends its JWT in the handshake (`io(url, { auth: { token } })`,
+# or ?token= for clients that can't set auth). The user id is kept in the
+# socket session, so nothing later has to trust a client-supplied id.
 @sio.on("connect")
-async def connect(sid, environ):
-    print(f"✅ Client connected: {sid}")
+async def connect(sid, environ, auth=None):
+    token = (auth or {}).get("token") if isinstance(auth, dict) else None
+    if not token:
+        token = parse_qs(environ.get("QUERY_STRING", "")).get("token", [None])[0]
+    user_id = await asyncio.to_thread(socket_user_id, token) if token else None
+    if user_id is None:
+        raise ConnectionRefusedError("authentication failed")
+
+    await sio.save_session(sid, {"user_id": user_id})
+    presence.add(user_id, sid)
+    await sio.enter_room(sid, f"user_{user_id}")
+    print(f"✅ Client connected: {sid} (user {user_id})")
 
 # Real-time Event: Client Disconnects
 @sio.on("disconnect")
 async def disconnect(sid):
+    presence.remove(sid)
     print(f" Client disconnected: {sid}")
 
+# Kept for older clients: the room is already joined at connect, and the
+# userId they send is ignored in favour of the authenticated one.
 @sio.on("identify")
 async def on_identify(sid, data):
-    user_id = data.get("userId")
-    if user_id:
-        sio.enter_room(sid, f"user_{user_id}")
-        print(f"User {user_id} joined room user_{user_id}")
\ No newline at end of file
+    session = await sio.get_session(sid)
+    return {"userId": session.get("user_id")}
+
+# After a reconnect the client sends the last notification id it has seen and
+# gets only what it missed, instead of refetching GET /notifications/.
+@sio.on("resume")
+async def on_resume(sid, data):
+    session = await sio.get_session(sid)
+    user_id = session.get("user_id")
+    try:
+        last_id = int((data or {}).get("lastNotificationId") or 0)
+    except (TypeError, ValueError):
+        last_id = 0
+    if user_id is None or last_id <= 0:
+        return
+
+    def load():
+        db = SessionLocal()
+        try:
+            return [notification_payload(n) for n in missed_notifications(db, user_id, last_id, REPLAY_LIMIT + 1)]
+        finally:
+            db.close()
+
+    payloads = await asyncio.to_thread(load)
+    truncated = len(payloads) > REPLAY_LIMIT
+    # `truncated` tells the client it was away too long and should refetch the list
+    await sio.emit("notifications_replay",
+                   {"notifications": payloads[:REPLAY_LIMIT], "truncated": truncated}, to=sid)
+
+
+# Live bid feed: the buyer joins their request's room and gets a snapshot as the ack;
+# submit_bid / accept_bid then push seq-numbered `bid_delta` events (see app/utils/bid_feed.py)
+@sio.on("subscribe_bids")
+async def on_subscribe_bids(sid, data):
+    session = await sio.get_session(sid)
+    try:
+        request_id = int((data or {}).get("requestId"))
+    except (TypeError, ValueError):
+        return {"error": "requestId is required"}
+
+    def check():
+        db = SessionLocal()
+        try:
+            return bid_feed.owns_request(db, request_id, session.get("user_id"))
+        finally:
+            db.close()
+
+    def load():
+        db = SessionLocal()
+        try:
+            return bid_feed.snapshot(db, request_id, session.get("user_id"))
+        finally:
+            db.close()
+
+    # Only the owner gets into the room (deltas carry prices and messages)
+    if not await asyncio.to_thread(check):
+        return {"error": "Bid request not found"}
+    # Join before reading so nothing committed after the snapshot is missed
+    await sio.enter_room(sid, bid_feed.bid_room(request_id))
+    snap = await asyncio.to_thread(load)
+    if snap is None:
+        await sio.leave_room(sid, bid_feed.bid_room(request_id))
+        return {"error": "Bid request not found"}
+    return snap
+
+@sio.on("unsubscribe_bids")
+async def on_unsubscribe_bids(sid, data):
+    try:
+        await sio.leave_room(sid, bid_feed.bid_room(int((data or {}).get("requestId"))))
+    except (TypeError, ValueError):
+        pass
+
+
+def socket_user_id(token: str):
+    """User id for a handshake token, or None if the token is invalid/expired."""
+    email = decode_access_token(token)
+    if not email:
+        return None
+    db = SessionLocal()
+    try:
+        user = db.query(models.User.id).filter(models.User.email == email).first()
+        return user.id if user else None
+    finally:
+        db.close()
@@ -0,0 +1,134 @@
+# app/migrate.py
+# Schema changes that Base.metadata.create_all() can't apply to an existing
+# database (new columns / indexes on tables that already exist).
+# Every step is idempotent, so it's safe to run on every deploy:
+#     python -m app.migrate
+# A step is either a SQL string or a function taking the connection (backfills).
+from sqlalchemy import and_, bindparam, or_, select, text, update
+from .database import engine
+from .models.models import BidRequest, Category, Profile, default_request_expiry
+from .utils.categories import normalize_category_name
+from .utils.geo import locate
+from .utils.rfp_fields import parse_description
+
+
+def backfill_request_expiry(conn):
+    # Existing requests get one full TTL from now instead of expiring all at once
+    conn.execute(update(BidRequest).where(BidRequest.expires_at.is_(None))
+                 .values(expires_at=default_request_expiry()))
+
+
+def backfill_category_keys(conn):
+    # Case-insensitive duplicates that already exist keep a NULL key, only the oldest gets it
+    rows = conn.execute(select(Category.id, Category.name, Category.name_key).order_by(Category.id)).all()
+    taken = {key for _, _, key in rows if key}
+    for cid, name, key in rows:
+        new_key = normalize_category_name(name)
+        if key or not new_key or new_key in taken:
+            continue
+        taken.add(new_key)
+        conn.execute(update(Category).where(Category.id == cid).values(name_key=new_key))
+
+
+def backfill_rfp_fields(conn, batch_size: int = 1000):
+    # Parse "Quantity: / Budget: / Date needed: / Location:" out of old descriptions.
+    # Relative dates ("tomorrow") are read relative to when the request was made.
+    todo = and_(BidRequest.quantity.is_(None), BidRequest.budget.is_(None), BidRequest.event_date.is_(None),
+                BidRequest.location.is_(None),
+                or_(*(BidRequest.description.like(f"%{label}:%")
+                      for label in ("Quantity", "Budget", "Date needed", "Location"))))
+    stmt = update(BidRequest.__table__).where(BidRequest.__table__.c.id == bindparam("rid"))
+    last_id = 0
+    while True:
+        rows = conn.execute(select(BidRequest.id, BidRequest.description, BidRequest.created_at)
+                            .where(todo, BidRequest.id > last_id).order_by(BidRequest.id).limit(batch_size)).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        values = [{"rid": rid, **parse_description(description, created_at.date() if created_at else None)}
+                  for rid, description, created_at in rows]
+        conn.execute(stmt, values)
+
+
+def backfill_geo(conn):
+    # Geocode existing profile addresses / request locations against the bundled gazetteer
+    profiles = conn.execute(select(Profile.id, Profile.address).where(
+        Profile.lat.is_(None), Profile.address.isnot(None))).all()
+    values = [{"pid": pid, **located} for pid, address in profiles
+              if (located := locate(address))["lat"] is not None]
+    if values:
+        conn.execute(update(Profile.__table__).where(Profile.__table__.c.id == bindparam("pid")), values)
+
+    requests = conn.execute(select(BidRequest.id, BidRequest.location).where(
+        BidRequest.lat.is_(None), BidRequest.location.isnot(None))).all()
+    values = [{"rid": rid, "lat": located["lat"], "lon": located["lon"]} for rid, location in requests
+              if (located := locate(location))["lat"] is not None]
+    if values:
+        conn.execute(update(BidRequest.__table__).where(BidRequest.__table__.c.id == bindparam("rid")), values)
+
+
+STEPS = [
+    # Socket.IO reconnect replay + notification inbox / lead caps
+    "CREATE INDEX IF NOT EXISTS ix_notifications_user_id_id ON notifications (user_id, id)",
+    "CREATE INDEX IF NOT EXISTS ix_notifications_user_id_created_at ON notifications (user_id, created_at)",
+    # Live bid feed sequence
+    "ALTER TABLE bid_requests ADD COLUMN feed_seq INTEGER NOT NULL DEFAULT 0",
+    # One order per accepted bid (accept_bid idempotency)
+    "ALTER TABLE orders ADD COLUMN bid_id INTEGER",
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_orders_bid_id ON orders (bid_id)",
+    # Request expiry + archiving (app/jobs/bid_requests.py); archived bids keep their orders
+    "ALTER TABLE orders DROP CONSTRAINT IF EXISTS orders_bid_id_fkey",
+    "ALTER TABLE bid_requests ADD COLUMN expires_at TIMESTAMP",
+    backfill_request_expiry,
+    "CREATE INDEX IF NOT EXISTS ix_bid_requests_status_expires_at ON bid_requests (status, expires_at)",
+    "CREATE INDEX IF NOT EXISTS ix_bids_bid_request_id ON bids (bid_request_id)",
+    # Normalized category key for the cache / ON CONFLICT upsert
+    "ALTER TABLE categories ADD COLUMN name_key VARCHAR",
+    backfill_category_keys,
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_categories_name_key ON categories (name_key)",
+    # Typed RFP fields (app/utils/rfp_fields.py) for filtering leads in SQL
+    "ALTER TABLE bid_requests ADD COLUMN quantity INTEGER",
+    "ALTER TABLE bid_requests ADD COLUMN budget FLOAT",
+    "ALTER TABLE bid_requests ADD COLUMN event_date DATE",
+    "ALTER TABLE bid_requests ADD COLUMN location VARCHAR",
+    "ALTER TABLE bid_requests_archive ADD COLUMN quantity INTEGER",
+    "ALTER TABLE bid_requests_archive ADD COLUMN budget FLOAT",
+    "ALTER TABLE bid_requests_archive ADD COLUMN event_date DATE",
+    "ALTER TABLE bid_requests_archive ADD COLUMN location VARCHAR",
+    backfill_rfp_fields,
+    "CREATE INDEX IF NOT EXISTS ix_bid_requests_budget ON bid_requests (budget)",
+    "CREATE INDEX IF NOT EXISTS ix_bid_requests_event_date ON bid_requests (event_date)",
+    "CREATE INDEX IF NOT EXISTS ix_bid_requests_location ON bid_requests (location)",
+    # Location-aware matching (utils/geo.py); then rebuild inboxes: python -m app.jobs.seller_leads --all
+    "ALTER TABLE profiles ADD COLUMN lat FLOAT",
+    "ALTER TABLE profiles ADD COLUMN lon FLOAT",
+    "ALTER TABLE profiles ADD COLUMN geo_cell INTEGER",
+    "ALTER TABLE profiles ADD COLUMN service_radius_km INTEGER",
+    "ALTER TABLE bid_requests ADD COLUMN lat FLOAT",
+    "ALTER TABLE bid_requests ADD COLUMN lon FLOAT",
+    "ALTER TABLE bid_requests_archive ADD COLUMN lat FLOAT",
+    "ALTER TABLE bid_requests_archive ADD COLUMN lon FLOAT",
+    backfill_geo,
+    "CREATE INDEX IF NOT EXISTS ix_profiles_geo_cell ON profiles (geo_cell)",
+    # Profile page (GET /profiles/{id}/page)
+    "CREATE INDEX IF NOT EXISTS ix_listings_seller_id_id ON listings (seller_id, id)",
+    "CREATE INDEX IF NOT EXISTS ix_reviews_reviewee_id_id ON reviews (reviewee_id, id)",
+]
+
+
+def run_migrations():
+    for step in STEPS:
+        name = step if isinstance(step, str) else step.__name__
+        try:
+            with engine.begin() as conn:
+                if isinstance(step, str):
+                    conn.execute(text(step))
+                else:
+                    step(conn)
+            print(f"OK: {name}")
+        except Exception as e:
+            print(f"Skipped (already applied or error): {name}\n  {e}")
+
+
+if __name__ == "__main__":
+    run_migrations()
@@ -1,9 +1,17 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, Text, DateTime, Enum, Boolean
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Text, DateTime, Enum, Boolean, Date, Index, UniqueConstraint, LargeBinary
 import enum
-from datetime import datetime
+import os
+from datetime import datetime, timedelta
 from sqlalchemy.orm import relationship
 from ..database import Base
 
+# Open requests close automatically after this long (see app/jobs/bid_requests.py)
+BID_REQUEST_TTL_DAYS = int(os.getenv("BID_REQUEST_TTL_DAYS", "30"))
+
+
+def default_request_expiry():
+    return datetime.utcnow() + timedelta(days=BID_REQUEST_TTL_DAYS)
+
 class Notification(Base):
     __tablename__ = "notifications"
     id = Column(Integer, primary_key=True, index=True)
@@ -17,6 +25,11 @@ class Notification(Base):
     
     user = relationship("User", back_populates="notifications")
 
+    __table_args__ = (
+        Index("ix_notifications_user_id_id", "user_id", "id"),  # reconnect replay
+        Index("ix_notifications_user_id_created_at", "user_id", "created_at"),  # inbox + lead caps
+    )
+
 class UserRole(str, enum.Enum):
     CLIENT = "client"
     SELLER = "seller"
@@ -67,6 +80,11 @@ class Profile(Base):
     address = Column(String, nullable=True)
     phone = Column(String, nullable=True)
     website = Column(String, nullable=True)
+    # Geocoded from address (utils/geo.py); geo_cell is the grid-cell prefilter for matching
+    lat = Column(Float, nullable=True)
+    lon = Column(Float, nullable=True)
+    geo_cell = Column(Integer, nullable=True, index=True)
+    service_radius_km = Column(Integer, nullable=True)  # None: DEFAULT_SERVICE_RADIUS_KM
     
     user = relationship("User", back_populates="profile")
 
@@ -74,6 +92,7 @@ class Category(Base):
     __tablename__ = "categories"
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, unique=True, index=True) # e.g., "Catering", "Tutoring"
+    name_key = Column(String, unique=True, index=True)  # lower-case, single-spaced name (utils/categories.py)
 
 class Listing(Base):
     __tablename__ = "listings"
@@ -92,6 +111,11 @@ class Listing(Base):
     owner = relationship("User", back_populates="listings")
     orders = relationship("Order", back_populates="listing")
 
+    __table_args__ = (
+        # A seller's listings newest first (profile page)
+        Index("ix_listings_seller_id_id", "seller_id", "id"),
+    )
+
 class Order(Base):
     __tablename__ = "orders"
     id = Column(Integer, primary_key=True, index=True)
@@ -104,6 +128,8 @@ class Order(Base):
     buyer_id = Column(Integer, ForeignKey("users.id"))
     seller_id = Column(Integer, ForeignKey("users.id"))
     listing_id = Column(Integer, ForeignKey("listings.id"), nullable=True)
+    # One order per accepted bid. No FK: old bids move to bids_archive.
+    bid_id = Column(Integer, nullable=True, unique=True, index=True)
 
     buyer = relationship("User", back_populates="orders_as_buyer", foreign_keys=[buyer_id])
     seller = relationship("User", back_populates="orders_as_seller", foreign_keys=[seller_id])
@@ -125,6 +151,11 @@ class Review(Base):
     reviewer = relationship("User", back_populates="reviews_given", foreign_keys=[reviewer_id])
     reviewee = relationship("User", back_populates="reviews_received", foreign_keys=[reviewee_id])
 
+    __table_args__ = (
+        # A user's latest reviews and rating breakdown (profile page)
+        Index("ix_reviews_reviewee_id_id", "reviewee_id", "id"),
+    )
+
 class BidRequest(Base):
     __tablename__ = "bid_requests"
     id = Column(Integer, primary_key=True, index=True)
@@ -133,10 +164,23 @@ class BidRequest(Base):
     description = Column(Text, nullable=False)
     status = Column(Enum(BidRequestStatus), default=BidRequestStatus.OPEN)
     created_at = Column(DateTime, default=datetime.utcnow)
+    feed_seq = Column(Integer, nullable=False, default=0, server_default="0")  # live bid feed (utils/bid_feed.py)
+    expires_at = Column(DateTime, nullable=True, default=default_request_expiry)
+    # Typed RFP fields (utils/rfp_fields.py); the description keeps the text version
+    quantity = Column(Integer, nullable=True)
+    budget = Column(Float, nullable=True, index=True)  # LKR
+    event_date = Column(Date, nullable=True, index=True)
+    location = Column(String, nullable=True, index=True)  # normalize_location()
+    lat = Column(Float, nullable=True)  # geocoded from location (utils/geo.py)
+    lon = Column(Float, nullable=True)
 
     user = relationship("User", back_populates="bid_requests")
     bids = relationship("Bid", back_populates="bid_request", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        Index("ix_bid_requests_status_expires_at", "status", "expires_at"),
+    )
+
 class Bid(Base):
     __tablename__ = "bids"
     id = Column(Integer, primary_key=True, index=True)
@@ -150,4 +194,123 @@ class Bid(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 
     seller = relationship("User", back_populates="bids")
-    bid_request = relationship("BidRequest", back_populates="bids")
\ No newline at end of file
+    bid_request = relationship("BidRequest", back_populates="bids")
+
+    __table_args__ = (
+        Index("ix_bids_bid_request_id", "bid_request_id"),
+    )
+
+class SellerLead(Base):
+    """A request that matches a seller, written when the request is created (see utils/matching.py)."""
+    __tablename__ = "seller_leads"
+    id = Column(Integer, primary_key=True)
+    seller_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    bid_request_id = Column(Integer, ForeignKey("bid_requests.id"), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        # Also serves the feed query: WHERE seller_id = ? ORDER BY bid_request_id DESC
+        UniqueConstraint("seller_id", "bid_request_id", name="uq_seller_leads_seller_request"),
+        Index("ix_seller_leads_bid_request_id", "bid_request_id"),
+    )
+
+class SellerScore(Base):
+    """Running reputation counters of a seller and their blended score (see utils/seller_scores.py)."""
+    __tablename__ = "seller_scores"
+    seller_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    rating_sum = Column(Float, nullable=False, default=0, server_default="0")  # reviews of them as a seller
+    rating_count = Column(Integer, nullable=False, default=0, server_default="0")
+    orders_total = Column(Integer, nullable=False, default=0, server_default="0")
+    orders_completed = Column(Integer, nullable=False, default=0, server_default="0")
+    orders_cancelled = Column(Integer, nullable=False, default=0, server_default="0")
+    bids_total = Column(Integer, nullable=False, default=0, server_default="0")
+    bids_accepted = Column(Integer, nullable=False, default=0, server_default="0")
+    response_seconds_sum = Column(Float, nullable=False, default=0, server_default="0")  # request -> bid latency
+    score = Column(Float, nullable=False, default=0, server_default="0", index=True)  # 0..1
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+# ── Analytics rollups ─────────────────────────────────────────────────────────
+# Daily aggregates maintained by app/jobs/analytics.py, read by /analytics, so
+# dashboards never scan the live tables.
+
+class DailyCategoryStats(Base):
+    __tablename__ = "daily_category_stats"
+    day = Column(Date, primary_key=True)
+    category_id = Column(Integer, primary_key=True)  # 0: no category
+    requests = Column(Integer, nullable=False, default=0, server_default="0")
+    bids = Column(Integer, nullable=False, default=0, server_default="0")
+    orders = Column(Integer, nullable=False, default=0, server_default="0")
+    gmv = Column(Float, nullable=False, default=0, server_default="0")  # order amounts when booked, LKR
+    # Requests created that day that got their first bid, and how long it took
+    first_bids = Column(Integer, nullable=False, default=0, server_default="0")
+    first_bid_seconds_sum = Column(Float, nullable=False, default=0, server_default="0")
+
+class DailySellerStats(Base):
+    __tablename__ = "daily_seller_stats"
+    day = Column(Date, primary_key=True)
+    seller_id = Column(Integer, primary_key=True)
+    bids = Column(Integer, nullable=False, default=0, server_default="0")
+    orders = Column(Integer, nullable=False, default=0, server_default="0")
+    gmv = Column(Float, nullable=False, default=0, server_default="0")
+
+    __table_args__ = (
+        Index("ix_daily_seller_stats_seller_id_day", "seller_id", "day"),
+    )
+
+class RollupWatermark(Base):
+    """Highest source row id already folded into the rollups, per source table."""
+    __tablename__ = "rollup_watermarks"
+    source = Column(String, primary_key=True)
+    last_id = Column(Integer, nullable=False, default=0, server_default="0")
+    started_at = Column(DateTime, default=datetime.utcnow)  # first run; older archive rows are backfilled
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+# ── Idempotency keys ──────────────────────────────────────────────────────────
+
+class IdempotencyKey(Base):
+    """Stored response of a POST sent with an Idempotency-Key header (app/core/idempotency.py)."""
+    __tablename__ = "idempotency_keys"
+    subject = Column(String, primary_key=True)  # bearer token subject (email)
+    key = Column(String(255), primary_key=True)
+    fingerprint = Column(String(64), nullable=False)  # sha256 of method, path and body
+    status_code = Column(Integer, nullable=True)  # NULL while the first request is still running
+    content_type = Column(String, nullable=True)
+    body = Column(LargeBinary, nullable=True)
+    locked_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+# ── Cold storage ──────────────────────────────────────────────────────────────
+# Closed/accepted requests and their bids are moved here once they are older
+# than BID_REQUEST_ARCHIVE_AFTER_DAYS, keeping the hot tables and indexes small.
+# Same columns as the live tables (ids are kept), no foreign keys.
+
+class ArchivedBidRequest(Base):
+    __tablename__ = "bid_requests_archive"
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    user_id = Column(Integer, index=True)
+    category_id = Column(Integer, nullable=True)
+    description = Column(Text, nullable=False)
+    status = Column(Enum(BidRequestStatus))
+    created_at = Column(DateTime)
+    feed_seq = Column(Integer, nullable=False, default=0)
+    expires_at = Column(DateTime, nullable=True)
+    quantity = Column(Integer, nullable=True)
+    budget = Column(Float, nullable=True)
+    event_date = Column(Date, nullable=True)
+    location = Column(String, nullable=True)
+    lat = Column(Float, nullable=True)
+    lon = Column(Float, nullable=True)
+    archived_at = Column(DateTime, default=datetime.utcnow)
+
+class ArchivedBid(Base):
+    __tablename__ = "bids_archive"
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    bid_request_id = Column(Integer, index=True)
+    seller_id = Column(Integer, index=True)
+    price = Column(Float, nullable=False)
+    quantity = Column(Integer, default=1)
+    delivery_time = Column(String, nullable=True)
+    message = Column(Text, nullable=True)
+    status = Column(Enum(BidStatus))
+    created_at = Column(DateTime)
+    archived_at = Column(DateTime, default=datetime.utcnow)
\ No newline at end of file
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field, EmailStr
-from datetime import datetime
-from typing import Optional, List
+from datetime import date, datetime
+from typing import Dict, Optional, List
 
 # --- Auth & Users ---
 class UserCreate(BaseModel):
@@ -23,10 +23,22 @@ class Token(BaseModel):
 class TokenData(BaseModel):
     email: Optional[str] = None
 
+class UserSummary(BaseModel):
+    # Embedded by ?expand=seller|buyer|reviewer (utils/expand.py)
+    user_id: int
+    name: Optional[str] = None
+    logo: Optional[str] = None
+    rating: Optional[float] = None  # mean rating as a seller
+    review_count: int = 0
+
 # --- Bids & Bid Requests ---
 class BidRequestBase(BaseModel):
     description: str
     category_id: Optional[int] = None
+    quantity: Optional[int] = Field(None, ge=1)
+    budget: Optional[float] = Field(None, gt=0)  # LKR
+    event_date: Optional[date] = None
+    location: Optional[str] = None
 
 class BidRequestCreate(BidRequestBase):
     pass
@@ -36,6 +48,7 @@ class BidRequestResponse(BidRequestBase):
     user_id: int
     status: str
     created_at: datetime
+    expires_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
@@ -55,10 +68,44 @@ class BidResponse(BidBase):
     seller_id: int
     status: str
     created_at: datetime
+    # Filled in by GET /bids/request/{id} (utils/seller_scores.py)
+    seller_score: Optional[float] = None
+    seller_rating: Optional[float] = None
+    seller_review_count: Optional[int] = None
+    seller_summary: Optional[UserSummary] = None  # ?expand=seller
 
     class Config:
         from_attributes = True
 
+class BidBatchCreate(BaseModel):
+    bids: List[BidCreate] = Field(..., min_length=1, max_length=100)
+
+class BidBatchItemResult(BaseModel):
+    index: int
+    bid_request_id: int
+    ok: bool
+    bid: Optional[BidResponse] = None
+    error: Optional[str] = None
+
+class BidBatchResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[BidBatchItemResult]
+
+class BidAcceptBatch(BaseModel):
+    bid_ids: List[int] = Field(..., min_length=1, max_length=100)
+
+class BidAcceptResult(BaseModel):
+    bid_id: int
+    ok: bool
+    order_id: Optional[int] = None
+    created: bool = False  # False when the bid had already been accepted
+    error: Optional[str] = None
+
+class BidAcceptBatchResponse(BaseModel):
+    accepted: int
+    results: List[BidAcceptResult]
+
 # --- Profiles ---
 class ProfileBase(BaseModel):
     name: str
@@ -66,6 +113,7 @@ class ProfileBase(BaseModel):
     address: Optional[str] = None
     phone: Optional[str] = None
     website: Optional[str] = None
+    service_radius_km: Optional[int] = Field(None, ge=1, le=500)  # km around `address`; 500 = island-wide
 
 class ProfileCreate(ProfileBase):
     pass
@@ -97,6 +145,7 @@ class ListingResponse(ListingBase):
     seller_id: int
     category_id: int
     image_url: Optional[str] = None
+    seller_summary: Optional[UserSummary] = None  # ?expand=seller
 
     class Config:
         from_attributes = True
@@ -118,6 +167,8 @@ class OrderResponse(OrderBase):
     status: str
     has_review: bool
     created_at: datetime
+    seller_summary: Optional[UserSummary] = None  # ?expand=seller
+    buyer_summary: Optional[UserSummary] = None  # ?expand=buyer
 
     class Config:
         from_attributes = True
@@ -136,10 +187,27 @@ class ReviewResponse(ReviewBase):
     reviewer_id: int
     reviewee_id: int
     timestamp: datetime
+    reviewer_summary: Optional[UserSummary] = None  # ?expand=reviewer
 
     class Config:
         from_attributes = True
 
+# --- Profile page (GET /profiles/{id}/page) ---
+class RatingSummary(BaseModel):
+    mean: Optional[float] = None
+    count: int = 0
+    distribution: Dict[int, int] = {}  # stars (rounded) -> number of reviews
+    score: Optional[float] = None  # seller score (utils/seller_scores.py)
+    completion_rate: Optional[float] = None  # completed / (completed + cancelled) orders; None before any finish
+    avg_response_hours: Optional[float] = None
+
+class ProfilePageResponse(BaseModel):
+    profile: ProfileResponse
+    listings: List[ListingResponse]
+    next_before_id: Optional[int] = None  # pass as before_id for the next page of listings
+    rating: RatingSummary
+    reviews: List[ReviewResponse]  # latest first, with reviewer_summary
+
 # --- Messages ---
 class MessageResponse(BaseModel):
     id: int
@@ -0,0 +1,90 @@
+# app/utils/bid_feed.py
+"""
+Live bid feed for a buyer's request (replaces polling GET /bids/request/{id}).
+
+Protocol:
+- The buyer emits `subscribe_bids` {"requestId"} and gets, as the ack, a
+  snapshot {"request_id", "seq", "bids"} (or {"error"}). Only the owner of
+  the BidRequest may subscribe.
+- Every change to the request's bids (submit_bid, accept_bid) bumps
+  BidRequest.feed_seq in the same transaction as the change, and is then
+  pushed to the room as `bid_delta` {"request_id", "seq", "type", "bid"}.
+- Clients ignore deltas with seq <= the one they have, and re-subscribe
+  (fresh snapshot) when they see a gap.
+
+The sequence lives in the database, so it stays consistent across workers.
+With REDIS_URL set, deltas are fanned out to every worker through the
+Socket.IO Redis manager (main.py). Without it, a delta emitted by another
+worker never reaches this socket; it shows up as a gap on the next one, and
+the client also re-subscribes every RESYNC_MS as a safety net.
+"""
+from typing import Dict, Iterable, Optional
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from ..models.models import Bid, BidRequest
+from ..schemas.schemas import BidResponse
+from .serialization import select_rows
+
+BID_CREATED = "bid_created"
+BID_UPDATED = "bid_updated"
+
+
+def bid_room(request_id: int) -> str:
+    return f"bid_request_{request_id}"
+
+
+def next_seq(db: Session, request_id: int) -> int:
+    """Bump and return the request's feed sequence (uncommitted, part of the caller's transaction)."""
+    return db.execute(
+        update(BidRequest)
+        .where(BidRequest.id == request_id)
+        .values(feed_seq=BidRequest.feed_seq + 1)
+        .returning(BidRequest.feed_seq)
+    ).scalar_one()
+
+
+def next_seqs(db: Session, request_ids: Iterable[int]) -> Dict[int, int]:
+    """next_seq() for several requests in one UPDATE ... RETURNING."""
+    request_ids = list(set(request_ids))
+    if not request_ids:
+        return {}
+    rows = db.execute(
+        update(BidRequest)
+        .where(BidRequest.id.in_(request_ids))
+        .values(feed_seq=BidRequest.feed_seq + 1)
+        .returning(BidRequest.id, BidRequest.feed_seq)
+    ).all()
+    return dict(rows)
+
+
+def bid_payload(bid: Bid) -> dict:
+    return jsonable_encoder(BidResponse.model_validate(bid))
+
+
+def owns_request(db: Session, request_id: int, user_id: int) -> bool:
+    owner = db.execute(select(BidRequest.user_id).where(BidRequest.id == request_id)).scalar()
+    return owner is not None and owner == user_id
+
+
+def snapshot(db: Session, request_id: int, user_id: int) -> Optional[dict]:
+    """All bids for the request plus the seq they correspond to, or None if `user_id` doesn't own it."""
+    row = db.execute(
+        select(BidRequest.user_id, BidRequest.feed_seq).where(BidRequest.id == request_id)
+    ).first()
+    if row is None or row.user_id != user_id:
+        return None
+    # Read the bids after the seq: a change landing in between is both in the
+    # snapshot and delivered as a delta, which the client applies idempotently.
+    bids = select_rows(db, Bid, BidResponse, Bid.bid_request_id == request_id, order_by=Bid.id)
+    return {"request_id": request_id, "seq": row.feed_seq, "bids": jsonable_encoder(bids)}
+
+
+async def publish(sio, request_id: int, seq: int, type: str, bid: Bid):
+    try:
+        await sio.emit("bid_delta", {"request_id": request_id, "seq": seq, "type": type, "bid": bid_payload(bid)},
+                       room=bid_room(request_id))
+    except Exception as e:
+        print(f"Failed to publish bid delta for request {request_id}: {e}")
@@ -0,0 +1,167 @@
+# app/utils/categories.py
+"""
+Worker-local category cache and race-free get-or-create.
+
+Categories are few and almost never change, yet every RFP, request and
+accept used to look them up. The whole table is kept in memory per worker:
+
+- names()/name() answer id -> name without touching the database.
+- get_or_create() resolves a free-text name through its normalized key
+  (lower-case, single spaces) and only on a miss runs one
+  INSERT ... ON CONFLICT (name_key) DO UPDATE ... RETURNING, inside the
+  caller's transaction, so concurrent chats can't race on the unique key.
+- A created category enters the cache when that transaction commits (and
+  is forgotten if it rolls back). Commits bump the "categories" version in
+  the response cache (shared via Redis when REDIS_URL is set); other workers
+  notice within CATEGORY_CACHE_CHECK_S and reload. Lookups of unknown ids
+  reload too.
+"""
+import os
+import threading
+import time
+from typing import Dict, NamedTuple, Optional
+
+from sqlalchemy import event, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..core.cache import response_cache
+from ..core.metrics import REGISTRY
+from ..models.models import Category
+
+CHECK_INTERVAL = float(os.getenv("CATEGORY_CACHE_CHECK_S", "5"))
+MAX_AGE = float(os.getenv("CATEGORY_CACHE_TTL", "300"))
+NAMESPACE = "categories"
+PENDING_KEY = "new_categories"  # Session.info slot for categories created in the open transaction
+
+category_lookups_total = REGISTRY.counter(
+    "syncro_category_cache_lookups_total", "Category cache lookups", ("result",))
+
+
+class CachedCategory(NamedTuple):
+    id: int
+    name: str
+
+
+def normalize_category_name(name: str) -> str:
+    return " ".join((name or "").split()).lower()
+
+
+class CategoryCache:
+    def __init__(self):
+        self._by_id: Dict[int, str] = {}
+        self._by_key: Dict[str, int] = {}
+        self._version: Optional[str] = None
+        self._loaded_at = 0.0
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    # ── Loading ───────────────────────────────────────────────────────────────
+
+    def _load(self, db: Session):
+        version = response_cache.current_version(NAMESPACE)
+        rows = db.execute(select(Category.id, Category.name)).all()
+        with self._lock:
+            self._by_id = {cid: name for cid, name in rows}
+            self._by_key = {normalize_category_name(name): cid for cid, name in reversed(rows)}
+            self._version = version
+            self._loaded_at = self._checked_at = time.monotonic()
+        category_lookups_total.inc(result="reload")
+
+    def _ensure_fresh(self, db: Session):
+        now = time.monotonic()
+        if self._loaded_at and now - self._checked_at < CHECK_INTERVAL:
+            return
+        if not self._loaded_at or now - self._loaded_at > MAX_AGE:
+            self._load(db)
+            return
+        self._checked_at = now
+        if response_cache.current_version(NAMESPACE) != self._version:
+            self._load(db)
+
+    # ── Lookups ───────────────────────────────────────────────────────────────
+
+    def names(self, db: Session) -> Dict[int, str]:
+        self._ensure_fresh(db)
+        return self._by_id
+
+    def name(self, db: Session, category_id: Optional[int]) -> Optional[str]:
+        if not category_id:
+            return None
+        self._ensure_fresh(db)
+        name = self._by_id.get(category_id)
+        if name is None:
+            # Possibly created by another worker since we last loaded
+            self._load(db)
+            name = self._by_id.get(category_id)
+        category_lookups_total.inc(result="hit" if name is not None else "unknown")
+        return name
+
+    def get_or_create(self, db: Session, name: str) -> CachedCategory:
+        """Find a category by name (case/space-insensitive), creating it if needed. Doesn't commit."""
+        key = normalize_category_name(name) or "general"
+        self._ensure_fresh(db)
+        cid = self._by_key.get(key)
+        if cid is not None:
+            category_lookups_total.inc(result="hit")
+            return CachedCategory(cid, self._by_id[cid])
+
+        pending = db.info.setdefault(PENDING_KEY, {})
+        if key in pending:
+            return pending[key]
+
+        category_lookups_total.inc(result="miss")
+        category = CachedCategory(*_upsert(db, " ".join(name.split()).title() or "General", key))
+        pending[key] = category  # published by _publish_pending once committed
+        return category
+
+    def _add(self, categories):
+        with self._lock:
+            for key, category in categories.items():
+                self._by_id[category.id] = category.name
+                self._by_key[key] = category.id
+        response_cache.invalidate(NAMESPACE)
+        self._version = response_cache.current_version(NAMESPACE)
+
+    def clear(self):
+        with self._lock:
+            self._loaded_at = 0.0
+
+
+def _upsert(db: Session, name: str, key: str):
+    """INSERT ... ON CONFLICT (name_key) returning the row either way."""
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        stmt = insert(Category).values(name=name, name_key=key)
+        # The no-op update makes RETURNING yield the existing row on conflict
+        stmt = stmt.on_conflict_do_update(index_elements=[Category.name_key],
+                                          set_={"name_key": stmt.excluded.name_key})
+        return tuple(db.execute(stmt.returning(Category.id, Category.name)).one())
+
+    # Other databases: plain insert in a savepoint, fall back to reading the winner
+    try:
+        with db.begin_nested():
+            category = Category(name=name, name_key=key)
+            db.add(category)
+        return category.id, category.name
+    except IntegrityError:
+        return tuple(db.execute(select(Category.id, Category.name).where(Category.name_key == key)).one())
+
+
+category_cache = CategoryCache()
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending(session):
+    pending = session.info.pop(PENDING_KEY, None)
+    if pending:
+        category_cache._add(pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_pending(session):
+    session.info.pop(PENDING_KEY, None)
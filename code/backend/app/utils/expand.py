@@ -0,0 +1,67 @@
+# app/utils/expand.py
+"""
+Opt-in user summaries in list responses (`?expand=seller`).
+
+Bids, listings, orders and reviews only carry user ids, so rendering a page
+of them used to cost one GET /profiles/{id} per row. With ?expand=<role>
+the summaries (name, logo, seller rating) of every distinct user on the page
+are loaded in ONE query:
+
+    users LEFT JOIN profiles LEFT JOIN seller_scores WHERE users.id IN (...)
+
+and attached to each row as `<role>_summary` (schemas.UserSummary).
+"""
+from typing import Dict, Iterable, List, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..models.models import Profile, SellerScore, User
+
+# role -> the id column of the row it refers to
+ROLES = {"seller": "seller_id", "buyer": "buyer_id", "reviewer": "reviewer_id"}
+
+
+def parse_expand(expand: Optional[str], allowed: Iterable[str]) -> List[str]:
+    """"seller,buyer" -> ["seller", "buyer"]; 400 on anything the endpoint can't expand."""
+    roles = list(dict.fromkeys(r.strip().lower() for r in (expand or "").split(",") if r.strip()))
+    unknown = set(roles) - set(allowed)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Cannot expand {', '.join(sorted(unknown))} "
+                                                    f"(allowed: {', '.join(allowed)})")
+    return roles
+
+
+def user_summaries(db: Session, user_ids: Iterable[int]) -> Dict[int, dict]:
+    user_ids = {uid for uid in user_ids if uid is not None}
+    if not user_ids:
+        return {}
+    rows = db.execute(
+        select(User.id, User.first_name, User.last_name, Profile.name, Profile.logo,
+               SellerScore.rating_sum, SellerScore.rating_count)
+        .outerjoin(Profile, Profile.user_id == User.id)
+        .outerjoin(SellerScore, SellerScore.seller_id == User.id)
+        .where(User.id.in_(user_ids))
+    )
+    summaries = {}
+    for uid, first_name, last_name, name, logo, rating_sum, rating_count in rows:
+        summaries[uid] = {
+            "user_id": uid,
+            "name": name or f"{first_name or ''} {last_name or ''}".strip() or None,
+            "logo": logo,
+            "rating": round(rating_sum / rating_count, 2) if rating_count else None,
+            "review_count": rating_count or 0,
+        }
+    return summaries
+
+
+def expand_rows(db: Session, rows: List[dict], roles: List[str]) -> List[dict]:
+    """Add `<role>_summary` to every row dict (in place) for each role in `roles`."""
+    if not roles or not rows:
+        return rows
+    summaries = user_summaries(db, {row[ROLES[role]] for row in rows for role in roles})
+    for row in rows:
+        for role in roles:
+            row[f"{role}_summary"] = summaries.get(row[ROLES[role]])
+    return rows
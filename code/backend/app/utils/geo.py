@@ -0,0 +1,158 @@
+# app/utils/geo.py
+"""
+Offline geocoding and a grid-cell index for location-aware matching.
+
+- geocode() maps a free-text address or request location to a town in the
+  bundled gazetteer (app/data/sri_lanka_towns.csv). No network calls, no
+  PostGIS: town-level precision is enough for a service radius.
+- Profiles store lat/lon plus `geo_cell`, the id of the GEO_CELL_DEG x
+  GEO_CELL_DEG grid cell they fall in (indexed). cells_within() lists the
+  cells a circle overlaps, so "sellers near this point" is a plain
+  `geo_cell IN (...)` prefilter followed by an exact distance check.
+- A seller reaches service_radius_km around their location
+  (DEFAULT_SERVICE_RADIUS_KM when unset, the whole island at
+  MAX_SERVICE_RADIUS_KM). Sellers or requests without a known location are
+  never filtered out.
+"""
+import csv
+import math
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ..models.models import Profile
+
+GAZETTEER_PATH = Path(__file__).resolve().parent.parent / "data" / "sri_lanka_towns.csv"
+CELL_DEG = float(os.getenv("GEO_CELL_DEG", "0.2"))  # ~22 km
+DEFAULT_SERVICE_RADIUS_KM = int(os.getenv("DEFAULT_SERVICE_RADIUS_KM", "50"))
+MAX_SERVICE_RADIUS_KM = 500  # covers the whole island
+BOUNDS = (5.8, 9.9, 79.5, 82.0)  # Sri Lanka: min lat, max lat, min lon, max lon
+EARTH_RADIUS_KM = 6371.0
+
+
+class Town(NamedTuple):
+    name: str
+    lat: float
+    lon: float
+    district: str
+
+
+_towns: Optional[Dict[str, Town]] = None
+_max_words = 1
+_lock = threading.Lock()
+
+
+def _key(text: str) -> str:
+    text = re.sub(r"[^a-z0-9 ]", " ", text.lower().replace("-", " "))
+    text = re.sub(r"\b0+(\d)", r"\1", text)  # "colombo 07" -> "colombo 7"
+    return " ".join(text.split())
+
+
+def gazetteer() -> Dict[str, Town]:
+    """Normalized name/alias -> Town, loaded once per process."""
+    global _towns, _max_words
+    if _towns is None:
+        with _lock:
+            if _towns is None:
+                towns = {}
+                with open(GAZETTEER_PATH, newline="", encoding="utf-8") as f:
+                    rows = csv.DictReader(line for line in f if not line.startswith("#"))
+                    for row in rows:
+                        town = Town(row["name"], float(row["lat"]), float(row["lon"]), row["district"])
+                        for name in [row["name"], *(row["aliases"] or "").split(";")]:
+                            if name.strip():
+                                towns.setdefault(_key(name), town)
+                _max_words = max(len(k.split()) for k in towns)
+                _towns = towns
+    return _towns
+
+
+def geocode(text: Optional[str]) -> Optional[Town]:
+    """The town a free-text location/address refers to, or None."""
+    if not text or not text.strip():
+        return None
+    towns = gazetteer()
+    # Addresses end with the town ("12 Temple Rd, Kandy"): try comma parts from the right
+    for part in reversed(re.split(r"[,\n/]", text)):
+        town = towns.get(_key(part))
+        if town is not None:
+            return town
+    # Otherwise the longest known name anywhere, rightmost first
+    words = _key(text).split()
+    for n in range(min(_max_words, len(words)), 0, -1):
+        for i in range(len(words) - n, -1, -1):
+            town = towns.get(" ".join(words[i:i + n]))
+            if town is not None:
+                return town
+    return None
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+# ── Grid index ────────────────────────────────────────────────────────────────
+
+def grid_cell(lat: float, lon: float) -> int:
+    return math.floor(lat / CELL_DEG) * 10000 + math.floor(lon / CELL_DEG)
+
+
+def cells_within(lat: float, lon: float, radius_km: float) -> List[int]:
+    """Ids of every grid cell (inside BOUNDS) that a circle of radius_km around the point touches."""
+    dlat = radius_km / 111.0
+    dlon = radius_km / (111.32 * max(math.cos(math.radians(lat)), 0.01))
+    rows = range(math.floor(max(lat - dlat, BOUNDS[0]) / CELL_DEG), math.floor(min(lat + dlat, BOUNDS[1]) / CELL_DEG) + 1)
+    cols = range(math.floor(max(lon - dlon, BOUNDS[2]) / CELL_DEG), math.floor(min(lon + dlon, BOUNDS[3]) / CELL_DEG) + 1)
+    return [row * 10000 + col for row in rows for col in cols]
+
+
+def reach_km(service_radius_km: Optional[int]) -> Optional[float]:
+    """How far a seller travels; None means anywhere."""
+    radius = service_radius_km or DEFAULT_SERVICE_RADIUS_KM
+    return None if radius <= 0 or radius >= MAX_SERVICE_RADIUS_KM else float(radius)
+
+
+def covers(seller_lat: Optional[float], seller_lon: Optional[float], service_radius_km: Optional[int],
+           lat: Optional[float], lon: Optional[float]) -> bool:
+    """Whether a seller's service area includes the point (unknown locations always do)."""
+    if seller_lat is None or lat is None:
+        return True
+    reach = reach_km(service_radius_km)
+    return reach is None or haversine_km(seller_lat, seller_lon, lat, lon) <= reach
+
+
+def locate(text: Optional[str]) -> dict:
+    """Column values {lat, lon, geo_cell} for a location/address (all None if it isn't recognised)."""
+    town = geocode(text)
+    if town is None:
+        return {"lat": None, "lon": None, "geo_cell": None}
+    return {"lat": town.lat, "lon": town.lon, "geo_cell": grid_cell(town.lat, town.lon)}
+
+
+# ── Widest reach ──────────────────────────────────────────────────────────────
+
+_widest = {"km": None, "at": 0.0}
+WIDEST_REACH_TTL = 60.0
+
+
+def widest_reach_km(db: Session) -> Optional[float]:
+    """
+    The largest service radius of any located seller (None: someone serves the
+    whole island). Sizes the cell prefilter; cached for a minute, since a
+    seller who widens their radius gets their inbox rebuilt anyway.
+    """
+    if time.monotonic() - _widest["at"] > WIDEST_REACH_TTL:
+        largest = db.query(func.max(func.coalesce(Profile.service_radius_km, DEFAULT_SERVICE_RADIUS_KM))).filter(
+            Profile.geo_cell.isnot(None)).scalar()
+        _widest["km"] = reach_km(largest) if largest else float(DEFAULT_SERVICE_RADIUS_KM)
+        _widest["at"] = time.monotonic()
+    return _widest["km"]
@@ -0,0 +1,178 @@
+# app/utils/matching.py
+"""
+Request <-> seller matching, shared by bids.py, chat.py and the lead jobs.
+
+A seller matches a request when they have a listing in the request's
+category, or when their profile (name + bio) shares a keyword with the
+category name + request description, and the request's location is inside
+the seller's service area (utils/geo.py; unknown locations match anywhere).
+
+Matches are materialized in `seller_leads` when a request is created
+(fan-out on write), so a seller's lead feed is one indexed query. Rows are
+pruned when the seller bids, and when the request is accepted, closed or
+archived; rebuild_seller_leads() recomputes a seller's inbox after they
+change their profile or listings, or switch roles.
+"""
+import re
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Set
+
+from sqlalchemy import delete, insert, or_, true
+from sqlalchemy.orm import Session
+
+from ..models.models import (Bid, BidRequest, BidRequestStatus, BidStatus, Listing, Profile,
+                             SellerLead, User, UserRole)
+from .categories import category_cache
+from .geo import cells_within, covers, widest_reach_km
+
+STOP_WORDS = {"a", "an", "the", "and", "or", "but", "in", "on", "at", "to", "for", "with", "by", "of", "is", "are",
+              "was", "were", "i", "we", "you", "they", "it", "this", "that", "want", "need", "looking", "buy", "sell",
+              "get", "make", "some", "any"}
+
+
+def get_keywords(text: Optional[str]) -> Set[str]:
+    if not text:
+        return set()
+    words = re.findall(r'\b\w+\b', text.lower())
+    return {w for w in words if w not in STOP_WORDS and len(w) > 2}
+
+
+def request_keywords(category_name: Optional[str], description: Optional[str]) -> Set[str]:
+    return get_keywords(f"{category_name or ''} {description or ''}")
+
+
+def profile_keywords(name: Optional[str], description: Optional[str]) -> Set[str]:
+    return get_keywords(f"{name or ''} {description or ''}")
+
+
+# ── Fan-out on write ──────────────────────────────────────────────────────────
+
+def nearby_sellers_filter(db: Session, lat: Optional[float], lon: Optional[float]):
+    """
+    SQL prefilter on Profile: sellers whose grid cell could be within reach of
+    the point, plus sellers without a location. covers() does the exact check.
+    """
+    reach = widest_reach_km(db) if lat is not None else None
+    if reach is None:
+        return true()
+    return or_(Profile.geo_cell.is_(None), Profile.geo_cell.in_(cells_within(lat, lon, reach)))
+
+
+def match_sellers(db: Session, bid_request: BidRequest, category_name: Optional[str]) -> Set[int]:
+    """Sellers (users whose active role is seller) a new request should reach, never its own buyer."""
+    lat, lon = bid_request.lat, bid_request.lon
+    nearby = nearby_sellers_filter(db, lat, lon)
+    seller_ids = set()
+    if bid_request.category_id:
+        owners = db.query(Listing.seller_id, Profile.lat, Profile.lon, Profile.service_radius_km).join(
+            User, User.id == Listing.seller_id).outerjoin(
+            Profile, Profile.user_id == Listing.seller_id).filter(
+            Listing.category_id == bid_request.category_id, User.active_role == UserRole.SELLER, nearby).distinct()
+        seller_ids.update(seller_id for seller_id, s_lat, s_lon, radius in owners
+                          if covers(s_lat, s_lon, radius, lat, lon))
+
+    req_keywords = request_keywords(category_name, bid_request.description)
+    if req_keywords:
+        profiles = db.query(Profile.user_id, Profile.name, Profile.description, Profile.lat, Profile.lon,
+                            Profile.service_radius_km).join(
+            User, User.id == Profile.user_id).filter(User.active_role == UserRole.SELLER, nearby)
+        for user_id, name, description, s_lat, s_lon, radius in profiles:
+            if covers(s_lat, s_lon, radius, lat, lon) and req_keywords & profile_keywords(name, description):
+                seller_ids.add(user_id)
+
+    seller_ids.discard(bid_request.user_id)
+    return seller_ids
+
+
+def add_leads(db: Session, bid_request_id: int, seller_ids: Iterable[int]):
+    """Insert one lead row per seller (part of the caller's transaction)."""
+    rows = [{"seller_id": sid, "bid_request_id": bid_request_id, "created_at": datetime.utcnow()}
+            for sid in seller_ids]
+    if rows:
+        db.execute(insert(SellerLead), rows)
+
+
+def prune_leads(db: Session, bid_request_ids: Iterable[int] = (), seller_id: Optional[int] = None):
+    """Drop leads for the given requests (all sellers, or just `seller_id`)."""
+    bid_request_ids = list(bid_request_ids)
+    if not bid_request_ids:
+        return
+    stmt = delete(SellerLead).where(SellerLead.bid_request_id.in_(bid_request_ids))
+    if seller_id is not None:
+        stmt = stmt.where(SellerLead.seller_id == seller_id)
+    db.execute(stmt)
+
+
+# ── Backfill ──────────────────────────────────────────────────────────────────
+
+def rebuild_seller_leads(db: Session, seller_ids: Iterable[int]) -> int:
+    """
+    Recompute the lead inbox of `seller_ids` against every open request.
+    Users whose active role is not seller end up with an empty inbox, as
+    match_sellers() never reaches them either. Request keywords are
+    computed once and indexed, so rebuilding many sellers costs about the
+    same as rebuilding one. Commits.
+    """
+    seller_ids = list(set(seller_ids))
+    if not seller_ids:
+        return 0
+    cleared_ids = seller_ids
+    seller_ids = [row[0] for row in db.query(User.id).filter(
+        User.id.in_(seller_ids), User.active_role == UserRole.SELLER)]
+    if not seller_ids:
+        db.execute(delete(SellerLead).where(SellerLead.seller_id.in_(cleared_ids)))
+        db.commit()
+        return 0
+
+    category_names = category_cache.names(db)
+    open_requests = db.query(BidRequest.id, BidRequest.user_id, BidRequest.category_id, BidRequest.description,
+                             BidRequest.lat, BidRequest.lon).filter(
+        BidRequest.status == BidRequestStatus.OPEN,
+        or_(BidRequest.expires_at.is_(None), BidRequest.expires_at > datetime.utcnow()),
+    ).all()
+
+    by_category: Dict[int, Set[int]] = {}
+    by_keyword: Dict[str, Set[int]] = {}
+    owner = {}
+    location = {}
+    for rid, user_id, category_id, description, lat, lon in open_requests:
+        owner[rid] = user_id
+        location[rid] = (lat, lon)
+        if category_id:
+            by_category.setdefault(category_id, set()).add(rid)
+        for word in request_keywords(category_names.get(category_id), description):
+            by_keyword.setdefault(word, set()).add(rid)
+
+    listing_categories: Dict[int, Set[int]] = {}
+    for seller_id, category_id in db.query(Listing.seller_id, Listing.category_id).filter(
+            Listing.seller_id.in_(seller_ids)).distinct():
+        listing_categories.setdefault(seller_id, set()).add(category_id)
+    keywords = {}
+    service_area = {}
+    for user_id, name, description, lat, lon, radius in db.query(
+            Profile.user_id, Profile.name, Profile.description, Profile.lat, Profile.lon,
+            Profile.service_radius_km).filter(Profile.user_id.in_(seller_ids)):
+        keywords[user_id] = profile_keywords(name, description)
+        service_area[user_id] = (lat, lon, radius)
+    already_bid: Dict[int, Set[int]] = {}
+    for seller_id, rid in db.query(Bid.seller_id, Bid.bid_request_id).filter(
+            Bid.seller_id.in_(seller_ids), Bid.status != BidStatus.REJECTED):
+        already_bid.setdefault(seller_id, set()).add(rid)
+
+    db.execute(delete(SellerLead).where(SellerLead.seller_id.in_(cleared_ids)))
+    now = datetime.utcnow()
+    rows = []
+    for seller_id in seller_ids:
+        matches = set()
+        for category_id in listing_categories.get(seller_id, ()):
+            matches |= by_category.get(category_id, set())
+        for word in keywords.get(seller_id, ()):
+            matches |= by_keyword.get(word, set())
+        matches -= already_bid.get(seller_id, set())
+        s_lat, s_lon, radius = service_area.get(seller_id, (None, None, None))
+        rows += [{"seller_id": seller_id, "bid_request_id": rid, "created_at": now}
+                 for rid in matches if owner[rid] != seller_id and covers(s_lat, s_lon, radius, *location[rid])]
+    if rows:
+        db.execute(insert(SellerLead), rows)
+    db.commit()
+    return len(rows)
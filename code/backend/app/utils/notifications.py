@@ -0,0 +1,302 @@
+# app/utils/notifications.py
+"""
+Notification fan-out shared by bids.py and chat.py.
+
+- create_notifications() writes the rows for many users in one commit, and
+  drops "new lead" notifications for sellers who already got
+  LEAD_NOTIFICATIONS_PER_HOUR of them in the last hour.
+  create_notifications_bulk() does the same for (user, reference) pairs.
+  Callers that commit themselves (commit=False) reload the rows with
+  reload_notifications() before dispatching them.
+- PresenceRegistry tracks which users have a live socket on this worker
+  (fed by connect/identify/disconnect in main.py). Without a Socket.IO
+  message queue an emit can only reach sockets on the same worker anyway,
+  so emits to users who aren't present here are skipped. With one (REDIS_URL,
+  see main.py) every notification is emitted.
+- StreamRegistry holds the open GET /notifications/stream (SSE) connections
+  on this worker, for clients whose proxies block WebSockets.
+- NotificationDispatcher sends the first notification for a user right away
+  and coalesces any that follow within NOTIFY_COALESCE_MS into a single
+  `new_notifications` batch event. The same payloads go to the user's SSE
+  streams.
+"""
+import asyncio
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from socketio.async_pubsub_manager import AsyncPubSubManager
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ..core.compression import compact_socket_payloads
+from ..core.metrics import REGISTRY
+from ..models.models import Notification
+
+LEAD_TYPES = ("new_request", "new_rfp")
+LEAD_NOTIFICATIONS_PER_HOUR = int(os.getenv("LEAD_NOTIFICATIONS_PER_HOUR", "20"))
+COALESCE_WINDOW = float(os.getenv("NOTIFY_COALESCE_MS", "1000")) / 1000
+REPLAY_LIMIT = int(os.getenv("NOTIFY_REPLAY_LIMIT", "100"))
+COMPACT_PAYLOADS = compact_socket_payloads()  # SOCKETIO_SERIALIZER=msgpack (core/compression.py)
+STREAM_QUEUE_SIZE = 100  # payloads buffered per SSE connection before it falls back to the database
+
+notifications_total = REGISTRY.counter(
+    "syncro_notifications_total", "Notifications by outcome", ("type", "outcome"))
+
+
+# ── Rows ──────────────────────────────────────────────────────────────────────
+
+def lead_counts_last_hour(db: Session, user_ids: Iterable[int]) -> Dict[int, int]:
+    """How many lead notifications each user received in the last hour (one grouped query)."""
+    user_ids = list(user_ids)
+    if not user_ids:
+        return {}
+    since = datetime.utcnow() - timedelta(hours=1)
+    rows = db.query(Notification.user_id, func.count(Notification.id)).filter(
+        Notification.user_id.in_(user_ids),
+        Notification.type.in_(LEAD_TYPES),
+        Notification.created_at >= since,
+    ).group_by(Notification.user_id).all()
+    return dict(rows)
+
+
+def create_notifications(
+    db: Session,
+    user_ids: Iterable[int],
+    title: str,
+    message: str,
+    type: str,
+    reference_id: Optional[int] = None,
+    commit: bool = True,
+) -> List[Notification]:
+    """Insert one notification per user (applying the lead cap) and return the new rows."""
+    targets = [(uid, reference_id) for uid in dict.fromkeys(user_ids)]
+    return create_notifications_bulk(db, targets, title, message, type, commit=commit)
+
+
+def create_notifications_bulk(
+    db: Session,
+    targets: Iterable[Tuple[int, Optional[int]]],
+    title: str,
+    message: str,
+    type: str,
+    commit: bool = True,
+) -> List[Notification]:
+    """Insert one notification per (user_id, reference_id) pair in a single flush/commit."""
+    targets = list(targets)
+    if type in LEAD_TYPES and LEAD_NOTIFICATIONS_PER_HOUR > 0:
+        counts = lead_counts_last_hour(db, {uid for uid, _ in targets})
+        allowed = [t for t in targets if counts.get(t[0], 0) < LEAD_NOTIFICATIONS_PER_HOUR]
+        if len(allowed) < len(targets):
+            notifications_total.inc(len(targets) - len(allowed), type=type, outcome="capped")
+        targets = allowed
+
+    notifications = [
+        Notification(user_id=uid, title=title, message=message, type=type, reference_id=reference_id)
+        for uid, reference_id in targets
+    ]
+    if not notifications:
+        return []
+    db.add_all(notifications)
+    db.flush()
+    if commit:
+        notification_ids = [n.id for n in notifications]
+        db.commit()
+        reload_notifications(db, notification_ids)
+    notifications_total.inc(len(notifications), type=type, outcome="stored")
+    return notifications
+
+
+def reload_notifications(db: Session, notification_ids: List[int]):
+    """
+    Load rows expired by a commit in one query (ids taken before the commit),
+    so dispatch() doesn't refresh them one SELECT per recipient.
+    """
+    if notification_ids:
+        db.query(Notification).filter(Notification.id.in_(notification_ids)).all()
+
+
+def notification_payload(notif: Notification) -> dict:
+    """
+    The `new_notification` event body the frontend expects. With compact
+    payloads the constant "time" and any null fields are left out.
+    """
+    payload = {
+        "id": notif.id,
+        "title": notif.title,
+        "text": notif.message,
+        "time": "Just now",
+        "unread": not notif.is_read,
+        "type": notif.type,
+        "reference_id": notif.reference_id,
+        "created_at": notif.created_at.isoformat() if notif.created_at else None,
+    }
+    if COMPACT_PAYLOADS:
+        payload = {k: v for k, v in payload.items() if k != "time" and v is not None}
+    return payload
+
+
+def missed_notifications(db: Session, user_id: int, after_id: int, limit: int = REPLAY_LIMIT) -> List[Notification]:
+    """Notifications newer than `after_id`, oldest first (uses ix_notifications_user_id_id)."""
+    return db.query(Notification).filter(
+        Notification.user_id == user_id,
+        Notification.id > after_id,
+    ).order_by(Notification.id).limit(limit).all()
+
+
+# ── Presence ──────────────────────────────────────────────────────────────────
+
+class PresenceRegistry:
+    """user_id <-> live socket ids on this worker."""
+
+    def __init__(self):
+        self._sids_by_user: Dict[int, Set[str]] = {}
+        self._user_by_sid: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        REGISTRY.gauge("syncro_presence_online_users", "Users with a live socket on this worker",
+                       callback=lambda: [({}, len(self._sids_by_user))])
+
+    def add(self, user_id: int, sid: str):
+        with self._lock:
+            previous = self._user_by_sid.get(sid)
+            if previous is not None and previous != user_id:
+                self._discard(previous, sid)
+            self._user_by_sid[sid] = user_id
+            self._sids_by_user.setdefault(user_id, set()).add(sid)
+
+    def remove(self, sid: str) -> Optional[int]:
+        with self._lock:
+            user_id = self._user_by_sid.pop(sid, None)
+            if user_id is not None:
+                self._discard(user_id, sid)
+            return user_id
+
+    def _discard(self, user_id: int, sid: str):
+        sids = self._sids_by_user.get(user_id)
+        if sids is not None:
+            sids.discard(sid)
+            if not sids:
+                del self._sids_by_user[user_id]
+
+    def is_online(self, user_id: int) -> bool:
+        return user_id in self._sids_by_user
+
+    def user_for(self, sid: str) -> Optional[int]:
+        return self._user_by_sid.get(sid)
+
+
+presence = PresenceRegistry()
+
+
+# ── SSE streams ───────────────────────────────────────────────────────────────
+
+class NotificationStream:
+    """One SSE connection: payloads pushed by the dispatcher, read by the response generator."""
+
+    def __init__(self, user_id: int):
+        self.user_id = user_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=STREAM_QUEUE_SIZE)
+        self.overflowed = False  # payloads were dropped; the reader has to catch up from the database
+
+    def push(self, payloads: List[dict]):
+        for payload in payloads:
+            try:
+                self.queue.put_nowait(payload)
+            except asyncio.QueueFull:
+                self.overflowed = True
+                return
+
+
+class StreamRegistry:
+    """user_id -> open SSE streams on this worker. Only touched from the event loop."""
+
+    def __init__(self):
+        self._streams: Dict[int, Set[NotificationStream]] = {}
+        REGISTRY.gauge("syncro_notification_streams", "Open SSE notification streams on this worker",
+                       callback=lambda: [({}, sum(len(s) for s in self._streams.values()))])
+
+    def open(self, user_id: int) -> NotificationStream:
+        stream = NotificationStream(user_id)
+        self._streams.setdefault(user_id, set()).add(stream)
+        return stream
+
+    def close(self, stream: NotificationStream):
+        streams = self._streams.get(stream.user_id)
+        if streams is not None:
+            streams.discard(stream)
+            if not streams:
+                del self._streams[stream.user_id]
+
+    def is_online(self, user_id: int) -> bool:
+        return user_id in self._streams
+
+    def push(self, user_id: int, payloads: List[dict]):
+        for stream in self._streams.get(user_id, ()):
+            stream.push(payloads)
+
+
+streams = StreamRegistry()
+
+
+# ── Dispatch ──────────────────────────────────────────────────────────────────
+
+class NotificationDispatcher:
+    def __init__(self, sio, window: float = COALESCE_WINDOW, registry: PresenceRegistry = presence,
+                 stream_registry: StreamRegistry = streams):
+        self.sio = sio
+        self.window = window
+        self.presence = registry
+        self.streams = stream_registry
+        self._pending: Dict[int, List[dict]] = {}
+        self._cooling: Dict[int, asyncio.TimerHandle] = {}
+        # A pub/sub client manager (Redis) delivers to sockets on other workers too
+        self.shared = isinstance(getattr(sio, "manager", None), AsyncPubSubManager)
+
+    async def dispatch(self, notifications: Iterable[Notification]):
+        for notif in notifications:
+            if not self.is_online(notif.user_id):
+                notifications_total.inc(type=notif.type or "", outcome="offline")
+                continue
+            await self.send(notif.user_id, notification_payload(notif))
+
+    def is_online(self, user_id: int) -> bool:
+        return self.shared or self.presence.is_online(user_id) or self.streams.is_online(user_id)
+
+    async def send(self, user_id: int, payload: dict):
+        if not self.is_online(user_id):
+            notifications_total.inc(type=payload.get("type") or "", outcome="offline")
+            return
+        if user_id in self._cooling:
+            # Something was sent to this user moments ago; batch this one up
+            self._pending.setdefault(user_id, []).append(payload)
+            notifications_total.inc(type=payload.get("type") or "", outcome="coalesced")
+            return
+        await self._emit(user_id, [payload])
+        self._start_window(user_id)
+
+    def _start_window(self, user_id: int):
+        if self.window <= 0:
+            return
+        loop = asyncio.get_running_loop()
+        self._cooling[user_id] = loop.call_later(
+            self.window, lambda: asyncio.ensure_future(self._flush(user_id)))
+
+    async def _flush(self, user_id: int):
+        self._cooling.pop(user_id, None)
+        payloads = self._pending.pop(user_id, None)
+        if payloads and self.is_online(user_id):
+            await self._emit(user_id, payloads)
+            self._start_window(user_id)
+
+    async def _emit(self, user_id: int, payloads: List[dict]):
+        self.streams.push(user_id, payloads)
+        try:
+            if len(payloads) == 1:
+                await self.sio.emit("new_notification", payloads[0], room=f"user_{user_id}")
+            else:
+                await self.sio.emit("new_notifications", {"notifications": payloads}, room=f"user_{user_id}")
+            for payload in payloads:
+                notifications_total.inc(type=payload.get("type") or "", outcome="emitted")
+        except Exception as e:
+            print(f"Failed to send notification to user {user_id}: {e}")
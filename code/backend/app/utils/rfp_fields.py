@@ -0,0 +1,169 @@
+# app/utils/rfp_fields.py
+"""
+Typed RFP fields (quantity, budget, event date, location) for BidRequest.
+
+The chatbot's READY:{...} order carries these as free text ("LKR 25,000",
+"20th December", "colombo 07, Sri Lanka"), and older requests only have them
+flattened into the description ("Budget: LKR ..."). The parsers here turn
+either form into column values; anything they can't read stays None.
+"""
+import re
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from ..models.models import BidRequest, default_request_expiry
+from .geo import geocode
+
+MAX_BUDGET = 1_000_000_000  # LKR; anything above is a parsing accident
+MAX_QUANTITY = 1_000_000
+
+_EMPTY = {"", "n/a", "na", "none", "null", "-", "unknown", "not sure", "any", "flexible", "tbd"}
+_MULTIPLIERS = {"k": 1_000, "thousand": 1_000, "lakh": 100_000, "lakhs": 100_000, "lac": 100_000,
+                "mn": 1_000_000, "m": 1_000_000, "million": 1_000_000}
+_AMOUNT = re.compile(r"(\d+(?:\.\d+)?)\s*(?:(k|thousand|lakhs?|lac|mn|m|million)\b)?")
+_NUMBER_WORDS = {word: n for n, word in enumerate(
+    "zero one two three four five six seven eight nine ten eleven twelve thirteen fourteen fifteen sixteen "
+    "seventeen eighteen nineteen".split())}
+_NUMBER_WORDS.update({word: 10 * n for n, word in enumerate(
+    "twenty thirty forty fifty sixty seventy eighty ninety".split(), start=2)})
+_SCALE_WORDS = {"dozen": 12, "hundred": 100, "thousand": 1_000}
+_DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%d.%m.%Y", "%d/%m/%y", "%d %B %Y", "%d %b %Y",
+                 "%B %d %Y", "%b %d %Y")
+_DATE_FORMATS_NO_YEAR = ("%d %B", "%d %b", "%B %d", "%b %d", "%d/%m")
+_WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+_COUNTRY = re.compile(r",?\s*\bsri\s*lanka\b\.?$", re.IGNORECASE)
+_BLOB_LINE = re.compile(r"^(Quantity|Budget|Date needed|Location):\s*(.*)$", re.MULTILINE)
+
+
+def _blank(value) -> bool:
+    return value is None or str(value).strip().lower() in _EMPTY
+
+
+def parse_budget(value) -> Optional[float]:
+    """"LKR 25,000", "Rs. 1.5 lakh", "30k", "20000-25000" (the upper end: it's a maximum) -> LKR."""
+    if _blank(value):
+        return None
+    if isinstance(value, (int, float)):
+        amounts = [float(value)]
+    else:
+        text = str(value).lower().replace(",", "")
+        amounts = [float(n) * _MULTIPLIERS.get(unit or "", 1) for n, unit in _AMOUNT.findall(text)]
+    amounts = [a for a in amounts if 0 < a <= MAX_BUDGET]
+    return max(amounts) if amounts else None
+
+
+def _words_to_number(text: str) -> Optional[int]:
+    """The first number spelled out in `text`: "twenty five" -> 25, "one hundred and fifty" -> 150, "a dozen" -> 12."""
+    total = current = 0
+    found = False
+    for word in re.findall(r"[a-z]+", text):
+        if word in _NUMBER_WORDS:
+            current += _NUMBER_WORDS[word]
+        elif word in _SCALE_WORDS:
+            scale = _SCALE_WORDS[word]
+            if scale >= 1_000:
+                total += max(current, 1) * scale
+                current = 0
+            else:
+                current = max(current, 1) * scale  # "dozen"/"a hundred" alone mean one of them
+        elif found and word != "and":
+            break  # the first number ends here ("two or three" -> 2)
+        else:
+            continue  # words before the number, or "and" inside it
+        found = True
+    return total + current if found else None
+
+
+def parse_quantity(value) -> Optional[int]:
+    """"50 people", "about 10", "a dozen", "twenty five" -> int."""
+    if _blank(value):
+        return None
+    if isinstance(value, (int, float)):
+        quantity = int(value)
+    else:
+        text = str(value).lower().replace(",", "")
+        match = re.search(r"\d+", text)
+        if match:
+            quantity = int(match.group())
+        else:
+            quantity = _words_to_number(text) or 0
+    return quantity if 0 < quantity <= MAX_QUANTITY else None
+
+
+def parse_event_date(value, today: Optional[date] = None) -> Optional[date]:
+    """ISO, day-first numeric, "20th December (2026)", "tomorrow", "next friday" -> date."""
+    if _blank(value):
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    today = today or datetime.utcnow().date()
+    text = re.sub(r"(\d)(st|nd|rd|th)\b", r"\1", str(value).strip().lower())
+    text = " ".join(text.replace(",", " ").split())
+
+    if text in ("today", "now", "asap"):
+        return today
+    if text == "tomorrow":
+        return today + timedelta(days=1)
+    if text == "next week":
+        return today + timedelta(days=7)
+    for i, weekday in enumerate(_WEEKDAYS):
+        if text in (weekday, f"this {weekday}", f"next {weekday}", f"on {weekday}"):
+            return today + timedelta(days=(i - today.weekday() - 1) % 7 + 1)
+
+    candidate = text.split(" to ")[0].split(" - ")[0].strip()  # a range: the first day counts
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(candidate, fmt).date()
+        except ValueError:
+            continue
+    for fmt in _DATE_FORMATS_NO_YEAR:
+        try:
+            parsed = datetime.strptime(f"{candidate} {today.year}", f"{fmt} %Y").date()
+        except ValueError:
+            continue
+        # No year given: the next time that day comes round
+        return parsed if parsed >= today else parsed.replace(year=today.year + 1)
+    return None
+
+
+def normalize_location(value) -> Optional[str]:
+    """"  colombo 07 , Sri Lanka" -> "Colombo 07": one spelling per area, so it can be filtered on."""
+    if _blank(value):
+        return None
+    text = _COUNTRY.sub("", " ".join(str(value).split())).strip(" ,.")
+    text = re.sub(r"\s*,\s*", ", ", text)
+    return text.title()[:120] or None
+
+
+def rfp_fields(quantity=None, budget=None, event_date=None, location=None, today: Optional[date] = None) -> dict:
+    """Column values for BidRequest from raw values (chatbot order, API body)."""
+    return {
+        "quantity": parse_quantity(quantity),
+        "budget": parse_budget(budget),
+        "event_date": parse_event_date(event_date, today),
+        "location": normalize_location(location),
+    }
+
+
+def parse_description(description: Optional[str], today: Optional[date] = None) -> dict:
+    """Column values from the "Quantity: / Budget: / Date needed: / Location:" lines of an old description."""
+    lines = {label: value.strip() for label, value in _BLOB_LINE.findall(description or "")}
+    return rfp_fields(lines.get("Quantity"), lines.get("Budget"), lines.get("Date needed"), lines.get("Location"),
+                      today)
+
+
+def apply_rfp_fields(bid_request: BidRequest, fields: dict):
+    """Set the parsed fields and the location's coordinates, and don't keep the request open past its event date."""
+    for key, value in fields.items():
+        if value is not None:
+            setattr(bid_request, key, value)
+    town = geocode(bid_request.location)
+    if town is not None:
+        bid_request.lat, bid_request.lon = town.lat, town.lon
+    event_date = fields.get("event_date")
+    if event_date is not None and event_date >= datetime.utcnow().date():
+        end_of_event = datetime.combine(event_date + timedelta(days=1), datetime.min.time())
+        expires_at = bid_request.expires_at or default_request_expiry()
+        bid_request.expires_at = min(expires_at, end_of_event)
@@ -0,0 +1,163 @@
+# app/utils/seller_scores.py
+"""
+Precomputed seller quality score, used to rank bids and listings.
+
+`seller_scores` keeps running counters per seller:
+
+- rating: sum/count of the reviews they got as the seller of an order
+- completion: completed vs cancelled orders
+- acceptance: accepted bids out of all their bids
+- response time: seconds from a request being posted to their bid
+
+Write paths call record() with the deltas of the event (a bid, an accept, an
+order status change, a review) in their own transaction, which also
+refreshes `score`. jobs/seller_scores.py recomputes every row from the
+source tables nightly, so drift from missed events doesn't accumulate.
+
+Every rate is smoothed towards a prior (PRIOR_WEIGHT pseudo-observations),
+so a new seller with one 5-star review doesn't outrank an established one,
+and sellers without a row get NEW_SELLER_SCORE.
+"""
+import os
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..models.models import Bid, SellerScore
+
+COUNTERS = ("rating_sum", "rating_count", "orders_total", "orders_completed", "orders_cancelled",
+            "bids_total", "bids_accepted", "response_seconds_sum")
+
+PRIOR_WEIGHT = 5
+PRIOR_RATING = 4.0        # out of 5
+PRIOR_COMPLETION = 0.8
+PRIOR_ACCEPTANCE = 0.2
+RESPONSE_HALF_HOURS = 24  # answering within this many hours on average scores 0.5
+WEIGHTS = {"rating": 0.4, "completion": 0.25, "acceptance": 0.2, "response": 0.15}
+
+# Bid ranking: PRICE_WEIGHT * (cheapest price / price) + (1 - PRICE_WEIGHT) * seller score
+BID_PRICE_WEIGHT = float(os.getenv("BID_PRICE_WEIGHT", "0.5"))
+
+
+def _smoothed(hits: float, n: float, prior: float) -> float:
+    return (hits + prior * PRIOR_WEIGHT) / (n + PRIOR_WEIGHT)
+
+
+def rates(counters) -> dict:
+    """The smoothed components (each 0..1) plus the raw averages shown to buyers."""
+    c = {k: counters[k] or 0 for k in COUNTERS}
+    finished = c["orders_completed"] + c["orders_cancelled"]
+    avg_response_hours = c["response_seconds_sum"] / c["bids_total"] / 3600 if c["bids_total"] else None
+    return {
+        "rating": _smoothed(c["rating_sum"], c["rating_count"], PRIOR_RATING) / 5,
+        "completion": _smoothed(c["orders_completed"], finished, PRIOR_COMPLETION),
+        "acceptance": _smoothed(c["bids_accepted"], c["bids_total"], PRIOR_ACCEPTANCE),
+        "response": 1 / (1 + (avg_response_hours if avg_response_hours is not None
+                              else RESPONSE_HALF_HOURS) / RESPONSE_HALF_HOURS),
+        "rating_mean": c["rating_sum"] / c["rating_count"] if c["rating_count"] else None,
+        "review_count": c["rating_count"],
+        "completion_rate": c["orders_completed"] / finished if finished else None,
+        "avg_response_hours": avg_response_hours,
+    }
+
+
+def compute_score(counters) -> float:
+    components = rates(counters)
+    return round(sum(weight * components[name] for name, weight in WEIGHTS.items()), 4)
+
+
+NEW_SELLER_SCORE = compute_score(dict.fromkeys(COUNTERS, 0))
+
+
+# ── Incremental updates ───────────────────────────────────────────────────────
+
+def _ensure_row(db: Session, seller_id: int):
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        db.execute(dialect_insert(SellerScore).values(seller_id=seller_id, score=NEW_SELLER_SCORE)
+                   .on_conflict_do_nothing(index_elements=[SellerScore.seller_id]))
+        return
+    try:
+        with db.begin_nested():
+            db.execute(insert(SellerScore).values(seller_id=seller_id, score=NEW_SELLER_SCORE))
+    except IntegrityError:
+        pass
+
+
+def record(db: Session, seller_id: Optional[int], **deltas):
+    """Add `deltas` (counter name -> amount) to a seller's row and refresh the score. Doesn't commit."""
+    deltas = {k: v for k, v in deltas.items() if v}
+    if seller_id is None or not deltas:
+        return
+    table = SellerScore.__table__
+    _ensure_row(db, seller_id)
+    counters = db.execute(
+        update(table).where(table.c.seller_id == seller_id)
+        .values({table.c[k]: table.c[k] + v for k, v in deltas.items()})
+        .returning(*(table.c[k] for k in COUNTERS))
+    ).one()._mapping
+    db.execute(update(table).where(table.c.seller_id == seller_id)
+               .values(score=compute_score(counters), updated_at=datetime.utcnow()))
+
+
+def record_bids(db: Session, bids: Iterable[Bid], requested_at: Dict[int, datetime]):
+    """New bids: count them and their response time (`requested_at`: bid_request_id -> created_at)."""
+    now = datetime.utcnow()
+    totals, seconds = Counter(), Counter()
+    for bid in bids:
+        totals[bid.seller_id] += 1
+        created = requested_at.get(bid.bid_request_id)
+        if created is not None:
+            seconds[bid.seller_id] += max((now - created).total_seconds(), 0.0)
+    for seller_id in sorted(totals):
+        record(db, seller_id, bids_total=totals[seller_id], response_seconds_sum=seconds[seller_id])
+
+
+def order_status_deltas(old, new) -> dict:
+    """Counter changes for an order moving from status `old` to `new`."""
+    deltas = Counter()
+    for status, sign in ((old, -1), (new, 1)):
+        value = getattr(status, "value", status)
+        if value == "completed":
+            deltas["orders_completed"] += sign
+        elif value == "cancelled":
+            deltas["orders_cancelled"] += sign
+    return dict(deltas)
+
+
+# ── Reads ─────────────────────────────────────────────────────────────────────
+
+def scores_for(db: Session, seller_ids: Iterable[int]) -> Dict[int, SellerScore]:
+    seller_ids = list(set(seller_ids))
+    if not seller_ids:
+        return {}
+    return {row.seller_id: row for row in db.query(SellerScore).filter(SellerScore.seller_id.in_(seller_ids))}
+
+
+def seller_score_column(seller_id_column):
+    """Correlated subquery: the seller's score, NEW_SELLER_SCORE when they have no row yet."""
+    return func.coalesce(
+        select(SellerScore.score).where(SellerScore.seller_id == seller_id_column).scalar_subquery(),
+        NEW_SELLER_SCORE)
+
+
+def rank_bids(bids: List[Bid], scores: Dict[int, SellerScore]) -> List[Bid]:
+    """Best first: a blend of price (relative to the cheapest bid) and the seller's score."""
+    if not bids:
+        return []
+    cheapest = min(bid.price for bid in bids)
+
+    def blend(bid):
+        row = scores.get(bid.seller_id)
+        score = row.score if row is not None else NEW_SELLER_SCORE
+        return BID_PRICE_WEIGHT * (cheapest / bid.price) + (1 - BID_PRICE_WEIGHT) * score
+
+    return sorted(bids, key=lambda bid: (-blend(bid), bid.price, bid.id))
@@ -0,0 +1,52 @@
+# app/utils/serialization.py
+"""
+Fast read path for large list responses.
+
+Instead of loading full ORM objects (identity map, attribute instrumentation)
+and validating each one through a Pydantic model, list endpoints select only
+the columns their response schema exposes as plain Core rows and hand the
+resulting dicts straight to orjson. The route keeps its `response_model`, so
+the OpenAPI docs are unchanged.
+"""
+from typing import Iterable, List, Optional, Type
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+
+def _default(obj):
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    return jsonable_encoder(obj)
+
+
+def dumps(data) -> bytes:
+    """orjson with a fallback for anything it doesn't know (Pydantic models, Decimals...)."""
+    return orjson.dumps(data, default=_default)
+
+
+def schema_columns(model, schema: Type[BaseModel]) -> list:
+    """The mapped columns of `model` that `schema` actually returns."""
+    return [getattr(model, name) for name in schema.model_fields if hasattr(model, name)]
+
+
+def select_rows(db: Session, model, schema: Type[BaseModel], *criteria, order_by=None,
+                limit: Optional[int] = None) -> List[dict]:
+    """Run SELECT <schema columns> FROM <model> WHERE <criteria> and return plain dicts."""
+    columns = schema_columns(model, schema)
+    stmt = select(*columns).where(*criteria)
+    if order_by is not None:
+        stmt = stmt.order_by(order_by)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    result = db.execute(stmt)
+    keys = list(result.keys())
+    return [dict(zip(keys, row)) for row in result]
+
+
+def rows_response(rows: Iterable[dict]) -> ORJSONResponse:
+    return ORJSONResponse(content=rows if isinstance(rows, list) else list(rows))
@@ -0,0 +1,9 @@
+# bench/__init__.py
+# Load-testing harness for the Syncro backend.
+#
+#   datagen.py  - bulk-loads synthetic users, sellers, listings, requests, bids...
+#   mock_llm.py - stand-in for the Groq API so /chat/rfp can be load tested
+#   loadgen.py  - asyncio + httpx driver that replays buyer/seller scenarios
+#   compare.py  - diffs two loadgen JSON reports (e.g. main vs. a branch)
+#
+# See bench/README.md for the full workflow.
@@ -0,0 +1,140 @@
+# bench/accept_race.py
+"""
+Concurrency check for bid acceptance.
+
+Creates fresh requests as one bench buyer, has several bench sellers bid on
+each (POST /bids/batch), then accepts every bid many times in parallel: single
+PATCH /bids/{id}/accept calls (double clicks, several tabs) racing against
+overlapping POST /bids/accept multi-accepts. Afterwards it checks in the
+database that every bid is accepted and has exactly one Order.
+
+Run against a backend seeded with bench.datagen and the same DATABASE_URL:
+
+    python -m bench.accept_race --requests 20 --sellers 5 --parallel 16
+
+Prints a JSON summary and exits with status 1 if any invariant is violated.
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import Counter
+
+import httpx
+from sqlalchemy import func, select
+
+from app.database import engine
+from app.models import models
+
+from .vocab import pick_category, request_text
+
+
+async def login(client: httpx.AsyncClient, email: str, password: str) -> dict:
+    response = await client.post("/auth/login", json={"email": email, "password": password})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def setup(client, args, manifest) -> tuple:
+    """Create the requests and bids to fight over; returns (buyer headers, bid ids)."""
+    rng = random.Random(args.seed)
+    buyer = await login(client, manifest["clients"][0], manifest["password"])
+    sellers = [await login(client, email, manifest["password"]) for email in manifest["sellers"][:args.sellers]]
+
+    request_ids = []
+    for _ in range(args.requests):
+        description = request_text(rng, pick_category(rng))
+        response = await client.post("/bids/requests", json={"description": description}, headers=buyer)
+        response.raise_for_status()
+        request_ids.append(response.json()["id"])
+
+    bid_ids = []
+    for seller in sellers:
+        bids = [{"bid_request_id": rid, "price": rng.randint(1000, 50000), "quantity": 1} for rid in request_ids]
+        response = await client.post("/bids/batch", json={"bids": bids}, headers=seller)
+        response.raise_for_status()
+        bid_ids += [r["bid"]["id"] for r in response.json()["results"] if r["ok"]]
+    return buyer, bid_ids
+
+
+async def race(client, buyer, bid_ids, args) -> Counter:
+    rng = random.Random(args.seed + 1)
+    calls = []
+    for bid_id in bid_ids:
+        calls += [("PATCH", f"/bids/{bid_id}/accept", None)] * args.parallel
+    for _ in range(args.parallel):
+        chunk = rng.sample(bid_ids, min(len(bid_ids), args.multi_size))
+        calls.append(("POST", "/bids/accept", {"bid_ids": chunk}))
+    rng.shuffle(calls)
+
+    statuses = Counter()
+    limit = asyncio.Semaphore(args.concurrency)
+
+    async def one(method, url, body):
+        async with limit:
+            try:
+                response = await client.request(method, url, json=body, headers=buyer)
+                statuses[f"{method} {response.status_code}"] += 1
+            except httpx.HTTPError as e:
+                statuses[f"{method} {type(e).__name__}"] += 1
+
+    await asyncio.gather(*(one(*call) for call in calls))
+    return statuses
+
+
+def verify(bid_ids) -> dict:
+    with engine.connect() as conn:
+        orders_per_bid = dict(conn.execute(
+            select(models.Order.bid_id, func.count(models.Order.id))
+            .where(models.Order.bid_id.in_(bid_ids))
+            .group_by(models.Order.bid_id)
+        ).all())
+        not_accepted = conn.execute(
+            select(func.count(models.Bid.id))
+            .where(models.Bid.id.in_(bid_ids), models.Bid.status != models.BidStatus.ACCEPTED)
+        ).scalar()
+    return {
+        "bids": len(bid_ids),
+        "bids_without_order": sum(1 for b in bid_ids if b not in orders_per_bid),
+        "bids_with_duplicate_orders": sum(1 for n in orders_per_bid.values() if n > 1),
+        "bids_not_accepted": not_accepted,
+    }
+
+
+async def run(args) -> dict:
+    with open(args.manifest) as f:
+        manifest = json.load(f)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout,
+                                 limits=httpx.Limits(max_connections=args.concurrency)) as client:
+        buyer, bid_ids = await setup(client, args, manifest)
+        started = time.perf_counter()
+        statuses = await race(client, buyer, bid_ids, args)
+        elapsed = time.perf_counter() - started
+    return {"calls": dict(statuses), "seconds": round(elapsed, 2), "check": verify(bid_ids)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Race concurrent bid accepts and check one Order per bid")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--manifest", default="bench_manifest.json", help="accounts written by bench.datagen")
+    parser.add_argument("--requests", type=int, default=10, help="fresh bid requests to create")
+    parser.add_argument("--sellers", type=int, default=5, help="sellers bidding on each request")
+    parser.add_argument("--parallel", type=int, default=8, help="concurrent single accepts per bid")
+    parser.add_argument("--multi-size", type=int, default=10, help="bids per multi-accept call")
+    parser.add_argument("--concurrency", type=int, default=64, help="max requests in flight")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    print(json.dumps(report, indent=2))
+    check = report["check"]
+    failed = (check["bids_without_order"] or check["bids_with_duplicate_orders"] or check["bids_not_accepted"]
+              or any(not key.endswith(" 200") for key in report["calls"]))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
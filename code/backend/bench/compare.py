@@ -0,0 +1,67 @@
+# bench/compare.py
+"""
+Compare two loadgen reports endpoint by endpoint.
+
+    python -m bench.compare results/main.json results/my-branch.json --threshold 10
+
+Prints p50/p95/p99 and throughput deltas and exits with status 1 when any
+endpoint's p95 got slower by more than --threshold percent (handy in CI).
+"""
+import argparse
+import json
+import sys
+
+
+def pct_change(old: float, new: float) -> float:
+    if not old:
+        return 0.0
+    return (new - old) / old * 100
+
+
+def compare(base: dict, head: dict, threshold: float) -> list:
+    """Returns the endpoints whose p95 regressed by more than `threshold` percent."""
+    regressions = []
+    names = sorted(set(base["endpoints"]) | set(head["endpoints"]))
+    width = max([len(n) for n in names] + [8])
+
+    print(f"base {base['meta']['commit']}  vs  head {head['meta']['commit']}")
+    print(f"{'endpoint':<{width}}  {'p50 ms':>16}  {'p95 ms':>16}  {'p99 ms':>16}  {'req/s':>14}")
+    for name in names:
+        old, new = base["endpoints"].get(name), head["endpoints"].get(name)
+        if old is None or new is None:
+            print(f"{name:<{width}}  {'only in ' + ('head' if old is None else 'base'):>16}")
+            continue
+        cells = []
+        for key in ("p50_ms", "p95_ms", "p99_ms", "rps"):
+            cells.append(f"{new[key]:>8.1f} ({pct_change(old[key], new[key]):+5.0f}%)")
+        flag = ""
+        if pct_change(old["p95_ms"], new["p95_ms"]) > threshold:
+            regressions.append(name)
+            flag = "  <-- slower"
+        print(f"{name:<{width}}  " + "  ".join(cells) + flag)
+
+    print(f"\ntotal p95 {base['total']['p95_ms']} -> {head['total']['p95_ms']} ms, "
+          f"{base['total']['rps']} -> {head['total']['rps']} req/s")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Diff two bench.loadgen reports")
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument("--threshold", type=float, default=10.0, help="allowed p95 regression in percent")
+    args = parser.parse_args()
+
+    with open(args.base) as f:
+        base = json.load(f)
+    with open(args.head) as f:
+        head = json.load(f)
+
+    regressions = compare(base, head, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} endpoint(s) regressed more than {args.threshold}%: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
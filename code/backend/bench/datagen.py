@@ -0,0 +1,264 @@
+# bench/datagen.py
+"""
+Synthetic data generator for load tests.
+
+Bulk-loads users, sellers, profiles, listings, bid requests, bids and
+notifications into the database pointed to by DATABASE_URL. PostgreSQL
+targets are loaded with COPY, anything else (e.g. SQLite) with executemany.
+
+Descriptions are built from the skewed vocabularies in vocab.py, which is
+what makes the keyword matching in bids.py / chat.py behave like it does in
+production.
+
+Usage:
+    python -m bench.datagen --users 2000 --sellers 500 --requests 5000
+"""
+import argparse
+import csv
+import enum
+import io
+import json
+import random
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select, text
+
+from app.core.security import get_password_hash
+from app.database import engine
+from app.jobs.seller_leads import rebuild_all
+from app.models import models
+from app.utils.categories import normalize_category_name
+from app.utils.geo import locate
+from app.utils.rfp_fields import parse_description
+
+from .vocab import CATEGORY_NAMES, FIRST_NAMES, LAST_NAMES, TOWNS, keywords, pick_category, request_text
+
+BENCH_PASSWORD = "benchpass"
+BENCH_EMAIL_DOMAIN = "bench.example.com"
+
+# ── Bulk loading ──────────────────────────────────────────────────────────────
+
+def _copy_rows(conn, table, columns, rows):
+    """COPY rows into a PostgreSQL table through the raw psycopg2 cursor."""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for row in rows:
+        writer.writerow(["\\N" if row[c] is None else row[c] for c in columns])
+    buf.seek(0)
+    cursor = conn.connection.driver_connection.cursor()
+    cursor.copy_expert(
+        f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+        buf,
+    )
+
+
+def bulk_insert(conn, table, rows, batch_size: int = 5000):
+    if not rows:
+        return
+    if conn.dialect.name == "postgresql":
+        # COPY bypasses SQLAlchemy type processing, so enums go in as their DB labels
+        columns = list(rows[0])
+        prepared = [{c: (v.name if isinstance(v, enum.Enum) else v) for c, v in r.items()} for r in rows]
+        _copy_rows(conn, table, columns, prepared)
+        return
+    for i in range(0, len(rows), batch_size):
+        conn.execute(table.insert(), rows[i:i + batch_size])
+
+
+def next_id(conn, table) -> int:
+    return (conn.execute(select(func.max(table.c.id))).scalar() or 0) + 1
+
+
+def reset_sequences(conn, tables):
+    """Explicit ids were inserted, so move the serial sequences past them."""
+    if conn.dialect.name != "postgresql":
+        return
+    for table in tables:
+        conn.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+            f"COALESCE((SELECT MAX(id) FROM {table.name}), 1))"
+        ))
+
+
+def generate(args) -> dict:
+    rng = random.Random(args.seed)
+    now = datetime.utcnow()
+    password_hash = get_password_hash(BENCH_PASSWORD)  # bcrypt once, not per user
+
+    t = {name: models.Base.metadata.tables[name] for name in (
+        "users", "profiles", "categories", "listings", "bid_requests", "bids", "notifications")}
+    counts = {}
+
+    models.Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        # Categories are shared with real data, so reuse existing rows by name
+        existing = {name: cid for cid, name in conn.execute(select(t["categories"].c.id, t["categories"].c.name))}
+        new_cats = [name for name in CATEGORY_NAMES if name not in existing]
+        if new_cats:
+            conn.execute(t["categories"].insert(),
+                         [{"name": name, "name_key": normalize_category_name(name)} for name in new_cats])
+            existing = {name: cid for cid, name in conn.execute(select(t["categories"].c.id, t["categories"].c.name))}
+        category_ids = {name: existing[name] for name in CATEGORY_NAMES}
+
+        # Users: clients first, then sellers
+        user_start = next_id(conn, t["users"])
+        total_users = args.users + args.sellers
+        users, profiles = [], []
+        seller_ids, client_ids, seller_category = [], [], {}
+        for i in range(total_users):
+            uid = user_start + i
+            is_seller = i >= args.users
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            users.append({
+                "id": uid,
+                "email": f"bench{uid}@{BENCH_EMAIL_DOMAIN}",
+                "hashed_password": password_hash,
+                "active_role": models.UserRole.SELLER if is_seller else models.UserRole.CLIENT,
+                "first_name": first,
+                "last_name": last,
+            })
+            if is_seller:
+                category = pick_category(rng)
+                seller_ids.append(uid)
+                seller_category[uid] = category
+                name = f"{last} {category}"
+                description = " ".join(keywords(rng, category, rng.randint(4, 10)))
+            else:
+                client_ids.append(uid)
+                name = f"{first} {last}"
+                description = ""
+            address = rng.choice(TOWNS)
+            profiles.append({
+                "user_id": uid,
+                "name": name,
+                "description": description,
+                "address": address,
+                **locate(address),
+                "service_radius_km": rng.choice([None, None, 25, 100, 500]) if is_seller else None,
+                "phone": f"07{rng.randint(10000000, 99999999)}",
+            })
+        bulk_insert(conn, t["users"], users)
+        bulk_insert(conn, t["profiles"], profiles)
+        counts["users"], counts["profiles"] = len(users), len(profiles)
+
+        # Listings: most sellers list in their own category, a few branch out
+        listings = []
+        for uid in seller_ids:
+            for _ in range(max(1, int(rng.expovariate(1 / args.listings_per_seller)))):
+                category = seller_category[uid] if rng.random() < 0.85 else pick_category(rng)
+                words = keywords(rng, category, 6)
+                listings.append({
+                    "title": f"{category} - {' '.join(words[:3])}"[:100],
+                    "description": " ".join(words),
+                    "price": float(rng.randrange(1_000, 200_000, 250)),
+                    "delivery_time": f"{rng.randint(1, 14)} days",
+                    "seller_id": uid,
+                    "category_id": category_ids[category],
+                })
+        bulk_insert(conn, t["listings"], listings)
+        counts["listings"] = len(listings)
+
+        # Bid requests, with explicit ids so bids can point at them
+        req_start = next_id(conn, t["bid_requests"])
+        requests, request_category = [], {}
+        for i in range(args.requests):
+            rid = req_start + i
+            category = pick_category(rng)
+            request_category[rid] = category
+            created_at = now - timedelta(minutes=rng.randint(0, 60 * 24 * 60))
+            description = request_text(rng, category)
+            fields = parse_description(description, created_at.date())
+            located = locate(fields["location"])
+            requests.append({
+                "id": rid,
+                "user_id": rng.choice(client_ids),
+                "category_id": category_ids[category],
+                "description": description,
+                **fields,
+                "lat": located["lat"],
+                "lon": located["lon"],
+                "status": rng.choices(
+                    [models.BidRequestStatus.OPEN, models.BidRequestStatus.ACCEPTED, models.BidRequestStatus.CLOSED],
+                    weights=[70, 20, 10])[0],
+                "created_at": created_at,
+                "expires_at": created_at + timedelta(days=models.BID_REQUEST_TTL_DAYS),
+            })
+        bulk_insert(conn, t["bid_requests"], requests)
+        counts["bid_requests"] = len(requests)
+
+        # Bids come mostly from sellers in the request's category
+        sellers_by_category = {}
+        for uid, category in seller_category.items():
+            sellers_by_category.setdefault(category, []).append(uid)
+        bids = []
+        for req in requests:
+            pool = sellers_by_category.get(request_category[req["id"]]) or seller_ids
+            for seller_id in rng.sample(pool, min(len(pool), int(rng.expovariate(1 / args.bids_per_request)))):
+                bids.append({
+                    "bid_request_id": req["id"],
+                    "seller_id": seller_id,
+                    "price": float(rng.randrange(1_000, 500_000, 500)),
+                    "quantity": 1,
+                    "delivery_time": f"{rng.randint(1, 14)} days",
+                    "message": "We can do this for you.",
+                    "status": models.BidStatus.PENDING,
+                    "created_at": req["created_at"] + timedelta(minutes=rng.randint(1, 60 * 48)),
+                })
+        bulk_insert(conn, t["bids"], bids)
+        counts["bids"] = len(bids)
+
+        notifications = []
+        for uid in client_ids + seller_ids:
+            for _ in range(int(rng.expovariate(1 / args.notifications_per_user))):
+                notifications.append({
+                    "user_id": uid,
+                    "title": "New Matching Request",
+                    "message": "A buyer has posted a new request that matches your profile.",
+                    "is_read": rng.random() < 0.6,
+                    "type": "new_request",
+                    "reference_id": rng.randrange(req_start, req_start + max(1, args.requests)),
+                    "created_at": now - timedelta(minutes=rng.randint(0, 60 * 24 * 30)),
+                })
+        bulk_insert(conn, t["notifications"], notifications)
+        counts["notifications"] = len(notifications)
+
+        reset_sequences(conn, t.values())
+
+    # Materialize the sellers' lead inboxes like create_bid_request would have
+    counts["seller_leads"] = rebuild_all()
+
+    # loadgen.py logs in as these accounts
+    with open(args.manifest, "w") as f:
+        json.dump({
+            "password": BENCH_PASSWORD,
+            "clients": [f"bench{uid}@{BENCH_EMAIL_DOMAIN}" for uid in client_ids],
+            "sellers": [f"bench{uid}@{BENCH_EMAIL_DOMAIN}" for uid in seller_ids],
+            "profile_user_ids": seller_ids,
+            "categories": category_ids,
+        }, f)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-load synthetic Syncro data")
+    parser.add_argument("--users", type=int, default=1000, help="number of buyer accounts")
+    parser.add_argument("--sellers", type=int, default=250, help="number of seller accounts")
+    parser.add_argument("--requests", type=int, default=2000, help="number of bid requests")
+    parser.add_argument("--listings-per-seller", type=float, default=3.0)
+    parser.add_argument("--bids-per-request", type=float, default=4.0)
+    parser.add_argument("--notifications-per-user", type=float, default=10.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--manifest", default="bench_manifest.json", help="where to write the accounts for loadgen")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    counts = generate(args)
+    elapsed = time.perf_counter() - started
+    for table, n in counts.items():
+        print(f"{table:>14}: {n}")
+    print(f"Loaded {sum(counts.values())} rows in {elapsed:.1f}s, accounts written to {args.manifest}")
+
+
+if __name__ == "__main__":
+    main()
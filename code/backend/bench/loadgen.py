@@ -0,0 +1,313 @@
+# bench/loadgen.py
+"""
+Async load driver for the Syncro API.
+
+Replays buyer, seller and anonymous-browser scenarios against a running
+backend (seeded with bench.datagen) and writes per-endpoint latency
+percentiles and throughput as JSON, so runs can be diffed with bench.compare.
+
+    python -m bench.loadgen --base-url http://localhost:8000 --duration 60 \\
+        --concurrency 50 --sockets 100 --out results/$(git rev-parse --short HEAD).json
+
+The /chat/rfp scenario needs the backend to be started with GROQ_URL pointing
+at bench/mock_llm.py. Socket.IO clients need the `aiohttp` package.
+
+Response sizes are reported as bytes on the wire, so --accept-encoding
+identity vs. "gzip" vs. "br" shows what compression saves, and meta.client_cpu_s
+what decoding costs (the server's side is syncro_http_compression_* on /metrics).
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import subprocess
+import time
+from collections import defaultdict
+from datetime import datetime
+
+import httpx
+
+from .vocab import pick_category, request_text
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values) + 0.5) - 1))
+    return sorted_values[k]
+
+
+class Recorder:
+    """Collects latencies keyed by "METHOD /route/{template}"."""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.status_codes = defaultdict(lambda: defaultdict(int))
+        self.wire_bytes = defaultdict(int)
+
+    async def call(self, client: httpx.AsyncClient, method: str, template: str, url: str, **kwargs):
+        name = f"{method} {template}"
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.errors[name] += 1
+            self.status_codes[name]["exception"] += 1
+            return None
+        self.latencies[name].append((time.perf_counter() - started) * 1000)
+        self.status_codes[name][str(response.status_code)] += 1
+        self.wire_bytes[name] += response.num_bytes_downloaded
+        if response.status_code >= 400:
+            self.errors[name] += 1
+        return response
+
+    def summary(self, elapsed: float) -> dict:
+        endpoints = {}
+        for name in sorted(set(self.latencies) | set(self.errors)):
+            values = sorted(self.latencies[name])
+            count = len(values)
+            endpoints[name] = {
+                "count": count,
+                "errors": self.errors[name],
+                "rps": round(count / elapsed, 2) if elapsed else 0.0,
+                "mean_ms": round(sum(values) / count, 2) if count else 0.0,
+                "p50_ms": round(percentile(values, 50), 2),
+                "p95_ms": round(percentile(values, 95), 2),
+                "p99_ms": round(percentile(values, 99), 2),
+                "max_ms": round(values[-1], 2) if values else 0.0,
+                "mean_bytes": round(self.wire_bytes[name] / count) if count else 0,
+                "status_codes": dict(self.status_codes[name]),
+            }
+        all_values = sorted(v for values in self.latencies.values() for v in values)
+        total = {
+            "count": len(all_values),
+            "errors": sum(self.errors.values()),
+            "rps": round(len(all_values) / elapsed, 2) if elapsed else 0.0,
+            "p50_ms": round(percentile(all_values, 50), 2),
+            "p95_ms": round(percentile(all_values, 95), 2),
+            "p99_ms": round(percentile(all_values, 99), 2),
+            "bytes": sum(self.wire_bytes.values()),
+        }
+        return {"endpoints": endpoints, "total": total}
+
+
+# ── Scenarios ─────────────────────────────────────────────────────────────────
+# Each scenario is one "session" of a user; workers pick scenarios by weight
+# and run them back to back until the deadline.
+
+async def browse_scenario(client, rec, ctx, rng):
+    await rec.call(client, "GET", "/listings", "/listings")
+    for user_id in rng.sample(ctx["profile_user_ids"], min(3, len(ctx["profile_user_ids"]))):
+        await rec.call(client, "GET", "/profiles/{user_id}", f"/profiles/{user_id}")
+        await rec.call(client, "GET", "/reviews/user/{user_id}", f"/reviews/user/{user_id}")
+
+
+async def buyer_scenario(client, rec, ctx, rng):
+    account = rng.choice(ctx["clients"])
+    headers = account["headers"]
+    category = pick_category(rng)
+    response = await rec.call(client, "POST", "/bids/requests", "/bids/requests", headers=headers, json={
+        "description": request_text(rng, category),
+        "category_id": ctx["categories"].get(category),
+    })
+    await rec.call(client, "GET", "/bids/requests", "/bids/requests", headers=headers)
+    await rec.call(client, "GET", "/notifications/", "/notifications/", headers=headers)
+    if response is not None and response.status_code == 200:
+        request_id = response.json()["id"]
+        bids = await rec.call(client, "GET", "/bids/request/{request_id}", f"/bids/request/{request_id}", headers=headers)
+        if bids is not None and bids.status_code == 200 and bids.json():
+            bid_id = rng.choice(bids.json())["id"]
+            await rec.call(client, "PATCH", "/bids/{bid_id}/accept", f"/bids/{bid_id}/accept", headers=headers)
+        await rec.call(client, "GET", "/orders/user/{user_id}", f"/orders/user/{account['user_id']}")
+
+
+async def chatbot_scenario(client, rec, ctx, rng):
+    headers = rng.choice(ctx["clients"])["headers"]
+    conversation = []
+    for text in ("I need a service", "About 50 people next month", "Budget around 100000 in Colombo", "That's all"):
+        conversation.append({"role": "user", "content": text})
+        response = await rec.call(client, "POST", "/chat/rfp", "/chat/rfp", headers=headers,
+                                  json={"conversation": conversation})
+        if response is None or response.status_code != 200 or response.json().get("status") != "collecting":
+            break
+        conversation.append({"role": "assistant", "content": response.json()["message"]})
+
+
+async def seller_scenario(client, rec, ctx, rng):
+    headers = rng.choice(ctx["sellers"])["headers"]
+    matches = await rec.call(client, "GET", "/bids/requests/matches", "/bids/requests/matches", headers=headers)
+    if matches is not None and matches.status_code == 200 and matches.json():
+        target = rng.choice(matches.json())
+        await rec.call(client, "POST", "/bids/", "/bids/", headers=headers, json={
+            "bid_request_id": target["id"],
+            "price": float(rng.randrange(1_000, 300_000, 500)),
+            "delivery_time": f"{rng.randint(1, 10)} days",
+            "message": "Happy to help with this.",
+        })
+    await rec.call(client, "GET", "/bids/my-bids", "/bids/my-bids", headers=headers)
+    await rec.call(client, "GET", "/notifications/", "/notifications/", headers=headers)
+
+
+SCENARIOS = {
+    "browse": browse_scenario,
+    "buyer": buyer_scenario,
+    "seller": seller_scenario,
+    "chatbot": chatbot_scenario,
+}
+
+
+# ── Socket.IO clients ─────────────────────────────────────────────────────────
+
+async def run_socket_clients(base_url: str, ctx: dict, count: int, stop: asyncio.Event,
+                             serializer: str = "default") -> dict:
+    """Hold `count` identified Socket.IO connections open and count pushed events."""
+    import socketio  # the asyncio client needs aiohttp installed
+
+    stats = {"clients": count, "connected": 0, "connect_errors": 0, "connect_ms": [], "events": defaultdict(int)}
+    accounts = ctx["sellers"] + ctx["clients"]
+
+    async def one_client(i: int):
+        account = accounts[i % len(accounts)]
+        sio = socketio.AsyncClient(reconnection=False, serializer=serializer)
+
+        @sio.on("*")
+        async def on_any(event, *args):
+            stats["events"][event] += 1
+
+        started = time.perf_counter()
+        try:
+            await sio.connect(base_url, transports=["websocket"], auth={"token": account["token"]})
+        except Exception:
+            stats["connect_errors"] += 1
+            return
+        stats["connect_ms"].append((time.perf_counter() - started) * 1000)
+        stats["connected"] += 1
+        await stop.wait()
+        await sio.disconnect()
+
+    await asyncio.gather(*(one_client(i) for i in range(count)))
+    connect_ms = sorted(stats.pop("connect_ms"))
+    stats["connect_p50_ms"] = round(percentile(connect_ms, 50), 2)
+    stats["connect_p99_ms"] = round(percentile(connect_ms, 99), 2)
+    stats["events"] = dict(stats["events"])
+    return stats
+
+
+# ── Driver ────────────────────────────────────────────────────────────────────
+
+async def login_all(client: httpx.AsyncClient, emails: list, password: str, limit: int) -> list:
+    """Log in up to `limit` bench accounts before the clock starts."""
+    accounts = []
+    for email in emails[:limit]:
+        response = await client.post("/auth/login", json={"email": email, "password": password})
+        response.raise_for_status()
+        body = response.json()
+        accounts.append({
+            "user_id": body["user_id"],
+            "token": body["access_token"],
+            "headers": {"Authorization": f"Bearer {body['access_token']}"},
+        })
+    return accounts
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def run(args) -> dict:
+    with open(args.manifest) as f:
+        manifest = json.load(f)
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    headers = {"Accept-Encoding": args.accept_encoding} if args.accept_encoding else None
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits,
+                                 headers=headers) as client:
+        ctx = {
+            "clients": await login_all(client, manifest["clients"], manifest["password"], args.accounts),
+            "sellers": await login_all(client, manifest["sellers"], manifest["password"], args.accounts),
+            "profile_user_ids": manifest["profile_user_ids"],
+            "categories": manifest["categories"],
+        }
+
+        weights = {name: w for name, w in (item.split("=") for item in args.mix.split(","))}
+        names = [n for n in weights if n in SCENARIOS]
+        scenario_weights = [float(weights[n]) for n in names]
+
+        rec = Recorder()
+        stop = asyncio.Event()
+        socket_task = None
+        if args.sockets:
+            socket_task = asyncio.create_task(run_socket_clients(args.base_url, ctx, args.sockets, stop,
+                                                                 args.socket_serializer))
+
+        deadline = time.perf_counter() + args.duration
+
+        async def worker(seed: int):
+            rng = random.Random(seed)
+            while time.perf_counter() < deadline:
+                scenario = SCENARIOS[rng.choices(names, weights=scenario_weights)[0]]
+                await scenario(client, rec, ctx, rng)
+
+        started, cpu_started = time.perf_counter(), time.process_time()
+        await asyncio.gather(*(worker(args.seed + i) for i in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+        client_cpu = time.process_time() - cpu_started
+        stop.set()
+        sockets = await socket_task if socket_task else None
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "started_at": datetime.utcnow().isoformat() + "Z",
+            "base_url": args.base_url,
+            "duration_s": round(elapsed, 2),
+            "concurrency": args.concurrency,
+            "mix": args.mix,
+            "accept_encoding": args.accept_encoding or "httpx default",
+            "socket_serializer": args.socket_serializer,
+            "client_cpu_s": round(client_cpu, 2),
+            "python": platform.python_version(),
+        },
+        **rec.summary(elapsed),
+    }
+    if sockets is not None:
+        report["sockets"] = sockets
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay buyer/seller scenarios against the Syncro API")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--manifest", default="bench_manifest.json", help="accounts written by bench.datagen")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds to run")
+    parser.add_argument("--concurrency", type=int, default=20, help="concurrent virtual users")
+    parser.add_argument("--accounts", type=int, default=50, help="accounts of each role to log in")
+    parser.add_argument("--sockets", type=int, default=0, help="Socket.IO clients to hold open")
+    parser.add_argument("--mix", default="browse=4,seller=3,buyer=2,chatbot=1", help="scenario weights")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--accept-encoding", help='e.g. identity, gzip or br (default: httpx\'s "gzip, deflate")')
+    parser.add_argument("--socket-serializer", default="default", choices=("default", "msgpack"),
+                        help="must match the server's SOCKETIO_SERIALIZER")
+    parser.add_argument("--out", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    output = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(output)
+        print(f"Wrote {args.out}: {report['total']['count']} requests, "
+              f"{report['total']['rps']} req/s, p99 {report['total']['p99_ms']} ms")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# bench/mock_llm.py
+"""
+A stand-in for the Groq chat completions API.
+
+Load tests must not hit the real LLM (slow, rate limited, costs money), so run
+this next to the backend and point ai_service at it:
+
+    uvicorn bench.mock_llm:app --port 9000
+    GROQ_URL=http://localhost:9000/openai/v1/chat/completions uvicorn app.main:app
+
+It asks a follow-up question until the conversation has MOCK_LLM_TURNS user
+messages, then answers with a READY:{...} payload like the real model does.
+MOCK_LLM_LATENCY_MS adds a fixed delay to mimic model latency.
+"""
+import asyncio
+import json
+import os
+import random
+
+from fastapi import FastAPI, Request
+
+from .vocab import CATEGORY_VOCAB, TOWNS, keywords
+
+TURNS = int(os.getenv("MOCK_LLM_TURNS", "3"))
+LATENCY_MS = float(os.getenv("MOCK_LLM_LATENCY_MS", "300"))
+
+app = FastAPI(title="Mock Groq")
+rng = random.Random()
+
+
+def _completion(content: str) -> dict:
+    return {
+        "id": "mock",
+        "object": "chat.completion",
+        "model": "mock-llm",
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+    }
+
+
+@app.post("/openai/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    if LATENCY_MS:
+        await asyncio.sleep(LATENCY_MS / 1000)
+
+    user_turns = sum(1 for m in body.get("messages", []) if m.get("role") == "user")
+    if user_turns < TURNS:
+        return _completion("Thanks! How many people or units do you need, and what is your budget in LKR?")
+
+    category = rng.choice(list(CATEGORY_VOCAB))
+    order = {
+        "category": category,
+        "description": " ".join(keywords(rng, category, 5)),
+        "quantity": str(rng.choice([1, 5, 10, 50, 100])),
+        "budget": str(rng.randrange(5_000, 300_000, 500)),
+        "event_date": "2026-12-20",
+        "location": rng.choice(TOWNS),
+    }
+    return _completion("READY:" + json.dumps(order))
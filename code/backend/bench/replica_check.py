@@ -0,0 +1,77 @@
+# bench/replica_check.py
+"""
+Check read-replica routing and the read-your-writes pin (app/core/read_routing.py).
+
+Start the backend with two databases, where the "replica" is a stale copy of
+the primary (no replication, so it lags forever):
+
+    cp /tmp/syncro.db /tmp/syncro_replica.db
+    DATABASE_URL=sqlite:////tmp/syncro.db DATABASE_READ_URL=sqlite:////tmp/syncro_replica.db \\
+        READ_YOUR_WRITES_S=3 uvicorn app.main:app --port 8000
+
+    python -m bench.replica_check --pin-seconds 3
+
+A buyer places an order and rereads their order history right away (must
+come from the primary and include the order), then rereads it once the pin
+has expired (must come from the replica, i.e. the stale copy without it).
+Order history is not behind the response cache, so every read hits a
+database; which one is read from the Server-Timing header. Exits 1 on a
+failed check.
+"""
+import argparse
+import json
+import sys
+import time
+
+import httpx
+
+
+def served_by(response: httpx.Response) -> str:
+    return "replica" if "replica;" in response.headers.get("server-timing", "") else "primary"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check read-replica routing and read-your-writes pinning")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--manifest", default="bench_manifest.json", help="accounts written by bench.datagen")
+    parser.add_argument("--pin-seconds", type=float, default=5.0, help="READ_YOUR_WRITES_S of the server")
+    args = parser.parse_args()
+
+    with open(args.manifest) as f:
+        manifest = json.load(f)
+    with httpx.Client(base_url=args.base_url, timeout=10) as client:
+        buyer = client.post("/auth/login", json={"email": manifest["clients"][0], "password": manifest["password"]})
+        seller = client.post("/auth/login", json={"email": manifest["sellers"][0], "password": manifest["password"]})
+        buyer.raise_for_status()
+        seller.raise_for_status()
+        buyer_id = buyer.json()["user_id"]
+        headers = {"Authorization": f"Bearer {buyer.json()['access_token']}"}
+
+        before = client.get(f"/orders/user/{buyer_id}", headers=headers)
+        order = client.post("/orders/", headers=headers, json={
+            "service_name": "Replica check", "amount": 1000, "seller_id": seller.json()["user_id"]})
+        order.raise_for_status()
+        order_id = order.json()["id"]
+
+        pinned = client.get(f"/orders/user/{buyer_id}", headers=headers)
+        time.sleep(args.pin_seconds + 1)
+        unpinned = client.get(f"/orders/user/{buyer_id}", headers=headers)
+
+    def has_order(response):
+        return any(o["id"] == order_id for o in response.json())
+
+    checks = {
+        "first_read_served_by": served_by(before),
+        "read_after_write_served_by": served_by(pinned),
+        "read_after_write_sees_write": has_order(pinned),
+        "read_after_pin_served_by": served_by(unpinned),
+        "read_after_pin_sees_write": has_order(unpinned),
+    }
+    print(json.dumps(checks, indent=2))
+    ok = (checks["read_after_write_served_by"] == "primary" and checks["read_after_write_sees_write"]
+          and checks["read_after_pin_served_by"] == "replica")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
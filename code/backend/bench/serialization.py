@@ -0,0 +1,121 @@
+# bench/serialization.py
+"""
+Micro-benchmark for list endpoint serialization.
+
+Compares, per endpoint shape, the old path (ORM objects -> Pydantic
+from_attributes -> stdlib json) with the lean path in app/utils/serialization.py
+(Core rows of the needed columns -> orjson). Reports CPU time per item and
+peak Python memory (tracemalloc) for each.
+
+    python -m bench.serialization --rows 20000
+    python -m bench.serialization --rows 20000 --database-url postgresql://...
+"""
+import argparse
+import json
+import os
+import time
+import tracemalloc
+from datetime import datetime
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")  # app.database insists on a URL
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import create_engine, delete
+from sqlalchemy.orm import sessionmaker
+
+from app.api.notifications import NotificationResponse
+from app.models import models
+from app.schemas.schemas import BidResponse, ListingResponse, OrderResponse
+from app.utils.serialization import dumps, select_rows
+
+CASES = [
+    ("listings", models.Listing, ListingResponse),
+    ("orders", models.Order, OrderResponse),
+    ("bids", models.Bid, BidResponse),
+    ("notifications", models.Notification, NotificationResponse),
+]
+
+
+def seed(session, rows: int):
+    now = datetime.utcnow()
+    for _, model, _ in CASES:
+        session.execute(delete(model))
+    session.execute(models.Listing.__table__.insert(), [
+        {"title": f"Listing {i}", "description": "wedding buffet catering " * 8, "price": 1500.0 + i,
+         "delivery_time": "3 days", "seller_id": 1, "category_id": 1, "image_url": "https://ik.imagekit.io/x.png"}
+        for i in range(rows)])
+    session.execute(models.Order.__table__.insert(), [
+        {"service_name": "Custom Order: Catering", "status": models.OrderStatus.PENDING, "amount": 25000.0,
+         "has_review": False, "created_at": now, "buyer_id": 1, "seller_id": 2}
+        for _ in range(rows)])
+    session.execute(models.Bid.__table__.insert(), [
+        {"bid_request_id": 1, "seller_id": 2, "price": 20000.0, "quantity": 1, "delivery_time": "2 days",
+         "message": "We can do this", "status": models.BidStatus.PENDING, "created_at": now}
+        for _ in range(rows)])
+    session.execute(models.Notification.__table__.insert(), [
+        {"user_id": 1, "title": "New Proposal Received", "message": "Someone submitted a proposal.",
+         "is_read": False, "type": "new_bid", "reference_id": 1, "created_at": now}
+        for _ in range(rows)])
+    session.commit()
+
+
+def orm_path(session, model, schema) -> bytes:
+    objects = session.query(model).all()
+    # What FastAPI does with response_model + JSONResponse
+    data = jsonable_encoder([schema.model_validate(o) for o in objects])
+    body = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    session.expunge_all()
+    return body
+
+
+def lean_path(session, model, schema) -> bytes:
+    return dumps(select_rows(session, model, schema))
+
+
+def measure(fn, session, model, schema, rows: int, repeat: int) -> dict:
+    fn(session, model, schema)  # warm up (statement cache, imports)
+    cpu = []
+    for _ in range(repeat):
+        started = time.process_time()
+        fn(session, model, schema)
+        cpu.append(time.process_time() - started)
+    tracemalloc.start()
+    body = fn(session, model, schema)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    best = min(cpu)
+    return {
+        "cpu_ms": round(best * 1000, 2),
+        "cpu_us_per_item": round(best / rows * 1e6, 2),
+        "peak_mb": round(peak / 1e6, 2),
+        "body_bytes": len(body),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ORM+Pydantic vs Core rows+orjson serialization")
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--database-url", default="sqlite://",
+                        help="scratch database; tables are created and their rows replaced")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    models.Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    seed(session, args.rows)
+
+    report = {"rows": args.rows, "results": {}}
+    for name, model, schema in CASES:
+        before = measure(orm_path, session, model, schema, args.rows, args.repeat)
+        after = measure(lean_path, session, model, schema, args.rows, args.repeat)
+        report["results"][name] = {
+            "orm_pydantic_json": before,
+            "core_rows_orjson": after,
+            "cpu_speedup": round(before["cpu_ms"] / after["cpu_ms"], 2) if after["cpu_ms"] else None,
+        }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
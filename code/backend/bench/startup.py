@@ -0,0 +1,161 @@
+# bench/startup.py
+"""
+Startup benchmark for the gunicorn server profile (gunicorn_conf.py).
+
+For each profile it starts `gunicorn -c gunicorn_conf.py app.main:app` on a
+free port, and measures:
+
+- cold start: seconds until every worker logged "Application startup
+  complete", and until the first GET / answered;
+- memory per process from /proc/<pid>/smaps_rollup (Linux): RSS, PSS (RSS
+  with shared pages split between the processes sharing them) and private
+  memory, right after startup and again after --warm requests.
+
+Profiles:
+  legacy      no preload, asyncio + h11, no recycling (the old startup.sh)
+  preload     preload + gc.freeze, asyncio + h11
+  production  preload, uvloop + httptools when installed, recycling
+
+    python -m bench.startup --workers 4
+    python -m bench.startup --workers 4 --profile legacy --profile production --warm 2000
+
+Uses the DATABASE_URL from the environment (create_all runs against it).
+"""
+import argparse
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import httpx
+
+PROFILES = {
+    "legacy": {"PRELOAD_APP": "0", "UVICORN_LOOP": "asyncio", "UVICORN_HTTP": "h11", "MAX_REQUESTS": "0"},
+    "preload": {"PRELOAD_APP": "1", "UVICORN_LOOP": "asyncio", "UVICORN_HTTP": "h11", "MAX_REQUESTS": "0"},
+    "production": {"PRELOAD_APP": "1", "UVICORN_LOOP": "auto", "UVICORN_HTTP": "auto"},
+}
+READY_LINE = "Application startup complete"
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def children(pid: int) -> list:
+    found = []
+    for entry in os.listdir("/proc"):
+        if entry.isdigit():
+            try:
+                with open(f"/proc/{entry}/stat") as f:
+                    if int(f.read().rsplit(")", 1)[1].split()[1]) == pid:
+                        found.append(int(entry))
+            except (OSError, IndexError, ValueError):
+                continue
+    return found
+
+
+def memory(pid: int) -> dict:
+    """RSS / PSS / private memory of one process in MB."""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1])
+    private = fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0)
+    return {"rss_mb": round(fields.get("Rss", 0) / 1024, 1), "pss_mb": round(fields.get("Pss", 0) / 1024, 1),
+            "private_mb": round(private / 1024, 1)}
+
+
+def snapshot(master: int) -> dict:
+    workers = [memory(pid) for pid in children(master)]
+    n = len(workers) or 1
+    return {
+        "master": memory(master),
+        "workers": len(workers),
+        "worker_avg": {key: round(sum(w[key] for w in workers) / n, 1) for key in ("rss_mb", "pss_mb", "private_mb")},
+        "total_pss_mb": round(memory(master)["pss_mb"] + sum(w["pss_mb"] for w in workers), 1),
+    }
+
+
+def run_profile(name: str, args) -> dict:
+    port = free_port()
+    env = dict(os.environ, **PROFILES[name], WEB_CONCURRENCY=str(args.workers),
+               GUNICORN_BIND=f"127.0.0.1:{port}", BID_REQUEST_JOB_INTERVAL_S="0")
+    started = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "-m", "gunicorn", "-c", "gunicorn_conf.py", "app.main:app"],
+                            env=env, stderr=subprocess.PIPE, stdout=subprocess.DEVNULL, text=True)
+    ready = []
+    log = []
+
+    def read_log():
+        for line in proc.stderr:
+            log.append(line)
+            if READY_LINE in line:
+                ready.append(time.perf_counter() - started)
+
+    threading.Thread(target=read_log, daemon=True).start()
+    base_url = f"http://127.0.0.1:{port}"
+    first_response = None
+    try:
+        deadline = started + args.timeout
+        while time.perf_counter() < deadline and (len(ready) < args.workers or first_response is None):
+            if proc.poll() is not None:
+                raise RuntimeError(f"gunicorn exited early:\n{''.join(log[-20:])}")
+            if first_response is None:
+                try:
+                    if httpx.get(base_url + "/", timeout=1).status_code == 200:
+                        first_response = time.perf_counter() - started
+                except httpx.HTTPError:
+                    pass
+            time.sleep(0.02)
+        if len(ready) < args.workers:
+            raise RuntimeError(f"only {len(ready)}/{args.workers} workers ready after {args.timeout}s")
+
+        time.sleep(0.5)  # let the workers settle before measuring
+        report = {
+            "profile": PROFILES[name],
+            "all_workers_ready_s": round(ready[-1], 2),
+            "first_worker_ready_s": round(ready[0], 2),
+            "first_response_s": round(first_response, 2),
+            "after_startup": snapshot(proc.pid),
+        }
+        if args.warm:
+            with httpx.Client(base_url=base_url, timeout=10) as client:
+                for i in range(args.warm):
+                    client.get(args.paths[i % len(args.paths)])
+            report["after_warm"] = snapshot(proc.pid)
+        return report
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        try:
+            proc.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold start time and memory per worker for gunicorn profiles")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--profile", action="append", choices=sorted(PROFILES),
+                        help="profile to run (repeatable, default: all)")
+    parser.add_argument("--warm", type=int, default=500, help="GET requests to send before the second snapshot")
+    parser.add_argument("--paths", default="/,/listings/,/metrics", help="comma-separated paths for --warm")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+    args.paths = args.paths.split(",")
+
+    report = {"workers": args.workers, "results": {}}
+    for name in args.profile or list(PROFILES):
+        report["results"][name] = run_profile(name, args)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
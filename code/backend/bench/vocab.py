@@ -0,0 +1,64 @@
+# bench/vocab.py
+"""
+Word lists and samplers shared by the data generator and the load driver.
+
+Keywords are drawn from per-category vocabularies with a Zipf-like skew, so a
+few words ("wedding", "buffet") are very common and the long tail is rare.
+"""
+import random
+from datetime import datetime, timedelta
+
+# Category -> vocabulary, most common words first
+CATEGORY_VOCAB = {
+    "Catering": ["food", "buffet", "wedding", "lunch", "dinner", "rice", "curry", "party", "snacks", "biryani", "dessert", "kottu", "halal", "vegetarian"],
+    "Photography": ["photos", "wedding", "camera", "shoot", "album", "video", "drone", "portrait", "event", "editing", "prints", "studio"],
+    "Tutoring": ["maths", "science", "lessons", "exam", "english", "physics", "chemistry", "tuition", "grade", "online", "biology", "ict"],
+    "Cleaning": ["house", "office", "deep", "carpet", "sofa", "windows", "kitchen", "bathroom", "weekly", "moving", "garden", "pressure"],
+    "Repair": ["phone", "laptop", "fridge", "washing", "machine", "screen", "plumbing", "electrical", "ac", "roof", "tv", "motor"],
+    "Delivery": ["parcel", "documents", "same", "day", "courier", "groceries", "furniture", "bike", "van", "island", "wide", "express"],
+    "Event Decoration": ["wedding", "flowers", "stage", "lighting", "poruwa", "birthday", "balloons", "tables", "chairs", "tent", "backdrop", "party"],
+    "Transport": ["van", "bus", "airport", "hire", "driver", "trip", "tour", "wedding", "car", "pickup", "daily", "school"],
+    "Printing": ["banners", "cards", "flyers", "invitations", "wedding", "tshirts", "stickers", "posters", "business", "brochures", "mugs", "labels"],
+    "Web Design": ["website", "online", "shop", "ecommerce", "logo", "hosting", "app", "seo", "wordpress", "landing", "page", "branding"],
+    "Tailoring": ["saree", "blouse", "suit", "wedding", "uniforms", "alterations", "dress", "shirts", "school", "stitching", "curtains", "kids"],
+    "Beauty": ["bridal", "makeup", "hair", "salon", "dressing", "wedding", "nails", "facial", "mehendi", "party", "spa", "bride"],
+}
+
+TOWNS = ["Colombo", "Kandy", "Galle", "Jaffna", "Negombo", "Kurunegala", "Matara", "Anuradhapura",
+         "Batticaloa", "Trincomalee", "Ratnapura", "Badulla", "Nuwara Eliya", "Gampaha", "Kalutara"]
+
+FIRST_NAMES = ["Nimal", "Kamal", "Sunil", "Ayesha", "Dilani", "Tharindu", "Nadeesha", "Ruwan", "Priya",
+               "Fathima", "Kavindu", "Sanduni", "Mohamed", "Kasun", "Ishara", "Janaka", "Shalini", "Arjun"]
+LAST_NAMES = ["Perera", "Fernando", "Silva", "Jayasinghe", "Bandara", "Rajapaksa", "Wickramasinghe",
+              "Kumar", "Dissanayake", "Herath", "Gunawardena", "Rathnayake", "Nazeer", "Sivakumar"]
+
+FILLER = ["need", "looking", "for", "a", "good", "reliable", "service", "please", "quote", "around", "urgent", "next", "week"]
+
+
+def zipf_weights(n: int, s: float = 1.1) -> list:
+    return [1.0 / (rank ** s) for rank in range(1, n + 1)]
+
+
+CATEGORY_NAMES = list(CATEGORY_VOCAB)
+CATEGORY_WEIGHTS = zipf_weights(len(CATEGORY_NAMES), 0.8)
+VOCAB_WEIGHTS = {name: zipf_weights(len(words)) for name, words in CATEGORY_VOCAB.items()}
+
+
+def pick_category(rng: random.Random) -> str:
+    return rng.choices(CATEGORY_NAMES, weights=CATEGORY_WEIGHTS)[0]
+
+
+def keywords(rng: random.Random, category: str, k: int) -> list:
+    return rng.choices(CATEGORY_VOCAB[category], weights=VOCAB_WEIGHTS[category], k=k)
+
+
+def request_text(rng: random.Random, category: str) -> str:
+    words = keywords(rng, category, rng.randint(3, 7)) + rng.sample(FILLER, 3)
+    rng.shuffle(words)
+    return (
+        f"{' '.join(words)}\n\n"
+        f"Quantity: {rng.choice([1, 2, 5, 10, 25, 50, 100, 250])}\n"
+        f"Budget: LKR {rng.randrange(5_000, 500_000, 500)}\n"
+        f"Date needed: {(datetime.utcnow() + timedelta(days=rng.randint(1, 90))).date()}\n"
+        f"Location: {rng.choice(TOWNS)}"
+    )
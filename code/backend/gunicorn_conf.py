@@ -0,0 +1,121 @@
+# gunicorn_conf.py
+"""
+Production server profile, used by startup.sh and the Dockerfile:
+
+    gunicorn -c gunicorn_conf.py app.main:app
+
+- Worker count is derived from the CPUs and memory the container actually
+  gets (cgroup limits included), unless WEB_CONCURRENCY is set.
+- The app is imported once in the master (PRELOAD_APP=1) and the workers are
+  forked from it, so module memory (FastAPI, SQLAlchemy models, Socket.IO,
+  ImageKit SDK) is shared copy-on-write and create_all() runs once per deploy
+  instead of once per worker.
+- Workers are recycled after MAX_REQUESTS requests, with jitter so they don't
+  all restart at once. Socket.IO clients on a recycled worker reconnect and
+  `resume` their notifications.
+- The event loop / HTTP parser are picked in app/core/workers.py
+  (UVICORN_LOOP, UVICORN_HTTP).
+
+Measure the effect with `python -m bench.startup` (cold start + memory per worker).
+"""
+import gc
+import os
+import sys
+
+WORKERS_PER_CORE = float(os.getenv("WORKERS_PER_CORE", "2"))
+MAX_WORKERS = int(os.getenv("MAX_WORKERS", "16"))
+WORKER_MEMORY_MB = int(os.getenv("WORKER_MEMORY_MB", "160"))   # expected RSS of one warm worker
+MASTER_MEMORY_MB = int(os.getenv("MASTER_MEMORY_MB", "120"))   # master + headroom, kept free
+
+
+def _read(path: str):
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def cpu_count() -> float:
+    """CPUs available to this process: affinity mask, capped by a cgroup CPU quota."""
+    try:
+        cpus = float(len(os.sched_getaffinity(0)))
+    except AttributeError:
+        cpus = float(os.cpu_count() or 1)
+    quota = _read("/sys/fs/cgroup/cpu.max")                     # cgroup v2: "<quota> <period>" or "max <period>"
+    if quota and not quota.startswith("max"):
+        limit, period = quota.split()
+        cpus = min(cpus, int(limit) / int(period))
+    else:
+        limit, period = _read("/sys/fs/cgroup/cpu/cpu.cfs_quota_us"), _read("/sys/fs/cgroup/cpu/cpu.cfs_period_us")
+        if limit and period and int(limit) > 0:
+            cpus = min(cpus, int(limit) / int(period))
+    return max(cpus, 1.0)
+
+
+def memory_mb():
+    """Memory available to this container in MB (cgroup limit or MemAvailable), None if unknown."""
+    candidates = []
+    for path in ("/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory/memory.limit_in_bytes"):
+        value = _read(path)
+        if value and value.isdigit() and int(value) < 1 << 60:
+            candidates.append(int(value) // (1024 * 1024))
+    meminfo = _read("/proc/meminfo")
+    if meminfo:
+        for line in meminfo.splitlines():
+            if line.startswith("MemAvailable:"):
+                candidates.append(int(line.split()[1]) // 1024)
+    return min(candidates) if candidates else None
+
+
+def worker_count() -> int:
+    if os.getenv("WEB_CONCURRENCY"):
+        return max(int(os.getenv("WEB_CONCURRENCY")), 1)
+    workers = int(cpu_count() * WORKERS_PER_CORE) + 1
+    memory = memory_mb()
+    if memory is not None:
+        workers = min(workers, (memory - MASTER_MEMORY_MB) // WORKER_MEMORY_MB)
+    return max(1, min(workers, MAX_WORKERS))
+
+
+# ── Server ────────────────────────────────────────────────────────────────────
+
+bind = os.getenv("GUNICORN_BIND", f"0.0.0.0:{os.getenv('PORT', '8000')}")
+workers = worker_count()
+worker_class = "app.core.workers.SyncroWorker"
+preload_app = os.getenv("PRELOAD_APP", "1") == "1"
+
+# Recycling: 0 disables it
+max_requests = int(os.getenv("MAX_REQUESTS", "2000"))
+max_requests_jitter = int(os.getenv("MAX_REQUESTS_JITTER", str(max_requests // 10)))
+
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+
+accesslog = os.getenv("GUNICORN_ACCESS_LOG") or None
+errorlog = "-"
+loglevel = os.getenv("GUNICORN_LOG_LEVEL", "info")
+
+
+# ── Hooks ─────────────────────────────────────────────────────────────────────
+
+def when_ready(server):
+    server.log.info(
+        f"Syncro: {workers} workers ({cpu_count():g} CPUs, {memory_mb()} MB), preload={preload_app}, "
+        f"max_requests={max_requests}±{max_requests_jitter}, "
+        f"loop={os.getenv('UVICORN_LOOP', 'auto')}, http={os.getenv('UVICORN_HTTP', 'auto')}")
+    if preload_app:
+        # Move everything the import created into the permanent generation, so
+        # the workers' garbage collector doesn't touch (and un-share) those pages.
+        gc.collect()
+        gc.freeze()
+
+
+def post_fork(server, worker):
+    # The master opened database connections while preloading (create_all);
+    # a forked worker must not reuse those sockets, so start with a fresh pool.
+    database = sys.modules.get("app.database")
+    if database is not None:
+        database.engine.dispose(close=False)
+        database.read_engine.dispose(close=False)
@@ -1 +1 @@
-gunicorn --bind=0.0.0.0:8000 --workers=4 --worker-class=uvicorn.workers.UvicornWorker app.main:app
+gunicorn -c gunicorn_conf.py app.main:app
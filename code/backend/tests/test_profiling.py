@@ -0,0 +1,36 @@
+from sqlalchemy import Column, Integer, MetaData, Table, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.core.profiling import normalize_statement
+
+bids = Table("bids", MetaData(), Column("id", Integer), Column("seller_id", Integer))
+
+
+def compiled(dialect, ids):
+    """The statement text the DBAPI receives for `id IN (ids)` (expanding IN rendered out)."""
+    stmt = select(bids.c.id).where(bids.c.seller_id == 7, bids.c.id.in_(ids))
+    return str(stmt.compile(dialect=dialect, compile_kwargs={"render_postcompile": True}))
+
+
+def test_psycopg2_in_lists_of_any_length_normalize_alike():
+    short, long = compiled(postgresql.psycopg2.dialect(), [1, 2]), compiled(postgresql.psycopg2.dialect(), [1, 2, 3, 4])
+    assert "%(id_1_1)s" in short
+    assert normalize_statement(short) == normalize_statement(long)
+    assert "IN (?)" in normalize_statement(short)
+
+
+def test_sqlite_in_lists_of_any_length_normalize_alike():
+    short, long = compiled(sqlite.dialect(), [1]), compiled(sqlite.dialect(), [1, 2, 3])
+    assert normalize_statement(short) == normalize_statement(long)
+
+
+def test_format_and_named_placeholders():
+    assert normalize_statement("SELECT * FROM bids WHERE id IN (%s, %s, %s)") == \
+        normalize_statement("SELECT * FROM bids WHERE id IN (%s)")
+    assert normalize_statement("SELECT * FROM bids WHERE id IN (:id_1, :id_2)") == \
+        "SELECT * FROM bids WHERE id IN (?)"
+
+
+def test_literals_are_collapsed():
+    assert normalize_statement("SELECT * FROM bids WHERE id = 12 AND status = 'PENDING'") == \
+        "SELECT * FROM bids WHERE id = ? AND status = ?"
@@ -0,0 +1,81 @@
+from datetime import date
+
+import pytest
+
+from app.utils.rfp_fields import (normalize_location, parse_budget, parse_description, parse_event_date,
+                                  parse_quantity)
+
+TODAY = date(2026, 10, 19)  # a Monday
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("50 people", 50),
+    ("about 10", 10),
+    (12, 12),
+    ("1,200", 1200),
+    ("a dozen", 12),
+    ("two dozen", 24),
+    ("twenty five", 25),
+    ("twenty-five guests", 25),
+    ("one hundred", 100),
+    ("one hundred and fifty", 150),
+    ("three thousand five hundred", 3500),
+    ("two or three", 2),
+    ("a lot", None),
+    ("n/a", None),
+    (0, None),
+    ("5000000", None),
+])
+def test_parse_quantity(value, expected):
+    assert parse_quantity(value) == expected
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("LKR 25,000", 25000),
+    ("Rs. 1.5 lakh", 150000),
+    ("30k", 30000),
+    ("20000-25000", 25000),
+    (4500, 4500),
+    ("flexible", None),
+    ("free", None),
+])
+def test_parse_budget(value, expected):
+    assert parse_budget(value) == expected
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("2026-12-20", date(2026, 12, 20)),
+    ("20/12/2026", date(2026, 12, 20)),
+    ("20th December 2026", date(2026, 12, 20)),
+    ("20th December", date(2026, 12, 20)),
+    ("5 March", date(2027, 3, 5)),  # already past this year
+    ("tomorrow", date(2026, 10, 20)),
+    ("next friday", date(2026, 10, 23)),
+    ("monday", date(2026, 10, 26)),
+    ("21 December 2026 - 23 December 2026", date(2026, 12, 21)),
+    ("sometime soon", None),
+])
+def test_parse_event_date(value, expected):
+    assert parse_event_date(value, today=TODAY) == expected
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("  colombo 07 , Sri Lanka", "Colombo 07"),
+    ("kandy,sri lanka.", "Kandy"),
+    ("Galle", "Galle"),
+    ("unknown", None),
+])
+def test_normalize_location(value, expected):
+    assert normalize_location(value) == expected
+
+
+def test_parse_description_reads_the_flattened_lines():
+    description = ("Wedding photography\nQuantity: twenty five\nBudget: LKR 80,000\n"
+                   "Date needed: 20th December\nLocation: colombo 07, Sri Lanka")
+    assert parse_description(description, today=TODAY) == {
+        "quantity": 25, "budget": 80000, "event_date": date(2026, 12, 20), "location": "Colombo 07"}
+
+
+def test_parse_description_without_fields():
+    assert parse_description("just a plain request", today=TODAY) == {
+        "quantity": None, "budget": None, "event_date": None, "location": None}
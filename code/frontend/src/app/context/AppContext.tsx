@@ -1,4 +1,4 @@
-import React, { createContext, useContext, useState, useEffect } from 'react';
+import React, { createContext, useContext, useState, useEffect, useRef } from 'react';
 import { authApi } from '../services/api';
 import { io, Socket } from 'socket.io-client';
 import { toast } from 'sonner';
@@ -76,6 +76,7 @@ interface AppContextType {
   setIsChatOpen: (open: boolean) => void;
   notifications: any[];
   markNotificationRead: (id: number) => Promise<void>;
+  socket: Socket | null;
 }
 
 const AppContext = createContext<AppContextType | undefined>(undefined);
@@ -147,6 +148,9 @@ export function AppProvider({ children }: { children: React.ReactNode }) {
 
   const [isChatOpen, setIsChatOpen] = useState(false);
   const [notifications, setNotifications] = useState<any[]>([]);
+  // Highest notification id we've seen; sent on reconnect so the server replays only newer ones
+  const lastNotificationId = useRef(0);
+  const [socket, setSocket] = useState<Socket | null>(null);
 
   const isAuthenticated = authUser !== null;
 
@@ -265,6 +269,7 @@ export function AppProvider({ children }: { children: React.ReactNode }) {
         const { notificationsApi } = await import('../services/api');
         const data = await notificationsApi.getAll();
         setNotifications(data);
+        lastNotificationId.current = Math.max(lastNotificationId.current, ...data.map((n: any) => n.id));
         
         // Show toasts for missed notifications
         const unread = data.filter((n: any) => !n.is_read);
@@ -280,13 +285,44 @@ export function AppProvider({ children }: { children: React.ReactNode }) {
     };
     fetchNotifs();
 
-    const socket: Socket = io(import.meta.env.VITE_API_URL || 'http://localhost:8000');
-    
+    // The server verifies the JWT during the handshake and puts the socket in our user room
+    const socket: Socket = io(import.meta.env.VITE_API_URL || 'http://localhost:8000', {
+      auth: { token: authUser.token },
+    });
+
+    setSocket(socket);
+
     socket.on('connect', () => {
-      socket.emit('identify', { userId: authUser.userId });
+      // On a reconnect, ask only for what we missed instead of refetching the whole list
+      if (lastNotificationId.current > 0) {
+        socket.emit('resume', { lastNotificationId: lastNotificationId.current });
+      }
+    });
+
+    socket.on('notifications_replay', (data) => {
+      if (data.truncated) {
+        fetchNotifs();
+        return;
+      }
+      const missed = data.notifications || [];
+      if (!missed.length) return;
+      lastNotificationId.current = Math.max(lastNotificationId.current, ...missed.map((n: any) => n.id));
+      setNotifications(prev => {
+        const known = new Set(prev.map((n: any) => n.id));
+        const fresh = missed.filter((n: any) => !known.has(n.id)).reverse().map((n: any) => ({
+          id: n.id,
+          title: n.title,
+          message: n.text,
+          is_read: !n.unread,
+          created_at: n.created_at
+        }));
+        return [...fresh, ...prev];
+      });
     });
 
-    socket.on('new_notification', (data) => {
+    const onNotification = (data: any) => {
+      if (data.id <= lastNotificationId.current) return;
+      lastNotificationId.current = data.id;
       toast.success(data.title, {
         description: data.text,
         duration: 5000,
@@ -298,10 +334,48 @@ export function AppProvider({ children }: { children: React.ReactNode }) {
         is_read: false, 
         created_at: new Date().toISOString()
       }, ...prev]);
-    });
+    };
+
+    // VITE_NOTIFICATIONS_TRANSPORT=sse: notifications come over GET /notifications/stream instead,
+    // for users behind proxies that drop WebSocket upgrades (the socket still carries chat and bids)
+    let closeStream: (() => void) | null = null;
+    let closed = false;
+    if (import.meta.env.VITE_NOTIFICATIONS_TRANSPORT === 'sse') {
+      import('../services/api').then(({ notificationsApi }) => {
+        if (closed) return;
+        closeStream = notificationsApi.stream(authUser.token, lastNotificationId.current, onNotification, fetchNotifs);
+      });
+    } else {
+      socket.on('new_notification', onNotification);
+
+      // Several notifications that arrived within a short window, sent as one event
+      socket.on('new_notifications', (data) => {
+        const batch = (data.notifications || []).filter((n: any) => n.id > lastNotificationId.current);
+        if (!batch.length) return;
+        lastNotificationId.current = Math.max(lastNotificationId.current, ...batch.map((n: any) => n.id));
+        toast.success(batch.length === 1 ? batch[0].title : `${batch.length} new notifications`, {
+          description: batch[0].text,
+          duration: 5000,
+        });
+        const now = new Date().toISOString();
+        setNotifications(prev => [
+          ...batch.slice().reverse().map((n: any) => ({
+            id: n.id,
+            title: n.title,
+            message: n.text,
+            is_read: false,
+            created_at: now
+          })),
+          ...prev
+        ]);
+      });
+    }
 
     return () => {
       socket.disconnect();
+      closed = true;
+      closeStream?.();
+      setSocket(null);
     };
   }, [authUser]);
 
@@ -362,6 +436,7 @@ export function AppProvider({ children }: { children: React.ReactNode }) {
       setIsChatOpen,
       notifications,
       markNotificationRead,
+      socket,
     }}>
       {children}
     </AppContext.Provider>
@@ -21,6 +21,9 @@ import { toast } from 'sonner';
 
 
 
+// Re-subscribe (fresh snapshot) this often, in case deltas from other servers never reach us
+const RESYNC_MS = 30000;
+
 const fadeInUp = {
     initial: { opacity: 0, y: 20 },
     animate: { opacity: 1, y: 0 },
@@ -33,7 +36,7 @@ const fadeInUp = {
 
 export function BidDetail() {
     const { id } = useParams();
-    const { role } = useApp();
+    const { role, socket } = useApp();
     const [acceptedBidId, setAcceptedBidId] = useState<number | null>(null);
     const [bidAmount, setBidAmount] = useState('');
     const [deliveryTime, setDeliveryTime] = useState('');
@@ -46,13 +49,52 @@ export function BidDetail() {
     useEffect(() => {
         if (!id) return;
         bidsApi.getRequestById(Number(id)).then(setRequest).catch(console.error);
-        if (role === 'buyer') {
-            bidsApi.getBidsForRequest(Number(id)).then(setBids).catch(console.error);
-        } else if (role === 'seller') {
+        if (role === 'seller') {
             bidsApi.getMyBids().then(setMyBids).catch(console.error);
         }
     }, [id, role]);
 
+    // Buyers get a live feed: one snapshot on subscribe, then seq-numbered deltas
+    useEffect(() => {
+        if (!id || role !== 'buyer' || !socket) return;
+        const requestId = Number(id);
+        let seq = -1;
+
+        const subscribe = () => {
+            socket.emit('subscribe_bids', { requestId }, (snap: any) => {
+                if (!snap || snap.error) return;
+                seq = snap.seq;
+                setBids(snap.bids);
+            });
+        };
+
+        const onDelta = (delta: any) => {
+            if (delta.request_id !== requestId || seq < 0 || delta.seq <= seq) return;
+            if (delta.seq !== seq + 1) {
+                // Missed an update (e.g. it was sent by another server) - resync
+                subscribe();
+                return;
+            }
+            seq = delta.seq;
+            setBids(prev => prev.some(b => b.id === delta.bid.id)
+                ? prev.map(b => b.id === delta.bid.id ? delta.bid : b)
+                : [...prev, delta.bid]);
+        };
+
+        if (socket.connected) subscribe();
+        socket.on('connect', subscribe);
+        socket.on('bid_delta', onDelta);
+        const resync = setInterval(() => {
+            if (socket.connected) subscribe();
+        }, RESYNC_MS);
+        return () => {
+            clearInterval(resync);
+            socket.emit('unsubscribe_bids', { requestId });
+            socket.off('connect', subscribe);
+            socket.off('bid_delta', onDelta);
+        };
+    }, [id, role, socket]);
+
     const hasPlacedActiveBid = myBids.some(b => b.bid_request_id === Number(id) && b.status.toLowerCase() !== 'rejected');
 
     const handleAccept = async (bidId: number) => {
@@ -44,10 +44,47 @@ export interface Profile {
     address?: string;
     phone?: string;
     website?: string;
+    service_radius_km?: number;  // km around address that a seller serves; 500 = island-wide
     logo?: string;
     cover_image?: string;
 }
 
+// Embedded by ?expand=seller|buyer (one query instead of a profile fetch per row)
+export interface UserSummary {
+    user_id: number;
+    name?: string;
+    logo?: string;
+    rating?: number;
+    review_count: number;
+}
+
+export interface Review {
+    id: number;
+    order_id: number;
+    rating: number;
+    comment?: string;
+    reviewer_id: number;
+    reviewee_id: number;
+    timestamp: string;
+    reviewer_summary?: UserSummary;
+}
+
+// GET /profiles/{id}/page: everything a seller page needs in one request
+export interface ProfilePage {
+    profile: Profile;
+    listings: Listing[];
+    next_before_id?: number;
+    rating: {
+        mean?: number;
+        count: number;
+        distribution: Record<string, number>;
+        score?: number;
+        completion_rate?: number;
+        avg_response_hours?: number;
+    };
+    reviews: Review[];
+}
+
 export interface Listing {
     id: number;
     title: string;
@@ -57,6 +94,7 @@ export interface Listing {
     seller_id: number;
     category_id: number;
     image_url?: string;
+    seller_summary?: UserSummary;
 }
 
 export interface Order {
@@ -69,6 +107,8 @@ export interface Order {
     buyer_id: number;
     seller_id: number;
     listing_id?: number;
+    seller_summary?: UserSummary;
+    buyer_summary?: UserSummary;
 }
 
 // ---------- Auth ----------
@@ -115,8 +155,14 @@ export const authApi = {
 
 // ---------- Listings ----------
 export const listingsApi = {
-    async getAll(): Promise<Listing[]> {
-        const res = await fetch(`${BASE_URL}/listings`);
+    async getAll(params: { q?: string; category_id?: number; sort?: 'newest' | 'price_asc' | 'price_desc' | 'best'; expand?: 'seller' } = {}): Promise<Listing[]> {
+        const query = new URLSearchParams();
+        Object.entries(params).forEach(([key, value]) => {
+            if (value !== undefined && value !== '') query.set(key, String(value));
+        });
+        const qs = query.toString();
+        // Authenticated so the backend serves a fresh read right after this user's own write (read_routing.py)
+        const res = await fetch(`${BASE_URL}/listings${qs ? `?${qs}` : ''}`, { headers: headers(true) });
         return handleResponse<Listing[]>(res);
     },
 
@@ -133,8 +179,9 @@ export const listingsApi = {
 
 // ---------- Orders ----------
 export const ordersApi = {
-    async getForUser(userId: number): Promise<Order[]> {
-        const res = await fetch(`${BASE_URL}/orders/user/${userId}`, {
+    async getForUser(userId: number, expand?: string): Promise<Order[]> {
+        const query = expand ? `?expand=${encodeURIComponent(expand)}` : '';
+        const res = await fetch(`${BASE_URL}/orders/user/${userId}${query}`, {
             headers: headers(true),
         });
         return handleResponse<Order[]>(res);
@@ -166,10 +213,27 @@ export const ordersApi = {
 // ---------- Profiles ----------
 export const profilesApi = {
     async get(userId: number): Promise<Profile> {
-        const res = await fetch(`${BASE_URL}/profiles/${userId}`);
+        const res = await fetch(`${BASE_URL}/profiles/${userId}`, { headers: headers(true) });
         return handleResponse<Profile>(res);
     },
 
+    async getPage(userId: number, params: { limit?: number; before_id?: number; reviews?: number } = {}): Promise<ProfilePage> {
+        const query = new URLSearchParams();
+        Object.entries(params).forEach(([key, value]) => {
+            if (value !== undefined) query.set(key, String(value));
+        });
+        const qs = query.toString();
+        const res = await fetch(`${BASE_URL}/profiles/${userId}/page${qs ? `?${qs}` : ''}`, { headers: headers(true) });
+        return handleResponse<ProfilePage>(res);
+    },
+
+    // Up to 100 profiles in one request
+    async getMany(userIds: number[]): Promise<Profile[]> {
+        if (userIds.length === 0) return [];
+        const res = await fetch(`${BASE_URL}/profiles?ids=${[...new Set(userIds)].join(',')}`, { headers: headers(true) });
+        return handleResponse<Profile[]>(res);
+    },
+
     async update(data: Partial<Profile>): Promise<Profile> {
         const res = await fetch(`${BASE_URL}/profiles/me`, {
             method: 'PUT',
@@ -203,6 +267,88 @@ export interface Notification {
     created_at: string;
 }
 
+// ---------- Exports ----------
+// Full histories, streamed by the server; dates are inclusive (YYYY-MM-DD)
+export const exportsApi = {
+    async download(kind: 'orders' | 'bids' | 'reviews', format: 'ndjson' | 'csv' = 'csv',
+                   range: { date_from?: string; date_to?: string } = {}): Promise<Blob> {
+        const query = new URLSearchParams({ format });
+        if (range.date_from) query.set('date_from', range.date_from);
+        if (range.date_to) query.set('date_to', range.date_to);
+        const token = getToken();
+        const res = await fetch(`${BASE_URL}/exports/${kind}?${query}`, {
+            headers: token ? { Authorization: `Bearer ${token}` } : {},
+        });
+        if (!res.ok) {
+            const err = await res.json().catch(() => ({ detail: 'Unknown error' }));
+            throw new Error(err.detail || `Request failed: ${res.status}`);
+        }
+        return res.blob();
+    },
+};
+
+// ---------- Analytics ----------
+// Daily rollups, refreshed every few minutes; dates are inclusive (YYYY-MM-DD), last 30 days by default
+export interface AnalyticsCounts {
+    requests: number;
+    bids: number;
+    orders: number;
+    gmv: number;
+    bids_per_request: number | null;
+    avg_first_bid_hours: number | null;
+}
+
+export interface CategoryTotals extends AnalyticsCounts {
+    category_id: number;  // 0 = uncategorised
+    category: string | null;
+}
+
+export interface CategoryDay extends CategoryTotals {
+    day: string;
+}
+
+export interface AnalyticsSummary extends AnalyticsCounts {
+    date_from: string;
+    date_to: string;
+    categories: CategoryTotals[];
+    rolled_up_at: string | null;
+}
+
+export interface SellerDay {
+    day: string;
+    bids: number;
+    orders: number;
+    gmv: number;
+}
+
+type DateRange = { date_from?: string; date_to?: string };
+
+function rangeQuery(range: DateRange, extra: Record<string, string> = {}): string {
+    const query = new URLSearchParams(extra);
+    if (range.date_from) query.set('date_from', range.date_from);
+    if (range.date_to) query.set('date_to', range.date_to);
+    const qs = query.toString();
+    return qs ? `?${qs}` : '';
+}
+
+export const analyticsApi = {
+    async summary(range: DateRange = {}): Promise<AnalyticsSummary> {
+        const res = await fetch(`${BASE_URL}/analytics/summary${rangeQuery(range)}`, { headers: headers(true) });
+        return handleResponse<AnalyticsSummary>(res);
+    },
+
+    async categories(range: DateRange = {}, categoryId?: number): Promise<CategoryDay[]> {
+        const extra = categoryId !== undefined ? { category_id: String(categoryId) } : {};
+        const res = await fetch(`${BASE_URL}/analytics/categories${rangeQuery(range, extra)}`, { headers: headers(true) });
+        return handleResponse<CategoryDay[]>(res);
+    },
+
+    async mySellerDays(range: DateRange = {}): Promise<SellerDay[]> {
+        const res = await fetch(`${BASE_URL}/analytics/sellers/me${rangeQuery(range)}`, { headers: headers(true) });
+        return handleResponse<SellerDay[]>(res);
+    },
+};
+
 export const notificationsApi = {
     async getAll(): Promise<Notification[]> {
         const res = await fetch(`${BASE_URL}/notifications`, {
@@ -218,6 +364,18 @@ export const notificationsApi = {
         });
         return handleResponse<Notification>(res);
     },
+
+    // Server-Sent Events fallback for networks that block WebSockets. Gets the same payloads as the
+    // `new_notification` socket event; EventSource reconnects on its own and resumes after the last id.
+    // `onReset` means too many were missed: refetch the list. Returns a function that closes the stream.
+    stream(token: string, lastId: number, onNotification: (data: any) => void, onReset: () => void): () => void {
+        const query = new URLSearchParams({ token });
+        if (lastId > 0) query.set('last_event_id', String(lastId));
+        const source = new EventSource(`${BASE_URL}/notifications/stream?${query}`);
+        source.addEventListener('notification', (e) => onNotification(JSON.parse((e as MessageEvent).data)));
+        source.addEventListener('reset', () => onReset());
+        return () => source.close();
+    },
 };
 
 // ---------- Bids ----------
@@ -228,6 +386,19 @@ export interface BidRequest {
     description: string;
     status: string;
     created_at: string;
+    expires_at?: string | null;
+    quantity?: number | null;
+    budget?: number | null; // LKR
+    event_date?: string | null;
+    location?: string | null;
+}
+
+export interface LeadFilters {
+    min_budget?: number;
+    max_budget?: number;
+    date_from?: string; // YYYY-MM-DD
+    date_to?: string;
+    location?: string;
 }
 
 export interface Bid {
@@ -240,6 +411,11 @@ export interface Bid {
     message?: string;
     status: string;
     created_at: string;
+    // Only on getBidsForRequest (ranked by price + seller score)
+    seller_score?: number;
+    seller_rating?: number;
+    seller_review_count?: number;
+    seller_summary?: UserSummary;  // with expand = true
 }
 
 export const bidsApi = {
@@ -257,15 +433,20 @@ export const bidsApi = {
         return handleResponse<BidRequest[]>(res);
     },
 
-    async getMatchingRequests(): Promise<BidRequest[]> {
-        const res = await fetch(`${BASE_URL}/bids/requests/matches`, {
+    async getMatchingRequests(filters: LeadFilters = {}): Promise<BidRequest[]> {
+        const params = new URLSearchParams();
+        Object.entries(filters).forEach(([key, value]) => {
+            if (value !== undefined && value !== '') params.set(key, String(value));
+        });
+        const query = params.toString() ? `?${params}` : '';
+        const res = await fetch(`${BASE_URL}/bids/requests/matches${query}`, {
             headers: headers(true),
         });
         return handleResponse<BidRequest[]>(res);
     },
 
-    async getBidsForRequest(requestId: number): Promise<Bid[]> {
-        const res = await fetch(`${BASE_URL}/bids/request/${requestId}`, {
+    async getBidsForRequest(requestId: number, expand = false): Promise<Bid[]> {
+        const res = await fetch(`${BASE_URL}/bids/request/${requestId}${expand ? '?expand=seller' : ''}`, {
             headers: headers(true),
         });
         return handleResponse<Bid[]>(res);
@@ -293,6 +474,26 @@ export const bidsApi = {
         return handleResponse<Bid>(res);
     },
 
+    // Up to 100 bids in one request; each item succeeds or fails on its own
+    async submitBids(bids: {
+        bid_request_id: number;
+        price: number;
+        quantity: number;
+        delivery_time?: string;
+        message?: string;
+    }[]): Promise<{
+        created: number;
+        failed: number;
+        results: { index: number; bid_request_id: number; ok: boolean; bid?: Bid; error?: string }[];
+    }> {
+        const res = await fetch(`${BASE_URL}/bids/batch`, {
+            method: 'POST',
+            headers: headers(true),
+            body: JSON.stringify({ bids }),
+        });
+        return handleResponse(res);
+    },
+
     async acceptBid(bidId: number): Promise<Bid> {
         const res = await fetch(`${BASE_URL}/bids/${bidId}/accept`, {
             method: 'PATCH',
@@ -1,4 +1,12 @@
-bind = "0.0.0.0:8000"
-workers = 4
-worker_class = "uvicorn.workers.UvicornWorker"
-chdir = "/home/site/wwwroot/code/backend"
\ No newline at end of file
+# gunicorn_conf.py (repo root, used by the Azure App Service startup command)
+#
+# The app lives in code/backend; its gunicorn_conf.py holds the server profile
+# (worker count from CPUs/memory, preload, worker recycling). Only the working
+# directory is set here.
+import os
+
+chdir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "code", "backend")  # /home/site/wwwroot/code/backend
+
+_profile = os.path.join(chdir, "gunicorn_conf.py")
+with open(_profile) as _f:
+    exec(compile(_f.read(), _profile, "exec"))